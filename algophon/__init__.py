@@ -1,7 +1,33 @@
-from algophon.seg import Seg
-from algophon.segstr import SegStr
-from algophon.seginv import SegInv
-from algophon.natclass import NatClass
+import importlib
+
 from algophon.symbols import *
-from algophon.ipa import convert
-from algophon.distance import edit_distance
\ No newline at end of file
+from algophon import symbols as _symbols
+
+# attributes that are imported on first access (PEP 562), so that importing algophon is fast and only loads what is used
+#   (e.g., `from algophon import SegStr` does not import NumPy, which the distance module needs)
+# name -> (module, attribute in the module), where an attribute of None means the module itself
+_LAZY_ATTRS = {
+    'Seg': ('algophon.seg', 'Seg'),
+    'SegStr': ('algophon.segstr', 'SegStr'),
+    'SyllabifiedSegStr': ('algophon.segstr', 'SyllabifiedSegStr'),
+    'SegInv': ('algophon.seginv', 'SegInv'),
+    'NatClass': ('algophon.natclass', 'NatClass'),
+    'Tokenizer': ('algophon.tokenizer', 'Tokenizer'),
+    'convert': ('algophon.ipa.convert', None),
+    'edit_distance': ('algophon.distance.edit_distance', None),
+}
+
+__all__ = list(_LAZY_ATTRS) + list(name for name in dir(_symbols) if not name.startswith('_'))
+
+def __getattr__(name: str) -> object:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module, attr = _LAZY_ATTRS[name]
+    value = importlib.import_module(module)
+    if attr is not None:
+        value = getattr(value, attr)
+    globals()[name] = value # cache, so that __getattr__ is only called on first access
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()).union(__all__))
\ No newline at end of file
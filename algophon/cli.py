@@ -0,0 +1,214 @@
+'''
+The algophon command-line interface, for running the models as stages of batch pipelines.
+
+Usage:
+    algophon train d2l train.tsv --model d2l.pkl                # train on (UR, SR) pairs and save the model
+    algophon train miaseg train.tsv --model miaseg.pkl --use-ipa
+    algophon produce d2l.pkl urs.tsv --out srs.tsv --jobs 4      # stream URs in, (UR, SR) rows out
+    algophon segment miaseg.pkl words1.tsv words2.tsv --jobs 4 > segmented.tsv
+
+Inputs and outputs default to stdin and stdout ('-'). Throughput is reported to stderr (unless --quiet is passed).
+'''
+from typing import Iterable
+
+import sys
+import time
+import pickle
+import argparse
+from contextlib import nullcontext
+from itertools import islice
+
+from algophon import SegStr
+from algophon.utils.workers import process_pool, resolve_n_jobs
+
+def _read_lines(paths: list) -> Iterable:
+    '''
+    :paths: a list of input files ('-' for stdin)
+
+    :return: a generator of (location, line) tuples of the lines of the files, in order (so that one process can stream many files)
+        - location is a 'path:line number' str, for error messages
+    '''
+    for path in paths:
+        if path == '-':
+            yield from ((f'<stdin>:{i}', line) for i, line in enumerate(sys.stdin, start=1))
+        else:
+            with open(path, 'r') as f:
+                yield from ((f'{path}:{i}', line) for i, line in enumerate(f, start=1))
+
+def _open_out(path: str):
+    return sys.stdout if path == '-' else open(path, 'w')
+
+def _batches(lines: Iterable, batch_size: int) -> Iterable:
+    '''
+    :lines: an Iterable of (location, line) tuples (see _read_lines)
+    :batch_size: the number of lines per batch
+
+    :return: a generator of lists of up to :batch_size: (location, line) tuples of non-empty lines (without their newlines)
+    '''
+    lines = ((where, line.rstrip('\n')) for where, line in lines)
+    lines = ((where, line) for where, line in lines if len(line.strip()) > 0)
+    while True:
+        batch = list(islice(lines, batch_size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+def _morph_str(morph: object) -> str:
+    '''
+    :morph: a str or SegStr morph
+
+    :return: the morph as a str (space-separated if it is a SegStr, like the words it was segmented from)
+    '''
+    return ' '.join(f'{seg}' for seg in morph) if isinstance(morph, SegStr) else f'{morph}'
+
+def _report(args: argparse.Namespace, verb: str, n: int, start: float, unit: str='lines') -> None:
+    '''
+    Reports the throughput of a command to stderr.
+    '''
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        print(f'{verb} {n} {unit} in {elapsed:.2f}s ({n / max(elapsed, 1e-9):.0f} {unit}/s)', file=sys.stderr)
+
+def _pool(model: object, args: argparse.Namespace) -> object:
+    '''
+    :model: a trained model
+    :args: the parsed arguments of a batch command
+
+    :return: a context manager of one process pool holding :model: for the whole run (or of None if --jobs is 1)
+    '''
+    return process_pool(model, resolve_n_jobs(args.jobs)) if args.jobs != 1 else nullcontext()
+
+def load_model(path: str) -> object:
+    '''
+    :path: the location of a model saved by `algophon train` (or pickled directly)
+
+    :return: the model object
+    '''
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def save_model(model: object, path: str) -> None:
+    '''
+    :model: a trained model
+    :path: the location to save :model: to
+
+    :return: None
+    '''
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+
+def train(args: argparse.Namespace) -> None:
+    from algophon.models.D2L import D2L
+    from algophon.models.Miaseg import Miaseg
+
+    start = time.perf_counter()
+    if args.model_type == 'd2l':
+        model = D2L(ipa_file_path=args.ipa_file, produce_cache_size=args.cache_size)
+        data = model.load_train(args.data, sep=args.sep)
+    else:
+        model = Miaseg(use_ipa=args.use_ipa, ipa_file_path=args.ipa_file)
+        data = model.load_train(args.data, sep=args.sep, feature_sep=args.feature_sep)
+    model.train(data)
+    save_model(model, args.model)
+    _report(args, 'trained on', len(data), start, unit='examples')
+    if not args.quiet:
+        print(f'{model}', file=sys.stderr)
+
+def produce(args: argparse.Namespace) -> None:
+    from algophon.models.D2L import D2L
+
+    model = load_model(args.model)
+    if not isinstance(model, D2L):
+        raise SystemExit(f'algophon produce: {args.model} is a {type(model).__name__} model, not a D2L model')
+    start, n = time.perf_counter(), 0
+    fout = _open_out(args.out)
+    try:
+        with _pool(model, args) as executor: # batches are streamed into one pool, so the model is only installed in each worker once
+            for batch in _batches(_read_lines(args.inputs), args.batch_size):
+                urs = list(line.split(args.sep)[0] for _, line in batch) # extra columns (e.g., gold SRs) are ignored
+                for ur, sr in zip(urs, model.produce_batch(urs, n_jobs=args.jobs, executor=executor)):
+                    fout.write(f'{ur}{args.sep}{" ".join(f"{seg}" for seg in sr)}\n')
+                n += len(batch)
+    finally:
+        if fout is not sys.stdout:
+            fout.close()
+    _report(args, 'produced', n, start)
+
+def segment(args: argparse.Namespace) -> None:
+    from algophon.models.Miaseg import Miaseg
+
+    model = load_model(args.model)
+    if not isinstance(model, Miaseg):
+        raise SystemExit(f'algophon segment: {args.model} is a {type(model).__name__} model, not a Miaseg model')
+    start, n = time.perf_counter(), 0
+    fout = _open_out(args.out)
+    try:
+        with _pool(model, args) as executor: # batches are streamed into one pool, so the model is only installed in each worker once
+            for batch in _batches(_read_lines(args.inputs), args.batch_size):
+                pairs = list()
+                for where, line in batch: # (word, features) or (root, word, features) lines
+                    columns = line.split(args.sep)
+                    if len(columns) < 2:
+                        raise SystemExit(f'algophon segment: {where}: expected (word, features) or (root, word, features) columns, but got {line!r}')
+                    word, feats = columns[-2:]
+                    pairs.append((word, tuple(feats.split(args.feature_sep)) if len(feats) > 0 else ()))
+                results = model.segment_batch(pairs, with_analysis=not args.no_analysis, n_jobs=args.jobs, executor=executor)
+                for (_, line), result in zip(batch, results):
+                    if args.no_analysis:
+                        fout.write(f'{line}{args.sep}{args.morph_sep.join(_morph_str(morph) for morph in result)}\n')
+                    else:
+                        morphs, analysis = result
+                        fout.write(f'{line}{args.sep}{args.morph_sep.join(_morph_str(morph) for morph in morphs)}{args.sep}{args.feature_sep.join(analysis)}\n')
+                n += len(batch)
+    finally:
+        if fout is not sys.stdout:
+            fout.close()
+    _report(args, 'segmented', n, start)
+
+def build_parser() -> argparse.ArgumentParser:
+    '''
+    :return: the argparse.ArgumentParser of the algophon command
+    '''
+    parser = argparse.ArgumentParser(prog='algophon', description='Train and run algophon models on TSV files.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--sep', default='\t', help='the column separator (default: tab)')
+    common.add_argument('--feature-sep', default=';', help='the separator of morphological features (default: ;)')
+    common.add_argument('--quiet', action='store_true', help='do not report throughput to stderr')
+
+    parser_train = subparsers.add_parser('train', parents=[common], help='train a model and save it')
+    parser_train.add_argument('model_type', choices=['d2l', 'miaseg'], help='the model to train')
+    parser_train.add_argument('data', help='the training file: (UR, SR) rows for d2l; (root, word, features) rows for miaseg')
+    parser_train.add_argument('--model', required=True, help='the path to save the trained model to')
+    parser_train.add_argument('--ipa-file', default=None, help='a file of segment features to use instead of Panphon')
+    parser_train.add_argument('--use-ipa', action='store_true', help='(miaseg) interpret words as space-separated IPA symbols')
+    parser_train.add_argument('--cache-size', type=int, default=0, help='(d2l) the size of the produce cache (default: 0, no cache)')
+    parser_train.set_defaults(func=train)
+
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument('model', help='the path of a model saved by `algophon train`')
+    batch.add_argument('inputs', nargs='*', default=['-'], help='the input files, streamed in order (default: - for stdin)')
+    batch.add_argument('--out', default='-', help='the output file (default: - for stdout)')
+    batch.add_argument('--jobs', type=int, default=1, help='the number of worker processes, shared by all batches (-1 for one per CPU)')
+    batch.add_argument('--batch-size', type=int, default=10000, help='the number of lines read and processed at a time')
+
+    parser_produce = subparsers.add_parser('produce', parents=[common, batch], help='produce SRs with a trained D2L model')
+    parser_produce.set_defaults(func=produce)
+
+    parser_segment = subparsers.add_parser('segment', parents=[common, batch], help='segment words with a trained Miaseg model')
+    parser_segment.add_argument('--morph-sep', default='+', help='the separator of morphs in the output (default: +)')
+    parser_segment.add_argument('--no-analysis', action='store_true', help='do not output the morphological analysis')
+    parser_segment.set_defaults(func=segment)
+    return parser
+
+def main(argv: list=None) -> None:
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'batch_size', 1) < 1:
+        raise SystemExit(f'algophon {args.command}: --batch-size must be at least 1')
+    if getattr(args, 'jobs', 1) == 0:
+        raise SystemExit(f'algophon {args.command}: --jobs must be positive (or -1 for one per CPU)')
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
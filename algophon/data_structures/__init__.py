@@ -1,2 +1,9 @@
 from algophon.data_structures.graph import Graph
-from algophon.data_structures.graph import Node
\ No newline at end of file
+from algophon.data_structures.graph import Node
+from algophon.data_structures.trie import Trie
+
+def __getattr__(name: str) -> object:
+    if name == 'FrozenGraph': # imported on first access (PEP 562), since it loads NumPy
+        from algophon.data_structures.frozen_graph import FrozenGraph
+        return FrozenGraph
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
\ No newline at end of file
@@ -0,0 +1,195 @@
+from typing import Hashable, Generator
+
+import numpy as np
+
+class FrozenGraph:
+    '''
+    A read-only, compact version of a Graph, built via Graph.freeze().
+
+    Internally, each node is given an integer id (in the str(node) lexicographic order that Graph uses to break ties),
+    and the edges are stored in compressed sparse row (CSR) form as two NumPy arrays:
+        - self._indices[self._indptr[i]:self._indptr[i + 1]] are the ids of node i's neighbors, in ascending order
+    '''
+    def __init__(self, graph) -> object:
+        '''
+        :graph: a Graph object to freeze
+            - Later changes to :graph: are not reflected in the FrozenGraph
+        '''
+        nodes = graph._lex_nodes()
+        self.directed = graph.directed
+        self._names = list(node.name for node in nodes) # id -> node
+        self._ids = dict((name, i) for i, name in enumerate(self._names)) # node -> id
+        self._num_edges = graph.num_edges()
+
+        ids = dict((node, i) for i, node in enumerate(nodes))
+        degrees = np.fromiter((len(graph._neighbors[node]) for node in nodes), dtype=np.int64, count=len(nodes))
+        self._indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=self._indptr[1:])
+        dtype = np.int32 if len(nodes) < 2 ** 31 else np.int64
+        self._indices = np.fromiter(
+            (i for node in nodes for i in sorted(ids[neigh] for neigh in graph._neighbors[node])),
+            dtype=dtype,
+            count=int(self._indptr[-1])
+        )
+
+    def num_nodes(self) -> int:
+        '''
+        :return: the number of nodes in the graph
+        '''
+        return len(self._names)
+
+    def num_edges(self) -> int:
+        '''
+        :return: the number of edges in the graph
+        '''
+        return self._num_edges
+
+    def nodes(self) -> list:
+        '''
+        :return: a list of the nodes in the graph, sorted lexicographically
+        '''
+        return list(self._names)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._ids
+
+    def __str__(self) -> str:
+        return f'FrozenGraph (n = {self.num_nodes()}, m = {self.num_edges()})'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def neighbors(self, node: Hashable) -> list:
+        '''
+        :node: a node in the graph
+
+        :return: a list of the neighbors of :node: sorted lexicographically
+        '''
+        i = self._ids[node]
+        return list(self._names[j] for j in self._indices[self._indptr[i]:self._indptr[i + 1]].tolist())
+
+    def _gather(self, ids: np.ndarray) -> np.ndarray:
+        '''
+        :ids: an array of node ids
+
+        :return: the concatenation of the neighbors of each node in :ids: (in order)
+        '''
+        starts, ends = self._indptr[ids], self._indptr[ids + 1]
+        lens = ends - starts
+        offsets = np.cumsum(lens) - lens # the position of each node's first neighbor in the output
+        return self._indices[np.repeat(starts - offsets, lens) + np.arange(int(lens.sum()))]
+
+    def _start_id(self, start_node: Hashable) -> int:
+        '''
+        :start_node: a node in the graph or None (for the lexicographically first node)
+
+        :return: the id of the node to start a search at
+        '''
+        return 0 if start_node is None else self._ids[start_node]
+
+    def bfs(self, start_node=None) -> Generator:
+        '''
+        Yields the same order as Graph.bfs. Each level of the search is expanded at once with NumPy.
+
+        :start_node: (Optional; default None) a node to start the search at
+            - If None, starts at lexicographically first node
+
+        :return: a Generator that yields the nodes in bredth-first order starting at the :start_node:
+        '''
+        if self.num_nodes() == 0:
+            return
+        visited = np.zeros(self.num_nodes(), dtype=bool)
+        num_visited, next_unvisited = 0, 0
+        level = np.array([self._start_id(start_node)], dtype=self._indices.dtype)
+        while True:
+            visited[level] = True
+            num_visited += len(level)
+            for i in level.tolist():
+                yield self._names[i]
+            neighs = self._gather(level)
+            neighs = neighs[~visited[neighs]]
+            _, first = np.unique(neighs, return_index=True) # the first occurrence of each newly reached node
+            level = neighs[np.sort(first)]
+            if len(level) == 0: # see if there are any other components to search
+                if num_visited == self.num_nodes():
+                    return
+                while visited[next_unvisited]: # ids are in lexicographic order, so restart at the smallest unvisited id
+                    next_unvisited += 1
+                level = np.array([next_unvisited], dtype=self._indices.dtype)
+
+    def dfs(self, start_node=None) -> Generator:
+        '''
+        Yields the same order as Graph.dfs.
+
+        :start_node: (Optional; default None) a node to start the search at
+            - If None, starts at lexicographically first node
+
+        :return: a Generator that yields the nodes in depth-first order starting at the :start_node:
+        '''
+        if self.num_nodes() == 0:
+            return
+        indptr, indices = self._indptr.tolist(), self._indices
+        visited = bytearray(self.num_nodes())
+        num_visited, next_unvisited = 0, 0
+        frontier = [self._start_id(start_node)]
+        while True:
+            if len(frontier) == 0: # see if there are any other components to search
+                if num_visited == self.num_nodes():
+                    return
+                while visited[next_unvisited]:
+                    next_unvisited += 1
+                frontier.append(next_unvisited)
+            i = frontier.pop()
+            if visited[i]: # a node can be added to the frontier more than once
+                continue
+            visited[i] = 1
+            num_visited += 1
+            frontier.extend(j for j in reversed(indices[indptr[i]:indptr[i + 1]].tolist()) if not visited[j])
+            yield self._names[i]
+
+    def is_dag(self) -> bool:
+        '''
+        Checks whether a graph is a directed, acyclic graph (DAG) using Kahn's algorithm, removing all nodes with no incoming edges at once.
+
+        :return: True if :self: is a DAG, False if not
+        '''
+        if not self.directed:
+            return False
+        in_degree = np.bincount(self._indices, minlength=self.num_nodes())
+        removable = np.flatnonzero(in_degree == 0)
+        num_removed = 0
+        while len(removable) > 0:
+            num_removed += len(removable)
+            neighs = self._gather(removable)
+            np.subtract.at(in_degree, neighs, 1)
+            removable = np.unique(neighs[in_degree[neighs] == 0])
+        return num_removed == self.num_nodes() # any nodes that could not be removed are on a cycle
+
+    def topological_sort(self) -> list:
+        '''
+        Returns the same sort as Graph.topological_sort.
+
+        :return: a toplogical sort of the graphs nodes
+        '''
+        if not self.is_dag():
+            raise ValueError('The graph is not a DAG, and thus cannot be topologically sorted.')
+        indptr, indices = self._indptr.tolist(), self._indices
+        _sorted = list() # built in reverse and reversed at the end
+        visited = bytearray(self.num_nodes())
+        for root in range(self.num_nodes() - 1, -1, -1): # roots in reverse lexicographic order
+            if visited[root]:
+                continue
+            visited[root] = 1
+            stack = [(root, reversed(indices[indptr[root]:indptr[root + 1]].tolist()))]
+            while len(stack) > 0:
+                i, neighs = stack[-1]
+                for j in neighs:
+                    if not visited[j]:
+                        visited[j] = 1
+                        stack.append((j, reversed(indices[indptr[j]:indptr[j + 1]].tolist())))
+                        break
+                else: # all of the node's descendants have been added
+                    stack.pop()
+                    _sorted.append(i)
+        _sorted.reverse()
+        return list(self._names[i] for i in _sorted)
\ No newline at end of file
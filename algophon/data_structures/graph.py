@@ -1,4 +1,5 @@
 from typing import Hashable, Iterable, Union, Generator
+from collections import deque
 
 class Graph:
     '''
@@ -13,6 +14,8 @@ class Graph:
         self._nodes = dict()
         self._edges = set()
         self._neighbors = dict()
+        self._sorted_neighbors = dict() # node -> its neighbors sorted lexicographically (cached until an edge is added to the node)
+        self._sorted_nodes = None # the nodes sorted lexicographically (cached until a node is added)
         self.directed = directed
 
     def add_node(self, node: Hashable) -> None:
@@ -24,6 +27,7 @@ class Graph:
         if node not in self._nodes:
             self._nodes[node] = Node(name=node, graph=self)
             self._neighbors[self._nodes[node]] = set()
+            self._sorted_nodes = None
 
     def add_edge(self, x: Union[tuple, Hashable], y: Union[None, Hashable]=None) -> None:
         '''
@@ -41,8 +45,10 @@ class Graph:
         if self.directed or (y, x) not in self._edges: # if directed, add x -> y ; if undirected and y - x not in edges, add x - y
             self._edges.add((x, y))
             self._neighbors[x].add(y)
+            self._sorted_neighbors.pop(x, None)
         if not self.directed: # add y - x neighbor if undirected
             self._neighbors[y].add(x)
+            self._sorted_neighbors.pop(y, None)
 
     def add_nodes(self, nodes: Iterable) -> None:
         '''
@@ -100,6 +106,14 @@ class Graph:
     
     def __str__(self) -> str:
         return f'Graph (n = {self.num_nodes()}, m = {self.num_edges()})'
+
+    def freeze(self) -> 'FrozenGraph':
+        '''
+        :return: a read-only FrozenGraph version of the graph, which stores the edges in compact integer arrays
+            - Supports the same bfs, dfs, and topological_sort methods (yielding the same orders)
+        '''
+        from algophon.data_structures.frozen_graph import FrozenGraph # imported here, since it loads NumPy
+        return FrozenGraph(graph=self)
     
     def neighbors(self, node: object) -> list:
         '''
@@ -107,7 +121,27 @@ class Graph:
         
         :return: a list of the neighbors of :node: sorted lexicographically
         '''
-        return sorted(self._neighbors[node], key=lambda neigh: f'{neigh}')
+        return list(self._adjacency(node))
+
+    def _adjacency(self, node: object) -> list:
+        '''
+        The same as self.neighbors, but returns the cached list itself (which should not be modified).
+
+        :node: a node in the graph
+
+        :return: a list of the neighbors of :node: sorted lexicographically
+        '''
+        if node not in self._sorted_neighbors:
+            self._sorted_neighbors[node] = sorted(self._neighbors[node], key=lambda neigh: f'{neigh}')
+        return self._sorted_neighbors[node]
+
+    def _lex_nodes(self) -> list:
+        '''
+        :return: a list of the Node objects sorted lexicographically (which should not be modified)
+        '''
+        if self._sorted_nodes is None:
+            self._sorted_nodes = sorted(self._neighbors, key=lambda node: f'{node}')
+        return self._sorted_nodes
 
     def _search(self, start_node: object, typ: str='bfs') -> Generator:
         '''
@@ -121,22 +155,38 @@ class Graph:
         if typ not in {'bfs', 'dfs'}:
             raise ValueError(f'Search Type "{typ}" is not implemented.')
         if start_node is None: # if no start node, choose lexicographically first node
-            start_node = self.nodes(sort_key=lambda node: f'{node}')[0]
-        start_node = self._nodes[start_node]
-        visited = set()
-        frontier = [start_node]
-        while len(frontier) > 0:
-            node = frontier.pop(0 if typ == 'bfs' else -1) # pop in bfs=FIFO=0/dfs=LIFO=-1 order
+            start_node = self._lex_nodes()[0]
+        else:
+            start_node = self._nodes[start_node]
+        bfs = typ == 'bfs'
+        visited = set() # the nodes that have been yielded
+        enqueued = {start_node} # bfs only: the nodes that have been added to the frontier
+        frontier = deque([start_node])
+        lex_nodes, lex_idx = None, 0 # for restarting the search in the lexicographically first unvisited node
+        while True:
+            if len(frontier) == 0: # see if there are any other components to search
+                if len(visited) == len(self._nodes):
+                    break
+                if lex_nodes is None:
+                    lex_nodes = self._lex_nodes()
+                while lex_nodes[lex_idx] in visited: # the nodes before lex_idx have all been visited
+                    lex_idx += 1
+                frontier.append(lex_nodes[lex_idx]) # add the lexiocographically first unvisited node to the frontier
+                enqueued.add(lex_nodes[lex_idx])
+            node = frontier.popleft() if bfs else frontier.pop() # pop in bfs=FIFO/dfs=LIFO order
+            if node in visited: # dfs can add a node to the frontier more than once
+                continue
             visited.add(node) # mark the node as visited
-            for neigh in node.neighbors() if typ == 'bfs' else reversed(node.neighbors()):
-                if neigh not in visited:
-                    frontier.append(neigh)
+            if bfs:
+                for neigh in self._adjacency(node):
+                    if neigh not in enqueued:
+                        enqueued.add(neigh)
+                        frontier.append(neigh)
+            else:
+                for neigh in reversed(self._adjacency(node)):
+                    if neigh not in visited:
+                        frontier.append(neigh)
             yield node
-            
-            if len(frontier) == 0: # see if there are any other components to search
-                diff = self.nodes().difference(visited)
-                if len(diff) > 0: # if visited (hence unreachable) nodes, add the lexiocographically first to the frontier
-                    frontier = [self._nodes[sorted(diff, key=lambda node: f'{node}')[0]]]
 
     def bfs(self, start_node=None) -> Generator:
         '''
@@ -156,41 +206,29 @@ class Graph:
         '''
         return self._search(start_node=start_node, typ='dfs')
     
-    def _acyclic(self, node=None, visited: set=None, stack: set=None) -> bool:
+    def _acyclic(self) -> bool:
         '''
-        Checks whether a graph is acyclic using a recursive DFS.
+        Checks whether a graph is acyclic using Kahn's algorithm (iteratively removing nodes with no incoming edges).
 
         :return: True if the graph is acyclic, False if not
         '''
         if not self.directed:
             raise NotImplementedError('_acyclic() is not implemented for undirected graphs.')
         if self.num_edges() == 0: # a graph with no edges is trivially acyclic
-            return True  
-        # make sure sets are fresh references
-        visited = set() if visited is None else visited
-        stack = set() if stack is None else stack
-        # if no node, see if there are other components to search
-        if node is None:
-            diff = self.nodes().difference(visited)
-            if len(diff) == 0: # if we made it here, there are no cycles
-                return True
-            node = self._nodes[sorted(diff, key=lambda node: f'{node}')[0]]
-        
-        if node in stack: # if node is in the stack, we have a cycle
-            return False
-        if node in visited: # do not revist nodes
             return True
-        # update sets
-        visited.add(node)
-        stack.add(node)
-        for neigh in node.neighbors(): # recurse over neighbors
-            if not self._acyclic(node=neigh, visited=visited, stack=stack):
-                return False
-        stack.discard(node) # remove the visiting node from the stack
-
-        if len(stack) == 0: # recurse to make sure there is nothing else to traverse
-            return self._acyclic(visited=visited)
-        return True # if we made it here, there are no cycles
+        in_degree = dict.fromkeys(self._neighbors, 0)
+        for _, y in self._edges:
+            in_degree[y] += 1
+        frontier = list(node for node, degree in in_degree.items() if degree == 0)
+        num_removed = 0
+        while len(frontier) > 0:
+            node = frontier.pop()
+            num_removed += 1
+            for neigh in self._neighbors[node]:
+                in_degree[neigh] -= 1
+                if in_degree[neigh] == 0:
+                    frontier.append(neigh)
+        return num_removed == self.num_nodes() # any nodes that could not be removed are on a cycle
 
     def is_dag(self) -> bool:
         '''
@@ -207,32 +245,27 @@ class Graph:
         if not self.is_dag():
             raise ValueError('The graph is not a DAG, and thus cannot be topologically sorted.')
 
-        stack = set()
-        def _recursive_topological_sort(node=None, _sorted: list=None, visited: set=None) -> list:
-            # make sure sets/lists are fresh references
-            _sorted = list() if _sorted is None else _sorted
-            visited = set() if visited is None else visited
-            # if no node, compute the next node to visit
-            if node is None:
-                diff = self.nodes().difference(visited)
-                if len(diff) == 0: # if no remaining nodes, return _sorted
-                    return _sorted
-                node = self._nodes[sorted(diff, key=lambda node: f'{node}', reverse=True)[0]]
-
-            if node in visited: # node already visited
-                return _sorted
-            stack.add(node) # add node to stack
-            visited.add(node) # mark node as visited
-            for neigh in reversed(node.neighbors()):
-                _recursive_topological_sort(node=neigh, _sorted=_sorted, visited=visited)
-            _sorted.insert(0, node)
-            stack.discard(node) # remove node from stack
-            if len(stack) == 0 and len(visited) != self.num_nodes(): # if there is nothing on the stack, recurse on remaining nodes
-                return _recursive_topological_sort(_sorted=_sorted, visited=visited)
-            return _sorted
-
-        # compute topological sort recursively
-        return list(node.name for node in _recursive_topological_sort())
+        # iterative DFS: roots are visited in reverse lexicographic order, as are each node's neighbors,
+        # and each node is added to the front of the sort once all of its descendants have been
+        _sorted = list() # built in reverse (appending is O(1)) and reversed at the end
+        visited = set()
+        for root in reversed(self._lex_nodes()):
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, reversed(self._adjacency(root)))]
+            while len(stack) > 0:
+                node, neighs = stack[-1]
+                for neigh in neighs:
+                    if neigh not in visited:
+                        visited.add(neigh)
+                        stack.append((neigh, reversed(self._adjacency(neigh))))
+                        break
+                else: # all of the node's descendants have been added
+                    stack.pop()
+                    _sorted.append(node)
+        _sorted.reverse()
+        return list(node.name for node in _sorted)
 
 class Node:
     '''
@@ -0,0 +1,104 @@
+from typing import Iterable, Union
+
+class Trie:
+    '''
+    A Trie (prefix tree) class.
+
+    Maps sequences of Hashable symbols (e.g., the chars of a str or the Seg objects of a SegStr) to values.
+    Lookups walk one node per symbol, so they cost time proportional to the length of the key, not the number of keys.
+    '''
+    def __init__(self) -> object:
+        self._root = Trie.Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __str__(self) -> str:
+        return f'Trie (n = {len(self)})'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __contains__(self, key: Iterable) -> bool:
+        '''
+        :key: an Iterable of Hashable symbols
+
+        :return: True if :key: was inserted into the Trie, False otherwise
+        '''
+        node = self._find(key)
+        return node is not None and node.terminal
+
+    def insert(self, key: Iterable, value: object=None) -> None:
+        '''
+        :key: an Iterable of Hashable symbols
+        :value: (Optional; default None) the value to store for :key:
+            - If :key: is already in the Trie, its value is overwritten
+
+        :return: None
+        '''
+        node = self._root
+        for sym in key:
+            if sym not in node.children:
+                node.children[sym] = Trie.Node()
+            node = node.children[sym]
+        if not node.terminal:
+            self._size += 1
+        node.terminal = True
+        node.value = value
+
+    def get(self, key: Iterable, default: object=None) -> object:
+        '''
+        :key: an Iterable of Hashable symbols
+        :default: (Optional; default None) the value to return if :key: is not in the Trie
+
+        :return: the value stored for :key:, or :default: if :key: is not in the Trie
+        '''
+        node = self._find(key)
+        if node is None or not node.terminal:
+            return default
+        return node.value
+
+    def longest_match(self, seq: Iterable, start: int=0) -> Union[None, tuple[int, object]]:
+        '''
+        Finds the longest key in the Trie that is a prefix of :seq: (starting at index :start:).
+
+        :seq: an Iterable of Hashable symbols
+        :start: (Optional; default 0) the index of :seq: to start matching at
+            - If > 0, :seq: must support len() and indexing (e.g., a str or list)
+
+        :return: a tuple (length, value) of the longest matching key, or None if no key (including the empty key) matches
+        '''
+        node = self._root
+        match = (0, node.value) if node.terminal else None
+        symbols = seq if start == 0 else (seq[idx] for idx in range(start, len(seq)))
+        length = 0
+        for sym in symbols:
+            node = node.children.get(sym)
+            if node is None: # no key continues with :sym:
+                break
+            length += 1
+            if node.terminal:
+                match = (length, node.value)
+        return match
+
+    def _find(self, key: Iterable) -> Union[None, object]:
+        '''
+        :key: an Iterable of Hashable symbols
+
+        :return: the Trie.Node reached by walking :key:, or None if the walk falls off the Trie
+        '''
+        node = self._root
+        for sym in key:
+            node = node.children.get(sym)
+            if node is None:
+                return None
+        return node
+
+    class Node:
+        __slots__ = ('children', 'terminal', 'value')
+
+        def __init__(self) -> object:
+            self.children = dict()
+            self.terminal = False # True iff a key ends at this node
+            self.value = None
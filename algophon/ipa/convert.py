@@ -1,3 +1,8 @@
+import re
+from typing import Iterable, Generator, Union
+
+from algophon.data_structures import Trie
+
 _ipa_to_tipa = {
         # consonants
         'p': 'p',
@@ -149,4 +154,121 @@ def to_tipa(segstr):
         else:
             tipastr.append(_ipa_to_tipa[seg])
             
-    return '\\textipa{' + ' '.join(tipastr) + '}'
\ No newline at end of file
+    return '\\textipa{' + ' '.join(tipastr) + '}'
+
+_CONTROL_WORD_END = re.compile(r'\\[A-Za-z]+$') # a tipa macro that would absorb a following letter (e.g., \\ae)
+
+def _join_tipa(tipastr: list) -> str:
+    '''
+    :tipastr: a list of tipa strs
+
+    :return: the concatenation of :tipastr:, with {} after macros that are followed by a letter (e.g., \\ae{}k rather than \\aek)
+    '''
+    out = list()
+    for idx, tipa in enumerate(tipastr):
+        out.append(tipa)
+        if idx + 1 < len(tipastr) and tipastr[idx + 1][:1].isalpha() and _CONTROL_WORD_END.search(tipa):
+            out.append('{}')
+    return ''.join(out)
+
+class TipaConverter:
+    '''
+    Converts IPA to tipa for LaTeX in bulk.
+
+    The IPA -> tipa map is compiled once into a longest-match Trie, so unsegmented strs (e.g., 'tʃaɪ') can be converted as well as segmented ones.
+    Instead of printing a warning for each unknown symbol, the symbols are returned as (position, symbol) diagnostics.
+    '''
+    def __init__(self, unknown: str='?', textipa: bool=True) -> object:
+        '''
+        :unknown: (Optional; default '?') the tipa str to enter for symbols that are not in the tipa map
+        :textipa: (Optional; default True) if True, each converted form is wrapped in \\textipa{...}, so that it can be pasted straight into LaTeX
+        '''
+        self.unknown = unknown
+        self.textipa = textipa
+        self._trie = Trie()
+        for ipa, tipa in _ipa_to_tipa.items():
+            self._trie.insert(ipa.strip(), tipa)
+
+    def convert(self, form: Union[str, list, Iterable]) -> tuple[str, list]:
+        '''
+        :form: the IPA to convert, as one of the following:
+            - a str, which is tokenized by longest match (spaces are ignored, so space-separated strs work too)
+            - a list of IPA symbols or a SegStr, each symbol of which is looked up as a whole
+
+        :return: a tuple (tipa, unknowns), where unknowns is a list of (position, symbol) tuples for symbols not in the tipa map
+            - position is a char index for str :form: and a symbol index otherwise
+        '''
+        tipastr, unknowns = list(), list()
+        if isinstance(form, str):
+            idx = 0
+            while idx < len(form):
+                if form[idx].isspace():
+                    idx += 1
+                    continue
+                match = self._trie.longest_match(form, start=idx)
+                if match is None or match[0] == 0: # no symbol starts here
+                    unknowns.append((idx, form[idx]))
+                    tipastr.append(self.unknown)
+                    idx += 1
+                else:
+                    length, tipa = match
+                    tipastr.append(tipa)
+                    idx += length
+        else:
+            for idx, seg in enumerate(form):
+                tipa = self._trie.get(f'{seg}')
+                if tipa is None:
+                    unknowns.append((idx, f'{seg}'))
+                    tipastr.append(self.unknown)
+                else:
+                    tipastr.append(tipa)
+        tipa = _join_tipa(tipastr)
+        return '\\textipa{' + tipa + '}' if self.textipa else tipa, unknowns
+
+    __call__ = convert
+
+    def convert_all(self, forms: Iterable) -> Generator:
+        '''
+        :forms: an iterable of forms (in any of the forms accepted by self.convert)
+
+        :return: a Generator that yields a (tipa, unknowns) tuple for each form (see self.convert)
+        '''
+        for form in forms:
+            yield self.convert(form)
+
+    def write(self, forms: Iterable, path: str) -> list:
+        '''
+        Streams the tipa conversion of each form to a file, one per line.
+
+        :forms: an iterable of forms (in any of the forms accepted by self.convert)
+        :path: the location of the file to write to
+
+        :return: a list of (form index, position, symbol) tuples for symbols that are not in the tipa map
+        '''
+        unknowns = list()
+        with open(path, 'w') as f:
+            for form_idx, (tipa, form_unknowns) in enumerate(self.convert_all(forms)):
+                f.write(f'{tipa}\n')
+                unknowns.extend((form_idx, idx, symbol) for idx, symbol in form_unknowns)
+        return unknowns
+
+def to_tipa_batch(forms: Iterable, path: Union[None, str]=None, unknown: str='?', textipa: bool=True) -> tuple[list, list]:
+    '''
+    Converts many IPA forms to tipa for LaTeX at once (see TipaConverter).
+
+    :forms: an iterable of forms, each a str (segmented or not), a list of IPA symbols, or a SegStr
+    :path: (Optional; default None) if a str path is passed, the tipa forms are streamed to that file (one per line) instead of returned
+    :unknown: (Optional; default '?') the tipa str to enter for symbols that are not in the tipa map
+    :textipa: (Optional; default True) if True, each tipa form is wrapped in \\textipa{...}
+
+    :return: a tuple (tipa forms, unknowns), where unknowns is a list of (form index, position, symbol) tuples
+        - If :path: is passed, the list of tipa forms is empty
+    '''
+    converter = TipaConverter(unknown=unknown, textipa=textipa)
+    if path is not None:
+        return list(), converter.write(forms, path=path)
+    tipa_forms, unknowns = list(), list()
+    for form_idx, (tipa, form_unknowns) in enumerate(converter.convert_all(forms)):
+        tipa_forms.append(tipa)
+        unknowns.extend((form_idx, idx, symbol) for idx, symbol in form_unknowns)
+    return tipa_forms, unknowns
\ No newline at end of file
@@ -1,4 +1,5 @@
 from algophon.models.D2L.discrepancy import Discrepancy
 from algophon.models.D2L.tier import Tier
 from algophon.models.D2L.rule import Rule
-from algophon.models.D2L.d2l import D2L
\ No newline at end of file
+from algophon.models.D2L.d2l import D2L
+from algophon.models.D2L.generate import CorpusGenerator
\ No newline at end of file
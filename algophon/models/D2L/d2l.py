@@ -1,11 +1,19 @@
 from typing import Union, Iterable
 
 from collections import defaultdict
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from itertools import chain
 
 from algophon import SegInv, SegStr, NatClass
 from algophon.symbols import UNDERSPECIFIED, BOUNDARIES
 from algophon.models.D2L import Discrepancy, Rule, Tier
 from algophon.utils import tsp
+from algophon.utils.profiling import Profiler, NULL_PHASE
+from algophon.utils.workers import resolve_n_jobs, process_pool, run_in_worker
+
+# the attributes of a trained model that production reads (the rest, e.g., the training pairs, are only needed for training)
+_PRODUCTION_STATE = ('seginv', '_rule', 'produce_cache_size')
 
 class D2L:
     '''
@@ -24,17 +32,33 @@ class D2L:
 
     def __init__(self, 
                  ipa_file_path: Union[None, str]=None, 
-                 sep: str='\t') -> object:
+                 sep: str='\t',
+                 profiler: Union[None, Profiler]=None,
+                 produce_cache_size: Union[None, int]=0) -> object:
         '''
         :ipa_file_path: (Optional; default None) if a str path is passed, the features are used from there
             - Default of None uses Panphon (https://github.com/dmort27/panphon) features
         :sep: (Optional; default '\t') the char separating columns in :ipa_file_path:
             - Only used if :ipa_file_path: is also passed
+        :profiler: (Optional; default None) a Profiler object to record the time spent in each phase of training and statistics of the rule search
+            - See self.profile_report()
+            - If None (default), nothing is recorded
+        :produce_cache_size: (Optional; default 0) the number of distinct URs whose SR is cached by self.produce()
+            - Useful when producing SRs for many repeated URs (e.g., when serving a trained model)
+            - If 0 (default), nothing is cached; if None, the cache is unbounded
+            - The cache is cleared whenever the rule changes; see self.produce_cache_info() for its statistics
         '''
+        self.profiler = profiler
+        self.produce_cache_size = produce_cache_size
         self.seginv = SegInv(add_boundary_symbols=True, ipa_file_path=ipa_file_path, sep=sep)
 
         self._discrepancy = None # the discrepancy to account for
-        self.rule = None
+        self._rule = None
+        self._reset_produce_cache()
+        self._pairs = None # the unique (UR, SR) pairs trained on so far (kept so that update() can fall back to a full search)
+        self._tsp_stats = None # the rule's (n, m) over self._pairs (recorded by _search_rule and kept current by update())
+        self._tsp_stats_version = None # the rule's _version when self._tsp_stats was recorded
+        self._abstract_URs = dict() # abstract UR symbol -> the set of SR segments it alternates with
 
     def __str__(self) -> str:
         if self.rule is None:
@@ -45,6 +69,72 @@ class D2L:
     def __repr__(self) -> str:
         return self.__str__()
 
+    def __getstate__(self) -> dict:
+        '''
+        The produce cache wraps a bound method, which cannot be pickled, so it is dropped (and rebuilt empty by __setstate__).
+        The profiler is also dropped, since it may hold an unpicklable callback.
+        '''
+        state = dict(self.__dict__)
+        del state['_produce_cache']
+        state['profiler'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._reset_produce_cache()
+
+    def _worker_copy(self) -> object:
+        '''
+        :return: a copy of the trained model holding only what production needs (see _PRODUCTION_STATE), to install in worker processes
+            - The copy does not have the training pairs, so it cannot be updated
+        '''
+        model = D2L.__new__(D2L)
+        model.__setstate__(dict((name, value) for name, value in self.__getstate__().items() if name in _PRODUCTION_STATE))
+        model.profiler = None
+        return model
+
+    @property
+    def rule(self) -> Union[None, Rule]:
+        '''
+        :return: the learned Rule (or None if no rule was learned)
+        '''
+        return self._rule
+
+    @rule.setter
+    def rule(self, rule: Union[None, Rule]) -> None:
+        self._rule = rule
+        self._tsp_stats = None # the old rule's TSP stats do not apply to the new rule
+        self._reset_produce_cache() # SRs cached under the old rule are stale
+
+    def _phase(self, name: str):
+        '''
+        :name: the name of a phase of training
+
+        :return: a context manager timing the phase with self.profiler (or a no-op one, if there is no profiler)
+        '''
+        return self.profiler.phase(name) if self.profiler is not None else NULL_PHASE
+
+    def _count_evaluated(self, pairs: set, passes: int=1) -> None:
+        '''
+        Counts rule evaluations over :pairs: with self.profiler (if there is one).
+
+        :pairs: the pairs that a rule was evaluated on
+        :passes: (Optional; default 1) the number of passes over :pairs:
+        '''
+        if self.profiler is not None:
+            self.profiler.count('rule_evaluations', passes)
+            self.profiler.count('pairs_evaluated', passes * len(pairs))
+
+    def profile_report(self) -> Union[None, dict]:
+        '''
+        :return: the report of self.profiler (see Profiler.report()), or None if the model was created without a profiler
+            - 'phases' times 'train', 'update', 'train_setup', 'search_rule', 'build_rule' (whose max_depth is the deepest recursion),
+              'get_tier_adj_contexts', and 'evaluate_rules'
+            - 'counts' has 'rule_evaluations' (passes of a rule over the pairs) and 'pairs_evaluated' (pairs summed over those passes)
+            - 'records' has 'tier_size', the number of segments on the tier at each call of build_rule
+        '''
+        return self.profiler.report() if self.profiler is not None else None
+
     def train_on_file(self, path: str, sep: str='\t') -> object:
         '''
         The same as self.train, but loads (UR, SR) pairs from a file instead of having them passed as an argument.
@@ -85,23 +175,97 @@ class D2L:
 
         :return: the D2L model object
         '''
-        pairs = self._train_setup(pairs) # set everything up to train
-
-        harmony_rule = self.build_rule(pairs=pairs)
-        disharmony_rule = self.build_rule(pairs=pairs, harmony=False)
-        if harmony_rule and not disharmony_rule: # if only harmony built a productive rule, use it
-            self.rule = harmony_rule
-        elif disharmony_rule and not harmony_rule: # if only disharmony built a productive rule, use it
-            self.rule = disharmony_rule
-        elif harmony_rule and disharmony_rule: # if both harmony and disharmony yield a rule, choose the more accurate
-            assim_acc, dissim_acc = harmony_rule.accuracy(pairs), disharmony_rule.accuracy(pairs)
-            self.rule = harmony_rule if assim_acc >= dissim_acc else disharmony_rule
-        else: # neither harmony nor disharmony built a productive rule
-            self.rule = None
-            self.default = None
-
+        with self._phase('train'):
+            with self._phase('train_setup'):
+                pairs = self._train_setup(pairs) # set everything up to train
+            self._pairs = pairs
+            self._search_rule(pairs=pairs)
         return self # return trained object
 
+    def update(self, pairs: Iterable) -> object:
+        '''
+        Updates the trained model with new (UR, SR) pairs, so that keeping a model current costs time proportional to the new data.
+            - The new pairs are tabulated into the existing Discrepancy
+            - The current rule's TSP stats are updated by evaluating it on the new pairs only
+            - The full rule search (as in self.train) is only rerun over all the pairs seen so far if the rule is no longer
+              productive (by the TSP), if the new pairs add alternating segments that the rule does not target, or if there is no rule
+            - If the new pairs change the features of an abstract UR (e.g., /D/ alternating with a new SR segment), the model is retrained from scratch
+
+        :pairs: an iterable of new (UR, SR) pairs (in the same form as for self.train)
+            - Pairs that the model has already been trained on are ignored
+
+        :return: the D2L model object
+        '''
+        if self._pairs is None: # not trained yet
+            return self.train(pairs)
+        with self._phase('update'):
+            pairs = list(pairs)
+            if self._add_abstract_URs(pairs=pairs, merge=True): # an abstract UR's features changed, so the old pairs are stale
+                old_pairs = list((' '.join(f'{seg}' for seg in ur), ' '.join(f'{seg}' for seg in sr)) for ur, sr in self._pairs)
+                self._discrepancy = None
+                return self.train(old_pairs + pairs)
+            with self._phase('train_setup'):
+                new_pairs = self._train_setup(pairs, update=True).difference(self._pairs)
+            if len(new_pairs) == 0:
+                return self
+            self._pairs.update(new_pairs)
+
+            if self.rule is not None and self.rule.target == self._discrepancy.get_alternating_UR_segs():
+                if self._tsp_stats is None or self._tsp_stats_version != self.rule._version: # the rule was assigned or modified in place
+                    with self._phase('evaluate_rules'):
+                        n, m = self.rule.tsp_stats(pairs=self._pairs) # so its stats are recomputed over all the pairs
+                    self._count_evaluated(pairs=self._pairs)
+                else:
+                    with self._phase('evaluate_rules'):
+                        n, m = self.rule.tsp_stats(pairs=new_pairs) # revalidate the rule on the new pairs only
+                    self._count_evaluated(pairs=new_pairs)
+                    n, m = self._tsp_stats[0] + n, self._tsp_stats[-1] + m
+                if tsp(n=n, m=m): # the rule is still productive, so keep it
+                    self._set_tsp_stats((n, m))
+                    return self
+            if self._discrepancy is not None: # rerun the full search
+                self._search_rule(pairs=self._pairs)
+            return self
+
+    def _search_rule(self, pairs: set) -> None:
+        '''
+        Searches for a harmony and a disharmony rule and sets self.rule to the better of the two (or None if neither is productive).
+
+        :pairs: a set of unique (UR, SR) tuples, where each UR and SR is a SegStr object
+        '''
+        self._tsp_stats = None
+        with self._phase('search_rule'):
+            harmony_rule = self.build_rule(pairs=pairs)
+            disharmony_rule = self.build_rule(pairs=pairs, harmony=False)
+            # record the (n, m) of each productive rule, so that update() can revalidate the chosen one on new pairs only
+            stats = dict()
+            with self._phase('evaluate_rules'):
+                for rule in [harmony_rule, disharmony_rule]:
+                    if rule:
+                        stats[id(rule)] = rule.tsp_stats(pairs=pairs)
+            self._count_evaluated(pairs=pairs, passes=len(stats))
+            accuracy = lambda rule: stats[id(rule)][-1] / stats[id(rule)][0] if stats[id(rule)][0] > 0 else 0.0 # as in Rule.accuracy
+            if harmony_rule and not disharmony_rule: # if only harmony built a productive rule, use it
+                self.rule = harmony_rule
+            elif disharmony_rule and not harmony_rule: # if only disharmony built a productive rule, use it
+                self.rule = disharmony_rule
+            elif harmony_rule and disharmony_rule: # if both harmony and disharmony yield a rule, choose the more accurate
+                self.rule = harmony_rule if accuracy(harmony_rule) >= accuracy(disharmony_rule) else disharmony_rule
+            else: # neither harmony nor disharmony built a productive rule
+                self.rule = None
+                self.default = None
+            if self.rule is not None:
+                self._set_tsp_stats(stats[id(self.rule)])
+
+    def _set_tsp_stats(self, stats: tuple) -> None:
+        '''
+        Records the (n, m) of self.rule over self._pairs, along with the rule's version (so that update() can tell if the rule was modified in place since).
+
+        :stats: the (n, m) tuple
+        '''
+        self._tsp_stats = stats
+        self._tsp_stats_version = self.rule._version
+
     def produce(self, ur: Union[SegStr, str]) -> SegStr:
         '''
         :ur: a UR in one of the following forms:
@@ -110,6 +274,61 @@ class D2L:
         
         :return: the SR predicted by the model (= :ur: if there is no rule, or the rule does not apply)
         '''
+        if self._produce_cache is None:
+            return self._produce(ur)
+        if self._rule is not None and self._rule._version != self._produce_cache_version: # the rule was modified in place
+            self._reset_produce_cache()
+        return self._produce_cache(ur)
+
+    # calling a D2L object amounts to calling its produce() method
+    __call__ = produce
+
+    def produce_batch(self, urs: Iterable[Union[SegStr, str]], n_jobs: int=1, chunk_size: Union[None, int]=None, executor: Union[None, object]=None) -> list:
+        '''
+        Produces SRs for many URs at once. The result is the same as calling self.produce on each UR, but
+            - repeated URs are only produced once
+            - if :n_jobs: != 1, chunks of URs are produced in parallel by worker processes, each holding a copy of the trained model (without its training data)
+
+        :urs: an Iterable of URs (see self.produce for the form of each)
+        :n_jobs: (Optional; default 1) the number of processes to produce with
+            - If 1, produces in the current process
+            - If None or < 0, uses one process per CPU
+            - 0 raises a ValueError
+        :chunk_size: (Optional; default None) the number of URs sent to a worker process at a time
+            - Only used if :n_jobs: != 1 or :executor: is passed
+            - If None, splits the URs into 4 chunks per process
+        :executor: (Optional; default None) a pool from algophon.utils.workers.process_pool(self, n_jobs) to produce in
+            - If None and :n_jobs: != 1, a pool is created (and shut down) for this call
+            - Pass one pool to many calls (e.g., for a stream of batches) so that the model is only installed in each worker once
+
+        :return: a list containing the output of self.produce for each UR, in the order of :urs:
+        '''
+        n_jobs = resolve_n_jobs(n_jobs)
+        urs = list(urs)
+        # ship URs as space-separated strs, so each chunk does not carry its own copy of the SegInv
+        keys = list(' '.join(f'{seg}' for seg in ur) if isinstance(ur, SegStr) else ur for ur in urs)
+        unique = list(dict.fromkeys(keys)) # the distinct URs, in order
+        if (n_jobs == 1 and executor is None) or len(unique) < 2:
+            firsts = dict(zip(reversed(keys), reversed(urs))) # maps each distinct UR to its first occurrence (so SegStr URs are not rebuilt)
+            srs = dict((key, self.produce(firsts[key])) for key in unique)
+        else:
+            if chunk_size is None:
+                chunk_size = max(1, -(-len(unique) // (4 * n_jobs))) # ceil division
+            chunks = list(unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size))
+            with nullcontext(executor) if executor is not None else process_pool(self, n_jobs) as executor: # each worker holds self._worker_copy()
+                produced = chain.from_iterable(executor.map(partial(run_in_worker, '_produce_strs'), chunks))
+                # rebuild the SRs as SegStr objects over self.seginv
+                srs = dict((ur, SegStr(sr, seginv=self.seginv)) for ur, sr in zip(unique, produced))
+        return list(srs[key] for key in keys)
+
+    def _produce(self, ur: Union[SegStr, str]) -> SegStr:
+        '''
+        Computes the SR that self.produce returns; calls are memoized by self._produce_cache (if there is one).
+
+        :ur: a UR (see self.produce)
+
+        :return: the SR predicted by the model
+        '''
         if isinstance(ur, str): # convert str to SegStr
             ur = SegStr(ur, seginv=self.seginv)
 
@@ -118,8 +337,30 @@ class D2L:
             sr = self.rule(sr)
         return sr # return sr
 
-    # calling a D2L object amounts to calling its produce() method
-    __call__ = produce
+    def _produce_strs(self, urs: list) -> list:
+        '''
+        :urs: a list of URs (see self.produce)
+
+        :return: the SRs of :urs: as space-separated strs
+            - Run by the worker processes of self.produce_batch (the parent process rebuilds the SRs as SegStr objects)
+        '''
+        return list(' '.join(f'{seg}' for seg in self.produce(ur)) for ur in urs)
+
+    def _reset_produce_cache(self) -> None:
+        '''
+        Replaces self._produce_cache with an empty LRU cache (or None if caching is disabled). Called whenever the rule changes.
+            - functools.lru_cache is thread-safe, so one cache can be shared by threads calling self.produce()
+            - URs are cached as passed, so a str UR and the equal SegStr UR have separate entries
+        '''
+        self._produce_cache_version = self._rule._version if self._rule is not None else None
+        self._produce_cache = lru_cache(maxsize=self.produce_cache_size)(self._produce) if self.produce_cache_size != 0 else None
+
+    def produce_cache_info(self) -> Union[None, tuple]:
+        '''
+        :return: the statistics of the cache mapping URs to their SRs, or None if the model was created without one
+            - A named tuple (hits, misses, maxsize, currsize), as returned by functools.lru_cache's cache_info()
+        '''
+        return self._produce_cache.cache_info() if self._produce_cache is not None else None
 
     def accuracy(self, pairs: Iterable) -> float:
         '''
@@ -136,7 +377,7 @@ class D2L:
                 c += 1
         return c / n
 
-    def _train_setup(self, pairs: Iterable) -> set:
+    def _train_setup(self, pairs: Iterable, update: bool=False) -> set:
         '''
         This method does two things:
             1) Converts :pairs: to a set so that all pairs are unique, and converts URs and SRs to SegStr objects if they are strs.
@@ -144,29 +385,14 @@ class D2L:
 
         :pairs: a list of (UR, SR pairs)
             - The same as the :pairs: argument for self.train()
+        :update: (Optional; default False) if True, the abstract URs are assumed to have already been added (by self.update)
 
         :return: a set of unique (UR, SR) tuples, where each UR and SR is a SegStr object
         '''
 
         # handle abstract URs
-        
-        abstract_URs = defaultdict(set)
-        for ur, sr in pairs:
-            sr = SegStr(sr, self.seginv) if isinstance(sr, str) else sr
-            if isinstance(ur, str): # if the UR is already a SegStr, then any abstract URs must have already been added by the user
-                ur = ur.split() # split on spaces
-                for i in range(len(ur)): # look for discrepancies
-                    ur_seg, sr_seg = ur[i], sr[i] # extract segments
-                    if ur_seg != sr_seg and ur_seg not in self.seginv._seg_to_feat_vec: # tabulate abstract underlying seg
-                        abstract_URs[ur_seg].add(sr_seg)
-        
-        for ur, srs in abstract_URs.items(): # compute the UR features for each abstract UR
-            shared_feats = set(feat[1:] for feat in self.seginv.feature_intersection(srs, exclude_underspecified=False))
-            feature_diff = set(self.seginv.feature_space).difference(shared_feats)
-            example_sr = list(srs)[0]
-            # compute a feature dictionary, where shared features are specified and the unshared features are UNDERSPECIFIED
-            features = dict((feat, val if feat not in feature_diff else UNDERSPECIFIED) for feat, val in self.seginv[example_sr].features.items())
-            self.seginv.add_custom(symbol=ur, features=features)
+        if not update: # self.update() adds the abstract URs itself
+            self._add_abstract_URs(pairs=pairs)
 
         # build pairs and discrepancy
 
@@ -191,6 +417,47 @@ class D2L:
 
         return setup_pairs
     
+    def _add_abstract_URs(self, pairs: list, merge: bool=False) -> bool:
+        '''
+        Adds the abstract URs in :pairs: (UR symbols that are not in the IPA data) to self.seginv.
+        Each is specified for the features shared by the SR segments it alternates with, and UNDERSPECIFIED for the rest.
+
+        :pairs: a list of (UR, SR) pairs
+            - Only URs that are str objects are searched for abstract segments
+        :merge: (Optional; default False) if True, the SR segments are merged with those from previous calls, and abstract URs whose features do not change are left as they are
+
+        :return: True if the features of a previously-added abstract UR changed
+        '''
+        abstract_URs = defaultdict(set)
+        if merge:
+            for ur, srs in self._abstract_URs.items():
+                abstract_URs[ur].update(srs)
+        for ur, sr in pairs:
+            sr = SegStr(sr, self.seginv) if isinstance(sr, str) else sr
+            if isinstance(ur, str): # if the UR is already a SegStr, then any abstract URs must have already been added by the user
+                ur = ur.split() # split on spaces
+                for i in range(len(ur)): # look for discrepancies
+                    ur_seg, sr_seg = ur[i], sr[i] # extract segments
+                    if ur_seg != sr_seg and ur_seg not in self.seginv._seg_to_feat_vec: # tabulate abstract underlying seg
+                        abstract_URs[ur_seg].add(sr_seg)
+
+        changed = False
+        for ur, srs in abstract_URs.items(): # compute the UR features for each abstract UR
+            shared_feats = set(feat[1:] for feat in self.seginv.feature_intersection(srs, exclude_underspecified=False))
+            feature_diff = set(self.seginv.feature_space).difference(shared_feats)
+            example_sr = list(srs)[0]
+            # compute a feature dictionary, where shared features are specified and the unshared features are UNDERSPECIFIED
+            features = dict((feat, val if feat not in feature_diff else UNDERSPECIFIED) for feat, val in self.seginv[example_sr].features.items())
+            if merge and ur in self._abstract_URs:
+                if self.seginv[ur].features == features: # nothing new about this abstract UR
+                    continue
+                changed = True
+            if ur in self.seginv._ipa_to_seg: # replace the previous definition
+                self.seginv.segs.discard(self.seginv._ipa_to_seg[ur])
+            self.seginv.add_custom(symbol=ur, features=features)
+        self._abstract_URs = abstract_URs
+        return changed
+
     def build_rule(self, pairs: set, delset: set=None, tier=None, harmony: bool=True, discrepancy: Union[None, Discrepancy]=None) -> Rule:
         '''
         Builds a rule recursively.
@@ -202,61 +469,72 @@ class D2L:
         :discrepancy: (Optional; default None) allows for providing a Discrepancy object
             - Useful for running D2L multiple times for different discrepancies (e.g., as in PLP)
         '''
-        delset = set() if delset is None else delset
-        if discrepancy is None: # use self._discrepancy by default
-            discrepancy = self._discrepancy
-        target = discrepancy.get_alternating_UR_segs() # compute target segs
-
-        lctxts, rctxts = self._get_tier_adj_contexts(discrepancy=discrepancy, tier=tier) # compute ctxts
-        # build left rule
-        left_rule = Rule(seginv=self.seginv, target=target, features=discrepancy.feature_diff, left_ctxts=lctxts, tier=tier, harmony=harmony)
-        left_underextensions = left_rule.underextension_SRs(pairs=pairs)
-        if len(left_underextensions) > 0:
-            left_default_sr = sorted(left_underextensions.items(), reverse=True, key=lambda it: it[-1])[0][0]
-            left_rule.set_defaults(dict((feat, left_default_sr.features[feat]) for feat in discrepancy.feature_diff))
-        # build right rule
-        right_rule = Rule(seginv=self.seginv, target=target, features=discrepancy.feature_diff, right_ctxts=rctxts, tier=tier, harmony=harmony)
-        right_underextensions = right_rule.underextension_SRs(pairs=pairs)
-        if len(right_underextensions) > 0:
-            right_default_sr = sorted(right_underextensions.items(), reverse=True, key=lambda it: it[-1])[0][0]
-            right_rule.set_defaults(dict((feat, right_default_sr.features[feat]) for feat in discrepancy.feature_diff))
-
-        rule = left_rule if left_rule.accuracy(pairs=pairs) >= right_rule.accuracy(pairs=pairs) else right_rule
-        n, m = rule.tsp_stats(pairs=pairs)
-        if tsp(n=n, m=m):
-            ctxt = set(rule.left_ctxts if rule.left_ctxts is not None else rule.right_ctxts)
-            if rule.tier is not None: # set the ctxt to the tier if doing so does not change accuracy
-                acc_before = rule.accuracy(pairs)
-                rule.set_ctxts(ctxts=rule.tier._tierset)
-                acc_after = rule.accuracy(pairs)
-                if acc_after < acc_before: # change it back
-                    rule.set_ctxts(ctxt)
-            return rule
+        with self._phase('build_rule'): # nested once per recursion, so the phase's max_depth is the recursion depth
+            delset = set() if delset is None else delset
+            if discrepancy is None: # use self._discrepancy by default
+                discrepancy = self._discrepancy
+            target = discrepancy.get_alternating_UR_segs() # compute target segs
+
+            if self.profiler is not None: # record the number of segments on the tier
+                self.profiler.record('tier_size', len(self.seginv) if tier is None else sum(1 for seg in self.seginv.segs if seg in tier))
+            with self._phase('get_tier_adj_contexts'):
+                lctxts, rctxts = self._get_tier_adj_contexts(discrepancy=discrepancy, tier=tier) # compute ctxts
+            with self._phase('evaluate_rules'):
+                # build left rule
+                left_rule = Rule(seginv=self.seginv, target=target, features=discrepancy.feature_diff, left_ctxts=lctxts, tier=tier, harmony=harmony)
+                left_underextensions = left_rule.underextension_SRs(pairs=pairs)
+                if len(left_underextensions) > 0:
+                    left_default_sr = sorted(left_underextensions.items(), reverse=True, key=lambda it: it[-1])[0][0]
+                    left_rule.set_defaults(dict((feat, left_default_sr.features[feat]) for feat in discrepancy.feature_diff))
+                # build right rule
+                right_rule = Rule(seginv=self.seginv, target=target, features=discrepancy.feature_diff, right_ctxts=rctxts, tier=tier, harmony=harmony)
+                right_underextensions = right_rule.underextension_SRs(pairs=pairs)
+                if len(right_underextensions) > 0:
+                    right_default_sr = sorted(right_underextensions.items(), reverse=True, key=lambda it: it[-1])[0][0]
+                    right_rule.set_defaults(dict((feat, right_default_sr.features[feat]) for feat in discrepancy.feature_diff))
+
+                rule = left_rule if left_rule.accuracy(pairs=pairs) >= right_rule.accuracy(pairs=pairs) else right_rule
+                n, m = rule.tsp_stats(pairs=pairs)
+            self._count_evaluated(pairs=pairs, passes=5) # underextension_SRs() and accuracy() of both rules, and tsp_stats()
+            if tsp(n=n, m=m):
+                ctxt = set(rule.left_ctxts if rule.left_ctxts is not None else rule.right_ctxts)
+                if rule.tier is not None: # set the ctxt to the tier if doing so does not change accuracy
+                    with self._phase('evaluate_rules'):
+                        acc_before = rule.accuracy(pairs)
+                        rule.set_ctxts(ctxts=rule.tier._tierset)
+                        acc_after = rule.accuracy(pairs)
+                    self._count_evaluated(pairs=pairs, passes=2)
+                    if acc_after < acc_before: # change it back
+                        rule.set_ctxts(ctxt)
+                return rule
         
-        # rule not productive
-
-        _old_delset = set(delset)
-        delset = delset.union(left_rule.errant_ctxts(pairs).union(right_rule.errant_ctxts(pairs))).difference(target)
-        opts = list(NatClass(feats={feat}, seginv=self.seginv) for feat in self.seginv.feature_intersection(delset))
-        # filter nat classes that do remove target segs
-        opts = list(opt for opt in opts if not any(ur in opt for ur in target))
-        if len(opts) > 0:
-            best = sorted(opts, key=lambda opt: (len(self.seginv.extension(opt)), f'{opt}'))[0]
-            _negate_val = {'+': '-', '-': '+'}
-            complement = NatClass(feats=set(f'{_negate_val[feat[0]]}{feat[1:]}' for feat in best.feats), seginv=self.seginv)
-            # if the neg of the delset nat class is the the extension complement (e.g., [+syl] vs. [-syl]), use it
-            if best.extension_complement().difference(BOUNDARIES) == complement.extension():
-                tier = Tier(seginv=self.seginv, feats=complement)
-            else: # otherwise, use the delset nat class
-                tier = Tier(seginv=self.seginv, feats=best, as_delset=True)
-        else:
-            complement = self.seginv.segs.difference(delset)
-            tier = Tier(seginv=self.seginv, segs=complement)
-
-        if _old_delset == delset: # prevent infinite recursion
-            return None
+            # rule not productive
+
+            _old_delset = set(delset)
+            with self._phase('evaluate_rules'):
+                errant_ctxts = left_rule.errant_ctxts(pairs).union(right_rule.errant_ctxts(pairs))
+            self._count_evaluated(pairs=pairs, passes=2)
+            delset = delset.union(errant_ctxts).difference(target)
+            opts = list(NatClass(feats={feat}, seginv=self.seginv) for feat in self.seginv.feature_intersection(delset))
+            # filter nat classes that do remove target segs
+            opts = list(opt for opt in opts if not any(ur in opt for ur in target))
+            if len(opts) > 0:
+                best = sorted(opts, key=lambda opt: (len(self.seginv.extension(opt)), f'{opt}'))[0]
+                _negate_val = {'+': '-', '-': '+'}
+                complement = NatClass(feats=set(f'{_negate_val[feat[0]]}{feat[1:]}' for feat in best.feats), seginv=self.seginv)
+                # if the neg of the delset nat class is the the extension complement (e.g., [+syl] vs. [-syl]), use it
+                if best.extension_complement().difference(BOUNDARIES) == complement.extension():
+                    tier = Tier(seginv=self.seginv, feats=complement)
+                else: # otherwise, use the delset nat class
+                    tier = Tier(seginv=self.seginv, feats=best, as_delset=True)
+            else:
+                complement = self.seginv.segs.difference(delset)
+                tier = Tier(seginv=self.seginv, segs=complement)
+
+            if _old_delset == delset: # prevent infinite recursion
+                return None
         
-        return self.build_rule(pairs=pairs, delset=delset, tier=tier, harmony=harmony, discrepancy=discrepancy)
+            return self.build_rule(pairs=pairs, delset=delset, tier=tier, harmony=harmony, discrepancy=discrepancy)
 
     def _get_tier_adj_contexts(self, discrepancy: Discrepancy, tier: Union[None, Tier]) -> tuple[set, set]:
         '''
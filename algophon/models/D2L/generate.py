@@ -0,0 +1,227 @@
+from typing import Union, Iterable
+
+import random
+
+from algophon import Seg, SegInv, NatClass, SegStr
+from algophon.symbols import UNDERSPECIFIED
+from algophon.models.D2L import Tier, Rule
+
+def add_abstract_seg(seginv: SegInv, symbol: str, alternants: Iterable) -> Seg:
+    '''
+    Adds an abstract segment (e.g., /D/ for {[d], [n]}) to :seginv:, specified for the features shared by its :alternants: and UNDERSPECIFIED for the rest.
+    This is the same representation that D2L infers for abstract URs.
+
+    :seginv: a SegInv object
+    :symbol: a str symbol for the abstract segment
+    :alternants: an iterable of IPA segments that the abstract segment alternates with
+
+    :return: the abstract Seg object
+    '''
+    alternants = list(seginv.add_and_get(seg) for seg in alternants)
+    shared_feats = set(feat[1:] for feat in seginv.feature_intersection(alternants, exclude_underspecified=False))
+    features = dict((feat, val if feat in shared_feats else UNDERSPECIFIED) for feat, val in alternants[0].features.items())
+    seginv.add_custom(symbol=symbol, features=features)
+    return seginv[symbol]
+
+class CorpusGenerator:
+    '''
+    Generates reproducible (UR, SR) training pairs for a (dis)harmony Rule.
+
+    Each UR is a random CV stem with an affix containing the Rule's (abstract) target, and its SR is computed by applying the Rule.
+    '''
+    def __init__(self,
+                 rule: Rule,
+                 consonants: Iterable,
+                 vowels: Iterable,
+                 suffixes: Union[None, Iterable]=None,
+                 prefixes: Union[None, Iterable]=None,
+                 min_syls: int=1,
+                 max_syls: int=3,
+                 seed: int=0) -> object:
+        '''
+        :rule: the Rule to generate pairs for
+        :consonants: an iterable of IPA consonants to build stems from
+        :vowels: an iterable of IPA vowels to build stems from
+        :suffixes: (Optional; default None) an iterable of space-separated str suffixes, each containing a target of :rule:
+        :prefixes: (Optional; default None) an iterable of space-separated str prefixes, each containing a target of :rule:
+            - At least one of :suffixes: and :prefixes: must be passed
+        :min_syls: (Optional; default 1) the minimum number of CV syllables in a stem
+        :max_syls: (Optional; default 3) the maximum number of CV syllables in a stem
+        :seed: (Optional; default 0) the random seed
+        '''
+        if not suffixes and not prefixes:
+            raise ValueError('At least one of :suffixes: and :prefixes: must be passed.')
+        if not 1 <= min_syls <= max_syls:
+            raise ValueError(f'Must have 1 <= :min_syls: <= :max_syls:, but got {min_syls} and {max_syls}.')
+        self.rule = rule
+        self.seginv = rule.seginv
+        self.consonants = sorted(self.seginv.add_and_get(seg) for seg in consonants) # sorted so that the output only depends on the seed
+        self.vowels = sorted(self.seginv.add_and_get(seg) for seg in vowels)
+        # affixes are stored as (is_prefix, segs) tuples
+        self.affixes = list((False, self._affix_segs(suffix)) for suffix in (suffixes or list()))
+        self.affixes += list((True, self._affix_segs(prefix)) for prefix in (prefixes or list()))
+        self.min_syls = min_syls
+        self.max_syls = max_syls
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    def __str__(self) -> str:
+        return f'CorpusGenerator for rule {self.rule}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _affix_segs(self, affix: str) -> list:
+        '''
+        :affix: a space-separated str affix
+
+        :return: the affix as a list of Seg objects
+        '''
+        segs = list(self.seginv[seg] for seg in affix.split())
+        if not any(seg in self.rule.target for seg in segs):
+            raise ValueError(f'The affix "{affix}" does not contain a target of the rule {self.rule}.')
+        return segs
+
+    def reset(self) -> None:
+        '''
+        Resets the random state, so that the generator produces the same pairs again.
+
+        :return: None
+        '''
+        self._rng = random.Random(self.seed)
+
+    def stem(self) -> list:
+        '''
+        :return: a random stem as a list of Seg objects
+        '''
+        rng = self._rng
+        segs = list()
+        for _ in range(rng.randint(self.min_syls, self.max_syls)):
+            segs.append(rng.choice(self.consonants))
+            segs.append(rng.choice(self.vowels))
+        return segs
+
+    def pair(self) -> tuple[str, str]:
+        '''
+        :return: a random (UR, SR) pair of space-separated strs
+        '''
+        is_prefix, affix = self._rng.choice(self.affixes)
+        ur = affix + self.stem() if is_prefix else self.stem() + affix
+        sr = self.rule.produce(SegStr._from_segs(ur, seginv=self.seginv))
+        return ' '.join(f'{seg}' for seg in ur), ' '.join(f'{seg}' for seg in sr)
+
+    def generate(self, n: int) -> Iterable:
+        '''
+        Lazily generates pairs (so that very large corpora need not be held in memory).
+
+        :n: the number of pairs to generate
+
+        :return: a generator of :n: (UR, SR) pairs of space-separated strs
+            - Pairs are sampled independently, so there may be duplicates (D2L learns over unique pairs)
+        '''
+        for _ in range(n):
+            yield self.pair()
+
+    def sample(self, n: int) -> list:
+        '''
+        :n: the number of pairs to generate
+
+        :return: a list of :n: (UR, SR) pairs of space-separated strs
+        '''
+        return list(self.generate(n))
+
+    def write(self, path: str, n: int, sep: str='\t') -> None:
+        '''
+        Streams :n: pairs to a file in the format read by D2L.train_on_file().
+
+        :path: the file to write to
+        :n: the number of pairs to generate
+        :sep: (Optional; default '\t') the character used to separate URs from SRs in the file
+
+        :return: None
+        '''
+        with open(path, 'w') as f:
+            for ur, sr in self.generate(n):
+                f.write(f'{ur}{sep}{sr}\n')
+
+def _feature_values(seg: Seg, features: set) -> dict:
+    '''
+    :seg: a Seg object
+    :features: a set of features
+
+    :return: a dict of :seg:'s values for :features:
+    '''
+    return dict((feat, seg.features[feat]) for feat in features)
+
+def nasal_harmony(seed: int=0, ipa_file_path: Union[None, str]=None, sep: str='\t') -> CorpusGenerator:
+    '''
+    Long-distance nasal harmony (the README example): suffixal /D/ surfaces as [n] if the closest preceding consonant on the nasal tier is a nasal and as [d] otherwise.
+
+    :seed: (Optional; default 0) the random seed
+    :ipa_file_path: (Optional; default None) passed to the SegInv
+    :sep: (Optional; default '\t') passed to the SegInv
+
+    :return: a CorpusGenerator
+    '''
+    seginv = SegInv(add_boundary_symbols=True, ipa_file_path=ipa_file_path, sep=sep)
+    add_abstract_seg(seginv, symbol='D', alternants=['d', 'n'])
+    features = seginv.feature_diff('d', 'n')
+    rule = Rule(seginv=seginv, target={seginv['D']}, features=features, defaults=_feature_values(seginv['d'], features),
+                left_ctxts=NatClass({'+nas'}, seginv=seginv), tier=Tier(seginv=seginv, feats={'-nas'}, as_delset=True))
+    return CorpusGenerator(rule=rule, consonants=['p', 't', 'k', 'b', 'd', 'g', 's', 'm', 'n'], vowels=['a', 'e', 'i', 'o', 'u'], suffixes=['D', 'D a', 'D i'], max_syls=4, seed=seed)
+
+def nasal_dissimilation(seed: int=0, ipa_file_path: Union[None, str]=None, sep: str='\t') -> CorpusGenerator:
+    '''
+    Long-distance nasal dissimilation (disharmony): suffixal /N/ surfaces as [d] if the closest preceding consonant on the nasal tier is a nasal and as [n] otherwise.
+
+    :seed: (Optional; default 0) the random seed
+    :ipa_file_path: (Optional; default None) passed to the SegInv
+    :sep: (Optional; default '\t') passed to the SegInv
+
+    :return: a CorpusGenerator
+    '''
+    seginv = SegInv(add_boundary_symbols=True, ipa_file_path=ipa_file_path, sep=sep)
+    add_abstract_seg(seginv, symbol='N', alternants=['d', 'n'])
+    features = seginv.feature_diff('d', 'n')
+    rule = Rule(seginv=seginv, target={seginv['N']}, features=features, defaults=_feature_values(seginv['n'], features),
+                left_ctxts=NatClass({'+nas'}, seginv=seginv), tier=Tier(seginv=seginv, feats={'-nas'}, as_delset=True), harmony=False)
+    return CorpusGenerator(rule=rule, consonants=['p', 't', 'k', 'b', 'd', 'g', 's', 'm', 'n'], vowels=['a', 'e', 'i', 'o', 'u'], suffixes=['N', 'N a', 'N i'], max_syls=4, seed=seed)
+
+def sibilant_harmony(seed: int=0, ipa_file_path: Union[None, str]=None, sep: str='\t') -> CorpusGenerator:
+    '''
+    Long-distance sibilant harmony: suffixal /S/ agrees in anteriority with the closest preceding sibilant, and surfaces as [s] if there is none.
+
+    :seed: (Optional; default 0) the random seed
+    :ipa_file_path: (Optional; default None) passed to the SegInv
+    :sep: (Optional; default '\t') passed to the SegInv
+
+    :return: a CorpusGenerator
+    '''
+    seginv = SegInv(add_boundary_symbols=True, ipa_file_path=ipa_file_path, sep=sep)
+    add_abstract_seg(seginv, symbol='S', alternants=['s', 'ʃ'])
+    features = seginv.feature_diff('s', 'ʃ')
+    sibilants = NatClass({'+cont', '+cor', '-son'}, seginv=seginv) # Panphon does not specify [s] and [ʃ] for [strid]
+    rule = Rule(seginv=seginv, target={seginv['S']}, features=features, defaults=_feature_values(seginv['s'], features),
+                left_ctxts=sibilants, tier=Tier(seginv=seginv, feats=sibilants))
+    return CorpusGenerator(rule=rule, consonants=['p', 't', 'k', 'm', 'n', 'l', 's', 'ʃ'], vowels=['a', 'e', 'i', 'o', 'u'], suffixes=['S', 'S a', 'S i'], max_syls=4, seed=seed)
+
+def vowel_harmony(transparent: Union[None, Iterable]=None, seed: int=0, ipa_file_path: Union[None, str]=None, sep: str='\t') -> CorpusGenerator:
+    '''
+    Backness harmony (as in Finnish): suffixal /U/ agrees in [back] with the closest preceding vowel on the vowel tier, and surfaces as [y] if there is none.
+
+    :transparent: (Optional; default None) an iterable of vowels that are transparent (i.e., not on the tier), like Finnish neutral [i] and [e]
+    :seed: (Optional; default 0) the random seed
+    :ipa_file_path: (Optional; default None) passed to the SegInv
+    :sep: (Optional; default '\t') passed to the SegInv
+
+    :return: a CorpusGenerator
+    '''
+    seginv = SegInv(add_boundary_symbols=True, ipa_file_path=ipa_file_path, sep=sep)
+    vowels = ['i', 'e', 'y', 'ø', 'u', 'o', 'ɑ']
+    add_abstract_seg(seginv, symbol='U', alternants=['y', 'u'])
+    features = seginv.feature_diff('y', 'u')
+    transparent = set(transparent) if transparent is not None else set()
+    tier = Tier(seginv=seginv, segs=set(vowels).difference(transparent).union({'U'}))
+    rule = Rule(seginv=seginv, target={seginv['U']}, features=features, defaults=_feature_values(seginv['y'], features),
+                left_ctxts=NatClass({'+syl'}, seginv=seginv), tier=tier)
+    return CorpusGenerator(rule=rule, consonants=['p', 't', 'k', 'm', 'n', 'l', 's'], vowels=vowels, suffixes=['U', 'U n', 'l U'], max_syls=4, seed=seed)
\ No newline at end of file
@@ -47,6 +47,7 @@ class Rule:
         self.left_to_right = self.left_ctxts is not None # compute whether rule applies left-to-right or right-to-left
         self.tier = tier
         self.harmony = harmony
+        self._version = 0 # incremented whenever the rule is modified in place (so that caches of its outputs can be invalidated)
 
     def __str__(self) -> str:
         feat_str = '{' + ','.join(sorted(self.features)) + '}'
@@ -198,6 +199,7 @@ class Rule:
         if defaults is not None and not all(feat in defaults for feat in self.features):
             raise ValueError(':defaults: must include one value per :self.features:')
         self.defaults = defaults
+        self._version += 1
 
     def set_ctxts(self, ctxts: Union[None, set, NatClass]) -> None:
         '''
@@ -208,6 +210,7 @@ class Rule:
             self.left_ctxts = ctxts
         else:
             self.right_ctxts = ctxts
+        self._version += 1
 
     def errant_ctxts(self, pairs: Iterable) -> set:
         '''
@@ -1,2 +1,3 @@
 from algophon.models.Miaseg.paradigm import Paradigm
-from algophon.models.Miaseg.miaseg import Miaseg
\ No newline at end of file
+from algophon.models.Miaseg.miaseg import Miaseg
+from algophon.models.Miaseg.generate import ParadigmGenerator
\ No newline at end of file
@@ -0,0 +1,210 @@
+from typing import Union, Iterable
+
+import random
+from itertools import combinations
+
+from algophon.models.Miaseg.miaseg import SUFFIX, PREFIX
+
+CONSONANTS = ['p', 't', 'k', 'b', 'd', 'g', 'm', 'n', 's', 'l', 'r', 'j']
+VOWELS = ['a', 'e', 'i', 'o', 'u']
+
+class ParadigmGenerator:
+    '''
+    Generates reproducible agglutinative paradigms of (root, word, features) triples with known ground-truth segmentations.
+
+    The generated language has a fixed template: each feature is marked by a prefix or a suffix in a fixed slot.
+    Each feature has one or more allomorphs, and which allomorph a root takes is lexically conditioned (each root belongs to an inflection class).
+    Paradigms are generated independently (each from its own seed), so any number of them can be streamed without holding earlier ones in memory.
+    '''
+    def __init__(self,
+                 n_feats: int=4,
+                 prefix_ratio: float=0.25,
+                 max_allomorphs: int=2,
+                 max_feats_per_word: Union[None, int]=None,
+                 cells_per_paradigm: Union[None, int]=None,
+                 use_ipa: bool=False,
+                 seed: int=0) -> object:
+        '''
+        :n_feats: (Optional; default 4) the number of features
+        :prefix_ratio: (Optional; default 0.25) the probability that a feature is marked by a prefix (rather than a suffix)
+        :max_allomorphs: (Optional; default 2) the maximum number of allomorphs per feature (and the number of inflection classes)
+        :max_feats_per_word: (Optional; default None) the maximum number of features marked in a word
+            - If None, a word can mark every feature
+        :cells_per_paradigm: (Optional; default None) the number of words (cells) sampled for each paradigm
+            - If None, each paradigm contains every combination of up to :max_feats_per_word: features
+            - The bare root is always included
+        :use_ipa: (Optional; default False) if True, words are space-separated strs of IPA symbols (for Miaseg(use_ipa=True))
+        :seed: (Optional; default 0) the random seed
+        '''
+        if n_feats < 1:
+            raise ValueError(f':n_feats: must be at least 1, but got {n_feats}.')
+        if not 1 <= max_allomorphs <= len(VOWELS):
+            raise ValueError(f':max_allomorphs: must be between 1 and {len(VOWELS)}, but got {max_allomorphs}.')
+        self.n_feats = n_feats
+        self.max_feats_per_word = n_feats if max_feats_per_word is None else min(max_feats_per_word, n_feats)
+        self.cells_per_paradigm = cells_per_paradigm
+        self.max_allomorphs = max_allomorphs
+        self.use_ipa = use_ipa
+        self.seed = seed
+
+        # generate the grammar
+        rng = random.Random(f'{seed}-grammar')
+        self.features = list(f'F{i}' for i in range(n_feats)) # in template order
+        self.types = dict((feat, PREFIX if rng.random() < prefix_ratio else SUFFIX) for feat in self.features)
+        self.allomorphs = dict() # maps each feature to its list of allomorphs (each a list of symbols)
+        forms = set() # every allomorph so far (so that no two features share a form)
+        for feat in self.features:
+            shape = rng.choice(['CV', 'VC', 'CVC'] if self.types[feat] == SUFFIX else ['CV', 'CVC'])
+            vowels = rng.sample(VOWELS, rng.randint(1, max_allomorphs)) # allomorphs share consonants and differ in their vowel
+            attempts = 0
+            while True:
+                consonants = list(rng.choice(CONSONANTS) for _ in range(shape.count('C')))
+                allomorphs = list(self._fill(shape, consonants, vowel) for vowel in vowels)
+                if not any(tuple(form) in forms for form in allomorphs):
+                    break
+                attempts += 1
+                if attempts % 100 == 0: # the short forms are used up, so lengthen the shape
+                    shape += 'CV'
+            forms.update(tuple(form) for form in allomorphs)
+            self.allomorphs[feat] = allomorphs
+        # the possible cells of a paradigm (only enumerated if every paradigm contains all of them)
+        self._cells = None
+        if cells_per_paradigm is None:
+            self._cells = list(cell for k in range(self.max_feats_per_word + 1) for cell in combinations(self.features, k))
+
+    def __str__(self) -> str:
+        return f'ParadigmGenerator with {self.n_feats} features'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _fill(self, shape: str, consonants: list, vowel: str) -> list:
+        '''
+        :shape: a str of 'C' and 'V' slots
+        :consonants: a list of consonants, one per 'C' slot
+        :vowel: the vowel to fill every 'V' slot with
+
+        :return: a list of symbols
+        '''
+        consonants = iter(consonants)
+        return list(vowel if slot == 'V' else next(consonants) for slot in shape)
+
+    def _join(self, symbols: list) -> str:
+        '''
+        :symbols: a list of symbols
+
+        :return: the symbols as a word (space-separated if self.use_ipa)
+        '''
+        return ' '.join(symbols) if self.use_ipa else ''.join(symbols)
+
+    def _sample_cells(self, rng: random.Random) -> list:
+        '''
+        :rng: the random.Random object of the paradigm
+
+        :return: a list of feature tuples (in template order), one per cell of the paradigm
+        '''
+        if self._cells is not None:
+            return self._cells
+        cells = {()}
+        attempts = 0
+        while len(cells) < self.cells_per_paradigm and attempts < 10 * self.cells_per_paradigm: # bounded, in case there are fewer possible cells
+            k = rng.randint(1, self.max_feats_per_word)
+            cells.add(tuple(sorted(rng.sample(self.features, k), key=self.features.index)))
+            attempts += 1
+        return sorted(cells, key=lambda cell: (len(cell), cell))
+
+    def paradigm(self, idx: int) -> list:
+        '''
+        :idx: the index of the paradigm (the same :idx: always gives the same paradigm)
+
+        :return: a list of (triple, segmentation, analysis) tuples, one per word in the paradigm
+            - The same format as Miaseg.train_and_segment(), so that its output can be compared directly to the ground truth
+        '''
+        rng = random.Random(f'{self.seed}-{idx}')
+        root = f'ROOT{idx}'
+        stem = list()
+        for _ in range(rng.randint(2, 3)):
+            stem += [rng.choice(CONSONANTS), rng.choice(VOWELS)]
+        inflection_class = rng.randrange(self.max_allomorphs)
+        entries = list()
+        for cell in self._sample_cells(rng):
+            morphs = list(self.allomorphs[feat][inflection_class % len(self.allomorphs[feat])] for feat in cell)
+            prfxs = list(i for i, feat in enumerate(cell) if self.types[feat] == PREFIX)
+            sufxs = list(i for i, feat in enumerate(cell) if self.types[feat] == SUFFIX)
+            segmentation = list(self._join(morphs[i]) for i in prfxs) + [self._join(stem)] + list(self._join(morphs[i]) for i in sufxs)
+            analysis = list(cell[i] for i in prfxs) + ['ROOT'] + list(cell[i] for i in sufxs)
+            word = self._join(list(symbol for i in prfxs for symbol in morphs[i]) + stem + list(symbol for i in sufxs for symbol in morphs[i]))
+            entries.append(((root, word, cell), segmentation, analysis))
+        return entries
+
+    def generate(self, n_paradigms: int) -> Iterable:
+        '''
+        Lazily generates paradigms (so that very large datasets need not be held in memory).
+
+        :n_paradigms: the number of paradigms
+
+        :return: a generator of (triple, segmentation, analysis) tuples (see self.paradigm)
+        '''
+        for idx in range(n_paradigms):
+            yield from self.paradigm(idx)
+
+    def triples(self, n_paradigms: int) -> list:
+        '''
+        :n_paradigms: the number of paradigms
+
+        :return: a list of (root, word, features) triples, for passing to Miaseg.train()
+        '''
+        return list(triple for triple, _, _ in self.generate(n_paradigms))
+
+    def gold(self, n_paradigms: int) -> list:
+        '''
+        :n_paradigms: the number of paradigms
+
+        :return: a list of the ground-truth segmentations, in the same order as self.triples(:n_paradigms:)
+        '''
+        return list(segmentation for _, segmentation, _ in self.generate(n_paradigms))
+
+    def write(self, path: str, n_paradigms: int, gold_path: Union[None, str]=None, sep: str='\t', feature_sep: str=';', morph_sep: str='+') -> int:
+        '''
+        Streams the triples to a file in the format read by Miaseg.train_on_file(), and optionally the ground truth to a second file.
+
+        :path: the file to write the triples to
+        :n_paradigms: the number of paradigms
+        :gold_path: (Optional; default None) if a str path is passed, the ground truth is written there
+            - Each line has the same three columns as :path:, plus the segmentation (morphs separated by :morph_sep:) and the analysis (separated by :feature_sep:)
+        :sep: (Optional; default '\t') the character used to separate columns
+        :feature_sep: (Optional; default ';') the character used to separate features
+        :morph_sep: (Optional; default '+') the character used to separate morphs in :gold_path:
+
+        :return: the number of triples written
+        '''
+        n = 0
+        gold_f = open(gold_path, 'w') if gold_path is not None else None
+        try:
+            with open(path, 'w') as f:
+                for (root, word, feats), segmentation, analysis in self.generate(n_paradigms):
+                    line = f'{root}{sep}{word}{sep}{feature_sep.join(feats)}'
+                    f.write(f'{line}\n')
+                    if gold_f is not None:
+                        gold_f.write(f'{line}{sep}{morph_sep.join(segmentation)}{sep}{feature_sep.join(analysis)}\n')
+                    n += 1
+        finally:
+            if gold_f is not None:
+                gold_f.close()
+        return n
+
+def segmentation_accuracy(predicted: Iterable, gold: Iterable) -> float:
+    '''
+    :predicted: an Iterable of segmentations (lists of morphs), e.g., from Miaseg.segment_batch(..., with_analysis=False)
+        - Morphs can be strs or SegStr objects
+    :gold: an Iterable of ground-truth segmentations, e.g., from ParadigmGenerator.gold()
+
+    :return: the proportion of words whose predicted segmentation exactly matches the ground truth
+    '''
+    n, correct = 0, 0
+    for pred, true in zip(predicted, gold):
+        n += 1
+        # compare the morphs without spaces, since SegStr objects print without them
+        if list(''.join(f'{morph}'.split()) for morph in pred) == list(''.join(morph.split()) for morph in true):
+            correct += 1
+    return correct / n if n > 0 else 0.0
\ No newline at end of file
@@ -1,14 +1,22 @@
 from typing import Iterable, Union
 
 from collections import defaultdict, Counter
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from itertools import chain
 
 from algophon import SegStr, SegInv
 from algophon.models.Miaseg import Paradigm
-from algophon.data_structures import Graph
+from algophon.data_structures import Graph, Trie
+from algophon.utils.profiling import Profiler, NULL_PHASE
+from algophon.utils.workers import resolve_n_jobs, process_pool, run_in_worker
 
 SUFFIX = 'SUFFIX'
 PREFIX = 'PREFIX'
 
+# the attributes of a trained model that segmentation reads (the rest, e.g., the paradigms, are only needed for training)
+_SEGMENTATION_STATE = ('use_ipa', 'seginv', 'affix_cache_size', '_trained', 'allomorphs', 'types', 'order', '_order_rank', '_affix_tries', '_fallback_lens')
+
 class Miaseg:
     '''
     An implementation of the model "Meaning Informed Segmentation of Agglutinative Morphology" (Mɪᴀꜱᴇɢ) from Belth (2024)
@@ -25,7 +33,9 @@ class Miaseg:
     def __init__(self, 
                  use_ipa: bool=False,
                  ipa_file_path: Union[None, str]=None, 
-                 sep: str='\t') -> object:
+                 sep: str='\t',
+                 affix_cache_size: Union[None, int]=1024,
+                 profiler: Union[None, Profiler]=None) -> object:
         '''
         :use_ipa: (Optional; default False) if True, interprets words as sequences of IPA symbols
             - if False (default), interprets words as orthography
@@ -35,11 +45,20 @@ class Miaseg:
         :sep: (Optional; default '\t') the char separating columns in :ipa_file_path:
             - Only used if :ipa_file_path: is also passed
             - Only used if :orthography: == False
+        :affix_cache_size: (Optional; default 1024) the number of distinct feature sets whose (prfxs, sufxs) split is cached
+            - If None, the cache is unbounded
+            - See self.affix_cache_info() for the cache's statistics
+        :profiler: (Optional; default None) a Profiler object to record the time spent in each phase of training and counts from training and segmentation
+            - See self.profile_report()
+            - If None (default), nothing is recorded
         '''
+        self.profiler = profiler
         self.use_ipa = use_ipa
         if use_ipa: # if we are using IPA, set up a SegInv object
             self.seginv = SegInv(add_boundary_symbols=True, ipa_file_path=ipa_file_path, sep=sep)
+        self.affix_cache_size = affix_cache_size
         self._trained = False # model not trained initially (so cannot segment)
+        self._reset_affix_cache()
 
     def __str__(self) -> str:
         return 'Mɪᴀꜱᴇɢ'
@@ -47,6 +66,64 @@ class Miaseg:
     def __repr__(self) -> str:
         return self.__str__()
 
+    def __getstate__(self) -> dict:
+        '''
+        The affix cache wraps a bound method, which cannot be pickled, so it is dropped (and rebuilt empty by __setstate__).
+        The profiler is also dropped, since it may hold an unpicklable callback (and worker processes cannot report to it anyway).
+        '''
+        state = dict(self.__dict__)
+        del state['_affix_cache']
+        state['profiler'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._reset_affix_cache()
+
+    def _worker_copy(self) -> object:
+        '''
+        :return: a copy of the trained model holding only what segmentation needs (see _SEGMENTATION_STATE), to install in worker processes
+            - The copy does not have the paradigms or tabulated orderings, so it cannot be trained further
+        '''
+        model = Miaseg.__new__(Miaseg)
+        model.__setstate__(dict((name, value) for name, value in self.__getstate__().items() if name in _SEGMENTATION_STATE))
+        model.profiler = None
+        return model
+
+    def _phase(self, name: str):
+        '''
+        :name: the name of a phase of training or segmentation
+
+        :return: a context manager timing the phase with self.profiler (or a no-op one, if there is no profiler)
+        '''
+        return self.profiler.phase(name) if self.profiler is not None else NULL_PHASE
+
+    def _count(self, name: str, n: int=1) -> None:
+        '''
+        Increments the counter :name: of self.profiler by :n: (if there is a profiler).
+        '''
+        if self.profiler is not None:
+            self.profiler.count(name, n)
+
+    def profile_report(self) -> Union[None, dict]:
+        '''
+        :return: the report of self.profiler (see Profiler.report()), or None if the model was created without a profiler
+            - 'phases' times 'train', 'partial_fit', 'setup_paradigms', 'find_allomorphs', 'topological_sort', 'compile_affix_tries', and 'segment_batch'
+            - 'counts' has
+                - 'one_diff_pairs': the one-diff pairs examined, of which 'unmarked_one_diff_pairs' were neither a prefix nor a suffix of each other
+                - 'words_segmented', of which 'failed' had an unattested feature (and so were returned as 'FAILED')
+                - 'fallbacks': the affixes segmented by the most frequent allomorph length because no allomorph matched
+                - The worker processes of segment_batch(n_jobs != 1) return their counts, which are added to the profiler when each chunk is done
+            - 'records' has 'one_diff_pairs_per_paradigm', a (root, number of one-diff pairs) tuple for each paradigm trained on
+            - 'allomorphs' maps each feature to its number of allomorphs (if the model is trained)
+        '''
+        if self.profiler is None:
+            return None
+        report = self.profiler.report()
+        if self._trained:
+            report['allomorphs'] = dict((feat, len(forms)) for feat, forms in self.allomorphs.items())
+        return report
+
     def train_on_file(self, path: str, sep: str='\t', feature_sep: str=';') -> object:
         '''
         The same as self.train, but loads triples from a file instead of having them passed as an argument.
@@ -90,17 +167,70 @@ class Miaseg:
         
         :return: the Miaseg model object
         '''
+        with self._phase('train'):
+            train = self._prepare_train(train)
+            with self._phase('setup_paradigms'):
+                self._setup_paradigms(train) # set up paradigms
+            with self._phase('find_allomorphs'):
+                self._find_allomorphs(train) # find allomorphs
+            with self._phase('compile_affix_tries'):
+                self._compile_affix_tries() # compile allomorphs for fast segmentation
+        self._trained = True
+        return self
+
+    def partial_fit(self, train: Iterable[tuple[str, Union[str, SegStr], Union[set, tuple]]]) -> object:
+        '''
+        Updates the trained model with new (root, word, features) triples, without retraining on the triples it has already seen.
+            - Only the paradigms that the new triples belong to are revisited, and only their new one-diff pairs are tabulated
+            - The feature order is only re-sorted if the new pairs change which pairwise orderings are retained
+            - The result is the same as training on all the triples seen so far, except that ties between equally-frequent
+              types or allomorph lengths may be broken differently (ties go to whichever was seen first)
+        If the model has not been trained yet, this is the same as self.train(train).
+
+        :train: an Iterable of (root, word, feats) triples (see self.train)
+
+        :return: the Miaseg model object
+        '''
+        if not self._trained:
+            return self.train(train=train)
+        with self._phase('partial_fit'):
+            train = self._prepare_train(train)
+            old_pairs = dict() # maps each touched root to the keys of its one-diff pairs before the update
+            for root, word, features in train:
+                if root not in old_pairs:
+                    par = self._paradigms.get(root)
+                    old_pairs[root] = set(self._one_diff_key(diff) for diff in par.get_one_diff_pairs()) if par is not None else set()
+                    if par is None: # init this paradigm
+                        self._paradigms[root] = Paradigm(root=root)
+                self._paradigms[root].add_word(word=word, features=features)
+            # tabulate only the pairs that the new words created (adding words never removes pairs)
+            touched_feats = set()
+            for root, keys in old_pairs.items():
+                for diff in self._paradigms[root].get_one_diff_pairs():
+                    if self._one_diff_key(diff) not in keys and self._tabulate_one_diff(diff=diff):
+                        touched_feats.add(diff['feat'])
+            if len(touched_feats) > 0:
+                old_types = self.types
+                self._update_types()
+                if not self._update_order() and self.types != old_types: # the order is unchanged, but cached splits are stale
+                    self._reset_affix_cache()
+                self._compile_affix_tries(feats=touched_feats)
+            return self
+
+    def _prepare_train(self, train: Iterable) -> Iterable:
+        '''
+        :train: an Iterable of (root, word, feats) triples
+
+        :return: :train:, with each word converted to a SegStr (and its feats sorted) if the model uses IPA
+        '''
         if self.use_ipa: # convert each word to a SegStr if we are using IPA
             train = list((root, 
                           SegStr(word, seginv=self.seginv) if not isinstance(word, SegStr) else word, 
                           tuple(sorted(feats)))
                             for root, word, feats in train)
-        self._setup_paradigms(train) # set up paradigms
-        self._find_allomorphs(train) # find allomorphs
-        self._trained = True
-        return self
+        return train
     
-    def train_and_segment_file(self, path: str, sep: str='\t', feature_sep: str=';', with_analysis: bool=True) -> list:
+    def train_and_segment_file(self, path: str, sep: str='\t', feature_sep: str=';', with_analysis: bool=True, n_jobs: int=1) -> list:
         '''
         The same as self.train_and_segment, but loads triples from a file instead of having them passed as an argument.
 
@@ -108,6 +238,7 @@ class Miaseg:
         :sep: (Optional; default '\t') the character used to separate columns in the file
         :feature_sep: (Optional; default ';') the character used to separate features in the file
         :with_analysis: (Optiona; default True) if True, returns a morphological analysis (gloss) with each segmentation
+        :n_jobs: (Optional; default 1) the number of processes to segment with (see self.segment_batch)
 
          :return: a list of tuples, each containing
             - the triple (index 0)
@@ -115,9 +246,9 @@ class Miaseg:
             - (if "with_nalysis=True") the morphological analysis/gloss of the word (index 2)
         '''
         triples = self.load_train(path, sep=sep, feature_sep=feature_sep)
-        return self.train_and_segment(train=triples, with_analysis=with_analysis)
+        return self.train_and_segment(train=triples, with_analysis=with_analysis, n_jobs=n_jobs)
     
-    def train_and_segment(self, train: Iterable[tuple[str, Union[str, SegStr], Union[set, tuple]]], with_analysis: bool=True) -> list:
+    def train_and_segment(self, train: Iterable[tuple[str, Union[str, SegStr], Union[set, tuple]]], with_analysis: bool=True, n_jobs: int=1) -> list:
         '''
         The same as train(), but also segments the training data.
 
@@ -127,17 +258,19 @@ class Miaseg:
             - Each :features: should be a set or tuple of features marked in the word
             - The model only considers unique triples
         :with_analysis: (Optiona; default True) if True, returns a morphological analysis (gloss) with each segmentation
+        :n_jobs: (Optional; default 1) the number of processes to segment with (see self.segment_batch)
         
         :return: a list of tuples, each containing
             - the triple (index 0)
             - the segmentation of the word (index 1)
             - (if "with_nalysis=True") the morphological analysis/gloss of the word (index 2)
         '''
+        train = list(train)
         self.train(train=train) # train the model
+        segmentations = self.segment_batch(list((word, features) for _, word, features in train), with_analysis=with_analysis, n_jobs=n_jobs)
         results = list() # tabluate results
-        for triple in train: # segment each triple
-            _, word, features = triple
-            seg, *ana = self.segment(word=word, features=features, with_analysis=with_analysis)
+        for triple, segmentation in zip(train, segmentations):
+            seg, *ana = segmentation
             bundle = (triple, seg, ana[0]) if with_analysis else (triple, seg) # bundle the results
             results.append(bundle)
         return results
@@ -161,32 +294,104 @@ class Miaseg:
 
         :train: an Iterable of (root, word, feats) triples
         '''
-        orderings = defaultdict(int) # track the inferred pairwise orderings
-        self.allomorphs = defaultdict(lambda: defaultdict(int)) # track the inferred allomorphs of marked features
-        types = defaultdict(lambda: defaultdict(int)) # track the inferred types of marked featres (SUFFIX, PREFIX)
+        self._ordering_counts = defaultdict(int) # track the inferred pairwise orderings
+        self.allomorphs = defaultdict(partial(defaultdict, int)) # track the inferred allomorphs of marked features
+        self._type_counts = defaultdict(partial(defaultdict, int)) # track the inferred types of marked featres (SUFFIX, PREFIX)
+        self._ordering_edges = None
         for par in self._paradigms.values(): # iterate over paradigms
-            for diff in par.get_one_diff_pairs():
-                affix, typ = self._get_marking_from_one_off(src=diff['src'], tgt=diff['tgt'])
-                if affix is not None and typ is not None: # if a marking found, tabulate it
-                    self.allomorphs[diff['feat']][affix] += 1
-                    types[diff['feat']][typ] += 1
-                    if typ == SUFFIX:
-                        # every feature of src probably comes before the suffix marking the diff
-                        for other_feature in diff['shared_feats']:
-                            orderings[(other_feature, diff['feat'])] += 1 # other_feature -> diff_feat
-                    else: # PREFIX
-                        # every feture of src probbly comes after the prefix marking the diff
-                        for other_feature in diff['shared_feats']:
-                            orderings[(diff['feat'], other_feature)] += 1 # diff_feat -> other_feature
+            one_diff_pairs = par.get_one_diff_pairs()
+            for diff in one_diff_pairs:
+                self._tabulate_one_diff(diff=diff)
+            if self.profiler is not None:
+                self.profiler.record('one_diff_pairs_per_paradigm', (par.root, len(one_diff_pairs)))
+        self._update_types()
+        self._update_order()
+
+    def _tabulate_one_diff(self, diff: dict) -> bool:
+        '''
+        Tabulates the allomorph, type, and pairwise orderings evidenced by a one-diff pair.
+
+        :diff: a one-diff pair dict (see Paradigm.get_one_diff_pairs)
+
+        :return: True if a marking was found (and tabulated), False otherwise
+        '''
+        affix, typ = self._get_marking_from_one_off(src=diff['src'], tgt=diff['tgt'])
+        self._count('one_diff_pairs')
+        if affix is None or typ is None: # cannot determine how feature marked
+            self._count('unmarked_one_diff_pairs')
+            return False
+        self.allomorphs[diff['feat']][affix] += 1
+        self._type_counts[diff['feat']][typ] += 1
+        if typ == SUFFIX:
+            # every feature of src probably comes before the suffix marking the diff
+            for other_feature in diff['shared_feats']:
+                self._ordering_counts[(other_feature, diff['feat'])] += 1 # other_feature -> diff_feat
+        else: # PREFIX
+            # every feture of src probbly comes after the prefix marking the diff
+            for other_feature in diff['shared_feats']:
+                self._ordering_counts[(diff['feat'], other_feature)] += 1 # diff_feat -> other_feature
+        return True
+
+    def _one_diff_key(self, diff: dict) -> tuple:
+        '''
+        :diff: a one-diff pair dict (see Paradigm.get_one_diff_pairs)
+
+        :return: a hashable key uniquely identifying the pair within its paradigm
+        '''
+        return diff['src'], diff['tgt'], diff['feat'], frozenset(diff['shared_feats'])
+
+    def _update_types(self) -> None:
+        '''
+        Sets self.types from the tabulated type counts.
+        '''
         # retain only the most frequent type of each feature
-        self.types = dict((feat, sorted(_typs.items(), reverse=True, key=lambda it: it[-1])[0][0]) for feat, _typs in types.items())
+        self.types = dict((feat, sorted(_typs.items(), reverse=True, key=lambda it: it[-1])[0][0]) for feat, _typs in self._type_counts.items())
+
+    def _update_order(self) -> bool:
+        '''
+        Sets self.order from the tabulated pairwise orderings, re-sorting only if the retained orderings changed.
+
+        :return: True if the order was (re)computed, False if the retained orderings were unchanged
+        '''
+        counts = self._ordering_counts
         # remove conflicting x <-> y by choosing the one with higher frequency (if tied, no order is inferred)
-        orderings = list((x, y) for x, y in list(orderings.keys()) if orderings[(x, y)] > orderings[(y, x)])
-        # build DAG encoding ordering
-        graph = Graph(directed=True)
-        graph.add_edges(orderings)
-        # topologically sort the graph
-        self.order = graph.topological_sort()
+        orderings = list((x, y) for x, y in counts.keys() if counts[(x, y)] > counts.get((y, x), 0))
+        if self._ordering_edges is not None and set(orderings) == self._ordering_edges:
+            return False
+        self._ordering_edges = set(orderings)
+        with self._phase('topological_sort'):
+            # build DAG encoding ordering
+            graph = Graph(directed=True)
+            graph.add_edges(orderings)
+            # topologically sort the graph
+            self.order = graph.topological_sort()
+        # rank each feature by its position in the order (so sorting features does not need self.order.index)
+        self._order_rank = dict((feat, rank) for rank, feat in enumerate(self.order))
+        self._reset_affix_cache()
+        return True
+
+    def _compile_affix_tries(self, feats: Union[None, set]=None) -> None:
+        '''
+        Compiles each feature's allomorphs into a Trie, so that segment() can find the best-matching allomorph with one walk over the word.
+            - PREFIX features get a Trie over their allomorphs; SUFFIX features get a Trie over their reversed allomorphs
+            - Also precomputes, for each feature, the most frequent allomorph length (used when no allomorph matches)
+
+        :feats: (Optional; default None) the features to (re)compile
+            - If None, compiles every feature from scratch
+        '''
+        if feats is None:
+            self._affix_tries = dict()
+            self._fallback_lens = dict()
+            feats = self.allomorphs.keys()
+        for feat in feats:
+            forms = self.allomorphs[feat]
+            trie = Trie()
+            # insert from least to most frequent, so that the most frequent form is kept if two forms have the same symbols
+            for form, _ in sorted(forms.items(), key=lambda it: it[-1]):
+                symbols = list(form)
+                trie.insert(symbols if self.types[feat] == PREFIX else reversed(symbols), value=form)
+            self._affix_tries[feat] = trie
+            self._fallback_lens[feat] = Counter(list(len(form) for form in forms)).most_common(1)[0][0]
 
     def _get_marking_from_one_off(self, src: Union[str, SegStr], tgt: Union[str,  SegStr]) -> tuple[Union[str, SegStr], str]:
         '''
@@ -217,15 +422,144 @@ class Miaseg:
         '''
         if not self._trained:
             raise ValueError(f'{self} must be trained in order to segment.') 
-        if self.use_ipa and isinstance(word, str): # convert str to SegStr if we are using IPA
-            word = SegStr(word, seginv=self.seginv)
-        elif not self.use_ipa and isinstance(word, SegStr):
-            raise ValueError(f'Cannot segment SegStr because {self} object was not constructed with "use_ipa = True"')
+        word = self._prepare_word(word=word)
+        self._count('words_segmented')
         if any(feat not in self.allomorphs for feat in features):
+            self._count('failed')
             return ([word], ['FAILED']) if with_analysis else [word]
 
         # compute prfxs and sufxs        
         prfxs, sufxs = self._get_affixes(features=set(features))
+        return self._segment(word=word, prfxs=prfxs, sufxs=sufxs, with_analysis=with_analysis)
+    
+    # calling a Miaseg object amounts to calling its segment() method
+    __call__ = segment
+
+    def segment_batch(self, 
+                      words_and_features: Iterable[tuple[Union[str, SegStr], Union[tuple, set]]], 
+                      with_analysis: bool=True,
+                      n_jobs: int=1,
+                      chunk_size: Union[None, int]=None,
+                      executor: Union[None, object]=None) -> list:
+        '''
+        Segments many words at once. The result is the same as calling self.segment on each (word, features) pair, but
+            - pairs are grouped by feature set, so the affix ordering of each distinct feature set is computed only once
+            - if :n_jobs: != 1, chunks of pairs are segmented in parallel by worker processes, each holding a copy of the trained model (without its training data)
+
+        :words_and_features: an Iterable of (word, features) pairs (see self.segment for the form of each)
+        :with_analysis: (Optiona; default True) if True, returns a morphological analysis (gloss) with each segmentation
+        :n_jobs: (Optional; default 1) the number of processes to segment with
+            - If 1, segments in the current process
+            - If None or < 0, uses one process per CPU
+            - 0 raises a ValueError
+        :chunk_size: (Optional; default None) the number of pairs sent to a worker process at a time
+            - Only used if :n_jobs: != 1 or :executor: is passed
+            - If None, splits the pairs into 4 chunks per process
+        :executor: (Optional; default None) a pool from algophon.utils.workers.process_pool(self, n_jobs) to segment in
+            - If None and :n_jobs: != 1, a pool is created (and shut down) for this call
+            - Pass one pool to many calls (e.g., for a stream of batches) so that the model is only installed in each worker once
+
+        :return: a list containing the output of self.segment for each pair, in the order of :words_and_features:
+        '''
+        if not self._trained:
+            raise ValueError(f'{self} must be trained in order to segment.')
+        n_jobs = resolve_n_jobs(n_jobs)
+        words_and_features = list(words_and_features)
+        with self._phase('segment_batch'):
+            if (n_jobs == 1 and executor is None) or len(words_and_features) < 2:
+                return self._segment_batch(words_and_features=words_and_features, with_analysis=with_analysis)
+            
+            if self.use_ipa: # ship words as space-separated strs, so each chunk does not carry its own copy of the SegInv
+                words_and_features = list((' '.join(f'{seg}' for seg in word) if isinstance(word, SegStr) else word, features) 
+                                            for word, features in words_and_features)
+            if chunk_size is None:
+                chunk_size = max(1, -(-len(words_and_features) // (4 * n_jobs))) # ceil division
+            chunks = list(words_and_features[i:i + chunk_size] for i in range(0, len(words_and_features), chunk_size))
+            results = list()
+            with nullcontext(executor) if executor is not None else process_pool(self, n_jobs) as executor: # each worker holds self._worker_copy()
+                run_chunk = partial(run_in_worker, '_segment_strs', with_analysis=with_analysis, count=self.profiler is not None)
+                for chunk_results, counts in executor.map(run_chunk, chunks):
+                    results.extend(chunk_results)
+                    for name, n in counts.items(): # the workers cannot report to the profiler, so they return their counts
+                        self._count(name, n)
+            if self.use_ipa: # rebuild the morphs as SegStr objects over self.seginv
+                if with_analysis:
+                    results = list((list(SegStr(morph, seginv=self.seginv) for morph in seg), ana) for seg, ana in results)
+                else:
+                    results = list(list(SegStr(morph, seginv=self.seginv) for morph in seg) for seg in results)
+            return results
+
+    def _segment_batch(self, words_and_features: list, with_analysis: bool) -> list:
+        '''
+        Segments a list of (word, features) pairs in the current process, computing the affix ordering once per distinct feature set.
+
+        :words_and_features: a list of (word, features) pairs
+        :with_analysis: if True, returns a morphological analysis (gloss) with each segmentation
+
+        :return: a list containing the output of self.segment for each pair, in the order of :words_and_features:
+        '''
+        self._count('words_segmented', len(words_and_features))
+        groups = defaultdict(list) # maps each distinct feature set to the indexes of the pairs marking it
+        for idx, (_, features) in enumerate(words_and_features):
+            groups[frozenset(features)].append(idx)
+        results = [None] * len(words_and_features)
+        for features, idxs in groups.items():
+            # compute prfxs and sufxs once for all the words marking :features: (None if any feature is unattested)
+            affixes = self._get_affixes(features=set(features)) if all(feat in self.allomorphs for feat in features) else None
+            for idx in idxs:
+                word = self._prepare_word(word=words_and_features[idx][0])
+                if affixes is None:
+                    self._count('failed')
+                    results[idx] = ([word], ['FAILED']) if with_analysis else [word]
+                else:
+                    results[idx] = self._segment(word=word, prfxs=affixes[0], sufxs=affixes[-1], with_analysis=with_analysis)
+        return results
+
+    def _segment_strs(self, words_and_features: list, with_analysis: bool, count: bool=False) -> tuple[list, dict]:
+        '''
+        The same as self._segment_batch, but in IPA mode, morphs are returned as space-separated strs.
+            - Run by the worker processes of self.segment_batch (the parent process rebuilds the morphs as SegStr objects)
+
+        :words_and_features: a list of (word, features) pairs
+        :with_analysis: if True, returns a morphological analysis (gloss) with each segmentation
+        :count: (Optional; default False) if True, counts 'words_segmented', 'failed', and 'fallbacks' (see self.profile_report)
+
+        :return: a (results, counts) tuple, where counts maps each counter to its count over :words_and_features: (empty if not :count:)
+        '''
+        profiler, self.profiler = self.profiler, Profiler() if count else None
+        try:
+            results = self._segment_batch(words_and_features=words_and_features, with_analysis=with_analysis)
+            counts = self.profiler.report()['counts'] if count else dict()
+        finally:
+            self.profiler = profiler
+        if self.use_ipa:
+            to_str = lambda seg: list(' '.join(f'{s}' for s in morph) for morph in seg)
+            results = list((to_str(seg), ana) for seg, ana in results) if with_analysis else list(to_str(seg) for seg in results)
+        return results, counts
+
+    def _prepare_word(self, word: Union[str, SegStr]) -> Union[str, SegStr]:
+        '''
+        :word: a str or SegStr to segment
+
+        :return: :word: as a SegStr if the model uses IPA, otherwise :word: unchanged
+        '''
+        if self.use_ipa and isinstance(word, str): # convert str to SegStr if we are using IPA
+            word = SegStr(word, seginv=self.seginv)
+        elif not self.use_ipa and isinstance(word, SegStr):
+            raise ValueError(f'Cannot segment SegStr because {self} object was not constructed with "use_ipa = True"')
+        return word
+
+    def _segment(self, word: Union[str, SegStr], prfxs: list, sufxs: list, with_analysis: bool) -> Union[list, tuple[list, list]]:
+        '''
+        Segments a word given the (ordered) features it marks with prefixes and suffixes.
+
+        :word: a str or SegStr object
+        :prfxs: the features marked by prefixes, in order
+        :sufxs: the features marked by suffixes, in order
+        :with_analysis: if True, returns a morphological analysis (gloss) with the segmentation
+
+        :return: the same as self.segment
+        '''
         # create a new object that we can edit without changing :word:
         temp = str(word) if isinstance(word, str) else SegStr(segs=list(word._segs), seginv=self.seginv)
 
@@ -235,26 +569,12 @@ class Miaseg:
 
         # iterate over prfxs left-to-right
         for prfx in prfxs:
-            cand_forms = list(self.allomorphs[prfx].keys())
-            matches = list(cand for cand in cand_forms if temp.startswith(cand))
-            if len(matches) > 0:
-                # choose longest match (breaking ties by frequency)
-                best_match = sorted(matches, reverse=True, key=lambda cand: (len(cand), self.allomorphs[prfx][cand]))[0]
-            else: # if no matches, match most frequent length of attested forms
-                most_freq_len = Counter(list(len(cand) for cand in cand_forms)).most_common(1)[0][0]
-                best_match = temp[:most_freq_len]
+            best_match = self._match_affix(temp=temp, feature=prfx)
             temp = temp[len(best_match):]
             prfx_forms.append(best_match)
         # iterate over sufxs right-to-left
         for sufx in reversed(sufxs):
-            cand_forms = list(self.allomorphs[sufx].keys())
-            matches = list(cand for cand in cand_forms if temp.endswith(cand))
-            if len(matches) > 0:
-                # choose longest match (breaking ties by frequency)
-                best_match = sorted(matches, reverse=True, key=lambda cand: (len(cand), self.allomorphs[sufx][cand]))[0]
-            else: # if no matches, match most frequent length of attested forms
-                most_freq_len = Counter(list(len(cand) for cand in cand_forms)).most_common(1)[0][0]
-                best_match = temp[-most_freq_len:]
+            best_match = self._match_affix(temp=temp, feature=sufx)
             temp = temp[:-len(best_match)]
             sufx_forms.insert(0, best_match)
 
@@ -263,9 +583,24 @@ class Miaseg:
         seg = prfx_forms + [temp] + sufx_forms
 
         return (seg, ana) if with_analysis else seg
-    
-    # calling a Miaseg object amounts to calling its segment() method
-    __call__ = segment
+
+    def _match_affix(self, temp: Union[str, SegStr], feature: str) -> Union[str, SegStr]:
+        '''
+        :temp: the (remaining part of the) word to match an allomorph of :feature: against
+        :feature: a feature marked by a prefix or suffix
+
+        :return: the longest allomorph of :feature: that :temp: starts with (prefix) or ends with (suffix)
+            - If no allomorph matches, returns the slice of :temp: of the most frequent allomorph length
+        '''
+        symbols = temp._segs if isinstance(temp, SegStr) else temp
+        is_prfx = self.types[feature] == PREFIX
+        match = self._affix_tries[feature].longest_match(symbols if is_prfx else reversed(symbols))
+        if match is not None:
+            return match[-1]
+        # if no matches, match most frequent length of attested forms
+        self._count('fallbacks')
+        most_freq_len = self._fallback_lens[feature]
+        return temp[:most_freq_len] if is_prfx else temp[-most_freq_len:]
 
     def _get_affixes(self, features: set) -> tuple[list, list]:
         '''
@@ -273,11 +608,39 @@ class Miaseg:
 
         :return: a tuple containing a list of prfxs and a list of sufxs
         '''
+        prfxs, sufxs = self._affix_cache(frozenset(features))
+        return list(prfxs), list(sufxs)
+
+    def _split_affixes(self, features: frozenset) -> tuple[tuple, tuple]:
+        '''
+        Computes the split that self._get_affixes returns; calls are memoized by self._affix_cache.
+
+        :features: a frozenset of features marked in the word
+
+        :return: a tuple containing a tuple of prfxs and a tuple of sufxs
+        '''
         prfxs = list()
         sufxs = list()
-        for feature in sorted(features, key=lambda feat: self.order.index(feat)):
+        try:
+            ordered = sorted(features, key=self._order_rank.__getitem__)
+        except KeyError as e: # same exception type as the self.order.index lookup this replaces
+            raise ValueError(f'{e.args[0]!r} is not in the learned feature order') from None
+        for feature in ordered:
             if self.types[feature] == PREFIX:
                 prfxs.append(feature)
             else:
                 sufxs.append(feature)
-        return prfxs, sufxs
\ No newline at end of file
+        return tuple(prfxs), tuple(sufxs)
+
+    def _reset_affix_cache(self) -> None:
+        '''
+        Replaces self._affix_cache with an empty LRU cache. Must be called whenever self.order or self.types change.
+        '''
+        self._affix_cache = lru_cache(maxsize=self.affix_cache_size)(self._split_affixes)
+
+    def affix_cache_info(self) -> tuple:
+        '''
+        :return: the statistics of the cache mapping feature sets to their (prfxs, sufxs) split
+            - A named tuple (hits, misses, maxsize, currsize), as returned by functools.lru_cache's cache_info()
+        '''
+        return self._affix_cache.cache_info()
\ No newline at end of file
@@ -1,5 +1,7 @@
 from typing import Union
 
+from collections import defaultdict
+
 from algophon import SegStr
 
 class Paradigm:
@@ -36,6 +38,7 @@ class Paradigm:
         A difference is either of:
             (1) a feature that w1 has but w2 does not
             (2) a feature that w2 has but w1 does not
+        Each word's partners are looked up by feature set, so this takes O(n·k) time for n words marking up to k features each.
 
         :return: list of pairs of words differing in exactly one feature
             - each entry is a dictionary:
@@ -46,20 +49,30 @@ class Paradigm:
         '''
         one_diff = list() # init list
         words = sorted(self.words)
+        # index the words by their feature sets, so that each word's one-diff partners can be looked up rather than searched for
+        by_feats = defaultdict(list) # maps a feature set to the idxs of words with exactly those features
+        by_one_fewer = defaultdict(list) # maps a feature set to the idxs of words with those features plus exactly one more
+        for idx, (_, features) in enumerate(words):
+            features = frozenset(features)
+            by_feats[features].append(idx)
+            for feat in features:
+                by_one_fewer[features.difference((feat,))].append(idx)
         for i in range(len(words)): # iterate over words
-            for j in range(i + 1, len(words)): # iterate over other words
+            features = frozenset(words[i][1])
+            partners = list(by_one_fewer.get(features, [])) # words with one more feature
+            for feat in features: # words with one fewer feature
+                partners.extend(by_feats.get(features.difference((feat,)), []))
+            for j in sorted(j for j in partners if j > i): # visit pairs in the same (i, j) order as an all-pairs comparison
                 w1, f1 = words[i]
                 w2, f2 = words[j]
-                union = set(f1).union(f2) # compute union of features
                 intersection = set(f1).intersection(f2) # compute intersection of features
-                diff = union.difference(intersection)
-                if len(diff) == 1:
-                    # add w1 -> w2 if f2 > f1 or add w2 -> w1 if f1 > f2
-                    src, tgt = (w1, w2) if len(f1) < len(f2) else (w2, w1)
-                    one_diff.append({ # build dict
-                        'src': src, 
-                        'tgt': tgt,
-                        'feat': list(diff)[0],
-                        'shared_feats': intersection,
-                    })
+                diff = set(f1).symmetric_difference(f2)
+                # add w1 -> w2 if f2 > f1 or add w2 -> w1 if f1 > f2
+                src, tgt = (w1, w2) if len(f1) < len(f2) else (w2, w1)
+                one_diff.append({ # build dict
+                    'src': src, 
+                    'tgt': tgt,
+                    'feat': list(diff)[0],
+                    'shared_feats': intersection,
+                })
         return one_diff
\ No newline at end of file
@@ -0,0 +1,306 @@
+from typing import Union, Iterable
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from algophon import SegStr
+from algophon.utils.workers import resolve_n_jobs, process_pool, worker_model
+
+class BatchServer:
+    '''
+    An asyncio adapter for serving a trained model (e.g., behind an async HTTP service) without blocking the event loop.
+
+    Requests submitted within a short window are collected into a micro-batch, which is passed to one of the model's batch methods
+    (e.g., D2L.produce_batch or Miaseg.segment_batch) in a thread or process pool. Each request gets an awaitable of its own result.
+    See serve_d2l() and serve_miaseg() for servers of the two models.
+    '''
+    def __init__(self,
+                 model: object,
+                 method: str,
+                 max_batch_size: int=64,
+                 max_wait: float=0.002,
+                 executor: str='thread',
+                 n_workers: Union[None, int]=1,
+                 latency_window: int=10000,
+                 **method_kwargs) -> object:
+        '''
+        :model: a trained model
+        :method: the name of the model's batch method, which takes a list of requests and returns a list of results in the same order
+        :max_batch_size: (Optional; default 64) the maximum number of requests in a batch
+        :max_wait: (Optional; default 0.002) the maximum number of seconds to wait for more requests before dispatching a batch
+        :executor: (Optional; default 'thread') the kind of pool to dispatch batches to
+            - 'thread': a thread pool sharing :model: (consider freezing the model's SegInv first; see SegInv.freeze())
+            - 'process': a process pool, in which each worker holds a copy of :model: without its training data (so throughput scales with cores)
+        :n_workers: (Optional; default 1) the number of workers, which is also the maximum number of batches in flight at once
+            - If None or < 0, uses one worker per CPU
+            - 0 raises a ValueError
+        :latency_window: (Optional; default 10000) the number of most recent requests that latency percentiles are computed over
+        :method_kwargs: keyword arguments passed to :method: with every batch (e.g., with_analysis=False)
+        '''
+        if executor not in {'thread', 'process'}:
+            raise ValueError(f':executor: must be "thread" or "process", but got {executor!r}.')
+        if not callable(getattr(model, method, None)):
+            raise ValueError(f'{model} has no batch method "{method}".')
+        if max_batch_size < 1:
+            raise ValueError(f':max_batch_size: must be at least 1, but got {max_batch_size}.')
+        n_workers = resolve_n_jobs(n_workers, name='n_workers')
+        self.model = model
+        self.method = method
+        self.method_kwargs = method_kwargs
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.n_workers = n_workers
+
+        self._pool = None # the thread or process pool (created by self.start())
+        self._queue = None # the asyncio.Queue of (request, future, submission time) tuples
+        self._batcher = None # the asyncio.Task collecting requests into batches
+        self._slots = None # an asyncio.Semaphore bounding the number of batches in flight
+        self._in_flight = set() # the asyncio.Tasks awaiting dispatched batches
+        self._latencies = deque(maxlen=latency_window) # seconds from submission to result, for the most recent requests
+        self._n_requests = 0
+        self._n_batches = 0
+
+    def __str__(self) -> str:
+        return f'BatchServer for {self.model} ({self.method} on {self.n_workers} {self.executor} workers)'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def __aenter__(self) -> object:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def running(self) -> bool:
+        '''
+        :return: True if the server has been started and not closed
+        '''
+        return self._batcher is not None
+
+    def start(self) -> object:
+        '''
+        Creates the pool and starts collecting requests into batches. Must be called from within a running event loop.
+            - Called automatically by self.submit() and when the server is used as an async context manager
+
+        :return: the BatchServer object
+        '''
+        if self.running:
+            return self
+        if self.executor == 'thread':
+            self._pool = ThreadPoolExecutor(max_workers=self.n_workers)
+        else:
+            self._pool = process_pool(self.model, self.n_workers)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.n_workers)
+        self._batcher = asyncio.get_running_loop().create_task(self._collect())
+        return self
+
+    async def close(self) -> None:
+        '''
+        Stops batching, finishes the batches in flight, and shuts down the pool.
+            - Requests that are still queued are cancelled
+            - A later call to self.submit() restarts the server
+
+        :return: None
+        '''
+        if not self.running:
+            return
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        self._batcher = None
+        try:
+            while not self._queue.empty():
+                _, future, _ = self._queue.get_nowait()
+                future.cancel()
+            if len(self._in_flight) > 0: # (asyncio.wait does not cancel the batches if close() is cancelled)
+                await asyncio.wait(set(self._in_flight))
+        finally: # even if close() is cancelled, so that the pool is not leaked
+            pool, self._pool = self._pool, None
+            # shutting down joins the workers, so it runs in a thread (instead of blocking the event loop)
+            await asyncio.get_running_loop().run_in_executor(None, partial(pool.shutdown, wait=True))
+
+    def submit(self, request: object) -> asyncio.Future:
+        '''
+        Queues a request for the next batch. Must be called from within a running event loop.
+
+        :request: one element of the list passed to the model's batch method (e.g., a UR for D2L, or a (word, features) pair for Miaseg)
+
+        :return: an awaitable (asyncio.Future) of the request's result
+        '''
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put_nowait((request, future, loop.time()))
+        return future
+
+    async def submit_many(self, requests: Iterable) -> list:
+        '''
+        :requests: an Iterable of requests (see self.submit)
+
+        :return: the list of the requests' results, in order
+        '''
+        return await asyncio.gather(*list(self.submit(request) for request in requests))
+
+    async def _collect(self) -> None:
+        '''
+        Collects queued requests into batches of up to self.max_batch_size, waiting at most self.max_wait seconds after the first
+        request of a batch for more, and dispatches each batch once a worker is free.
+        '''
+        loop = asyncio.get_running_loop()
+        batch = list()
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty(): # take whatever is already queued without waiting
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                    except asyncio.TimeoutError:
+                        break
+                batch = list(item for item in batch if not item[1].cancelled()) # skip requests whose caller stopped waiting
+                if len(batch) == 0:
+                    continue
+                await self._slots.acquire() # backpressure: wait for a free worker (requests keep queueing meanwhile)
+                task = loop.create_task(self._dispatch(batch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+                batch = list()
+        except asyncio.CancelledError: # closed, so cancel the requests of the batch being collected
+            for _, future, _ in batch:
+                future.cancel()
+            raise
+
+    async def _dispatch(self, batch: list) -> None:
+        '''
+        Runs a batch in the pool and resolves the futures of its requests.
+
+        :batch: a list of (request, future, submission time) tuples
+        '''
+        loop = asyncio.get_running_loop()
+        requests = list(request for request, _, _ in batch)
+        try:
+            if self.executor == 'thread':
+                call = partial(getattr(self.model, self.method), requests, **self.method_kwargs)
+            else: # SegStr objects are shipped as strs, so that each batch does not carry a copy of the SegInv
+                call = partial(_run_batch, self.method, _encode(requests), self.method_kwargs)
+            results = await loop.run_in_executor(self._pool, call)
+            if self.executor == 'process':
+                results = _decode(results, seginv=getattr(self.model, 'seginv', None))
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+        now = loop.time()
+        self._n_batches += 1
+        self._n_requests += len(batch)
+        for (_, future, submitted), result in zip(batch, results):
+            self._latencies.append(now - submitted)
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        '''
+        :return: a dict of serving statistics
+            - 'queue_depth': the number of requests waiting to be batched
+            - 'in_flight': the number of batches currently being processed
+            - 'requests' and 'batches': the numbers of requests and batches completed so far
+            - 'mean_batch_size': the mean number of requests per completed batch
+            - 'latency': the 'p50', 'p90', 'p99', and 'max' seconds from submission to result over the most recent requests (None before any)
+        '''
+        latencies = sorted(self._latencies)
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': len(self._in_flight),
+            'requests': self._n_requests,
+            'batches': self._n_batches,
+            'mean_batch_size': self._n_requests / self._n_batches if self._n_batches > 0 else 0.0,
+            'latency': dict((name, _percentile(latencies, q)) for name, q in [('p50', 50), ('p90', 90), ('p99', 99), ('max', 100)]),
+        }
+
+def serve_d2l(model: object, **kwargs) -> BatchServer:
+    '''
+    :model: a trained D2L model
+    :kwargs: passed to BatchServer (e.g., max_batch_size, executor, n_workers)
+
+    :return: a BatchServer whose requests are URs and whose results are the SRs from model.produce_batch
+    '''
+    return BatchServer(model, method='produce_batch', **kwargs)
+
+def serve_miaseg(model: object, with_analysis: bool=True, **kwargs) -> BatchServer:
+    '''
+    :model: a trained Miaseg model
+    :with_analysis: (Optional; default True) if True, each result includes a morphological analysis (gloss)
+    :kwargs: passed to BatchServer (e.g., max_batch_size, executor, n_workers)
+
+    :return: a BatchServer whose requests are (word, features) pairs and whose results are from model.segment_batch
+    '''
+    return BatchServer(model, method='segment_batch', with_analysis=with_analysis, **kwargs)
+
+def _percentile(values: list, q: float) -> Union[None, float]:
+    '''
+    :values: a sorted list of numbers
+    :q: a percentile between 0 and 100
+
+    :return: the nearest-rank :q:th percentile of :values: (None if :values: is empty)
+    '''
+    if len(values) == 0:
+        return None
+    rank = max(1, -(-len(values) * q // 100)) # ceil(len * q / 100)
+    return values[int(rank) - 1]
+
+class _EncodedSegStr(str):
+    '''
+    A SegStr shipped to or from a worker process as its space-separated str of IPA symbols.
+    '''
+    pass
+
+def _encode(obj: object) -> object:
+    '''
+    :obj: a request, result, or (nested) list or tuple of them
+
+    :return: :obj: with each SegStr object replaced by an _EncodedSegStr
+    '''
+    if isinstance(obj, SegStr):
+        return _EncodedSegStr(' '.join(f'{seg}' for seg in obj))
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_encode(item) for item in obj)
+    return obj
+
+def _decode(obj: object, seginv: object) -> object:
+    '''
+    :obj: the output of _encode
+    :seginv: the SegInv to rebuild SegStr objects over
+
+    :return: :obj: with each _EncodedSegStr replaced by a SegStr object over :seginv:
+    '''
+    if isinstance(obj, _EncodedSegStr):
+        return SegStr(f'{obj}', seginv=seginv)
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_decode(item, seginv) for item in obj)
+    return obj
+
+def _run_batch(method: str, requests: list, method_kwargs: dict) -> list:
+    '''
+    Runs a batch in a worker process of a BatchServer.
+    '''
+    model = worker_model()
+    requests = _decode(requests, seginv=getattr(model, 'seginv', None))
+    return _encode(getattr(model, method)(requests, **method_kwargs))
\ No newline at end of file
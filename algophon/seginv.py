@@ -5,10 +5,22 @@ from algophon.natclass import NatClass
 from algophon.symbols import UNDERSPECIFIED, BOUNDARIES
 
 import pkgutil
+import threading
+import unicodedata
+
+# symbols that are visually (and featurally) the same as an IPA symbol, but are different code points: alias -> IPA symbol
+_HOMOGLYPHS = {
+    'g': 'ɡ', # make ord('g') == 103 and ord('ɡ') == 609 the same, since panphon only has 609
+}
 
 class SegInv:
     '''
     A class representing an inventory of phonological segments (Seg objects).
+
+    Symbols are looked up modulo Unicode normalization, so that a segment with diacritics is found whether it is
+    passed in composed (NFC) or decomposed (NFD) form. Lookups always return the Seg object with the inventory's own form of the symbol.
+
+    A SegInv can be frozen (see self.freeze()) so that it is read-only, e.g., to share a trained model's inventory between threads.
     '''
     def __init__(self, 
                  add_boundary_symbols: bool=False,
@@ -31,6 +43,14 @@ class SegInv:
         self.segs = set()
         # maps ipa symbols to their Seg object in the SegInv
         self._ipa_to_seg = dict()
+        # maps the NFC form of each known symbol to the symbol (for symbols whose NFC form differs)
+        self._normal_forms = dict()
+        # memoizes self._normalize for symbols that are not known as-is, but whose normalization is known
+        self._normalized = dict()
+        # set by self.freeze(): maps every known form of every symbol to its Seg object (never modified after freezing)
+        self._frozen_lookup = None
+        self._unknown = None # what a frozen SegInv does with unknown segments ('raise' or 'overlay')
+        self._overlay = None # a threading.local holding each thread's overlay of segments added after freezing
 
         # load the _seg_to_feat_vec map
         self._load_seg_to_feat_dict()
@@ -42,6 +62,19 @@ class SegInv:
     def __repr__(self) -> str:
         return self.__str__()
     
+    def __getstate__(self) -> dict:
+        '''
+        The thread-local overlay cannot be pickled, so it is dropped (and rebuilt empty by __setstate__).
+        '''
+        state = dict(self.__dict__)
+        state['_overlay'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self._frozen_lookup is not None:
+            self._overlay = threading.local()
+
     def __len__(self) -> int:
         return len(self.segs)
     
@@ -56,6 +89,10 @@ class SegInv:
 
         :return: True if the :seg: is in the alphabet, False if not
         '''
+        if self._frozen_lookup is not None:
+            return self._find_frozen(f'{seg}') is not None
+        if isinstance(seg, str):
+            seg = self._normalize(seg)
         return seg in self.segs
     
     def __getitem__(self, seg: object) -> Seg:
@@ -66,7 +103,14 @@ class SegInv:
 
         :return: the Seg object corresponding to :seg: if present, otherwise KeyError is raised
         '''
-        if seg not in self:
+        if self._frozen_lookup is not None:
+            found = self._find_frozen(f'{seg}')
+            if found is None:
+                raise KeyError(f'{seg} of type {type(seg)} is not in the frozen SegInv')
+            return found
+        if isinstance(seg, str):
+            seg = self._normalize(seg)
+        if seg not in self.segs:
             raise KeyError(f'{seg} of type {type(seg)} is not in the SegInv (try <seginv_obj>.add({seg}))')
         return self._ipa_to_seg[seg]
 
@@ -90,8 +134,8 @@ class SegInv:
                 self._seg_to_feat_vec[seg] = feats
 
         if self.ipa_file_path is None:
-            # make ord('g') == 103 and ord('ɡ') == 609 the same, since panphon only as 609
-            self._seg_to_feat_vec['g'] = self._seg_to_feat_vec['ɡ']
+            for alias, symbol in _HOMOGLYPHS.items():
+                self._seg_to_feat_vec[alias] = self._seg_to_feat_vec[symbol]
             # add voiceless velar nasal
             self._seg_to_feat_vec['ŋ̊'] = list(self._seg_to_feat_vec['ŋ'])
             self._seg_to_feat_vec['ŋ̊'][self.feature_space.index('voi')] = '-'
@@ -99,6 +143,9 @@ class SegInv:
             self._seg_to_feat_vec['ç'] = list(self._seg_to_feat_vec['ʝ'])
             self._seg_to_feat_vec['ç'][self.feature_space.index('voi')] = '-'
 
+        for symbol in self._seg_to_feat_vec: # normalize the symbols once
+            self._add_normal_form(symbol)
+
         if self._add_boundary_symbols: # add boundary symbols
             self.feature_space += ['B', 'LWB', 'RWB', 'SYLB', 'MORPHB']
             for boundary_feat, symbol in zip(['LWB', 'RWB', 'SYLB', 'MORPHB'], 
@@ -106,19 +153,142 @@ class SegInv:
                 feats = dict((feat, UNDERSPECIFIED if feat not in {'B', 'LWB', 'RWB', 'SYLB', 'MORPHB'} else '+' if feat in {'B', boundary_feat} else '-') for feat in self.feature_space)
                 self.add_custom(symbol=symbol, features=feats)
 
-    def add(self, ipa_seg: str) -> None:
+    def _add_normal_form(self, symbol: str) -> None:
         '''
-        :ipa_seg: an IPA segment in str form
+        Records :symbol: as the inventory's form of its NFC normalization (if they differ).
 
-        :return: None
+        :symbol: a str IPA symbol known to the inventory
+        '''
+        normal_form = unicodedata.normalize('NFC', symbol)
+        if normal_form != symbol and normal_form not in self._seg_to_feat_vec and normal_form not in self._normal_forms:
+            self._normal_forms[normal_form] = symbol
+            self._normalized.pop(normal_form, None)
+
+    def _normalize(self, symbol: str) -> str:
+        '''
+        :symbol: a str IPA symbol
+
+        :return: the inventory's form of :symbol: (:symbol: itself if it is known as-is or has no known normalization)
+        '''
+        if symbol in self._seg_to_feat_vec or symbol in self._ipa_to_seg: # known as-is
+            return symbol
+        if self._frozen_lookup is not None: # a frozen SegInv is never modified, so do not memoize
+            return self._lookup_form(symbol)
+        form = self._normalized.get(symbol)
+        if form is None:
+            form = self._lookup_form(symbol)
+            if form in self._seg_to_feat_vec or form in self._ipa_to_seg: # only memoize symbols that resolve to a known symbol, so the memo stays bounded
+                self._normalized[symbol] = form
+        return form
+
+    def _lookup_form(self, symbol: str) -> str:
+        '''
+        Computes the inventory's form of a symbol that is not known as-is (memoized by self._normalize).
+
+        :symbol: a str IPA symbol
+
+        :return: the inventory's form of :symbol: (:symbol: itself if it has no known normalization)
+        '''
+        normal_form = unicodedata.normalize('NFC', symbol)
+        if normal_form in self._seg_to_feat_vec or normal_form in self._ipa_to_seg: # the inventory's form is the NFC form
+            return normal_form
+        return self._normal_forms.get(normal_form, symbol) # the inventory's form is some other composition (or :symbol: is unknown)
+
+    def _make_seg(self, ipa_seg: str) -> Seg:
+        '''
+        :ipa_seg: a str IPA symbol in the IPA data
+
+        :return: a new Seg object for :ipa_seg:
         '''
-        if ipa_seg in self:
-            return
         if ipa_seg not in self._seg_to_feat_vec:
             raise KeyError(f'Segment {ipa_seg} is not in the IPA data from {self._ipa_source}.')
         feat_vec = self._seg_to_feat_vec[ipa_seg] # get the feature vector
         features = dict((feat, feat_vec[idx]) for idx, feat in enumerate(self.feature_space)) # convert the vector to dict form
-        seg = Seg(ipa=ipa_seg, features=features)
+        return Seg(ipa=ipa_seg, features=features)
+
+    def freeze(self, unknown: str='raise') -> object:
+        '''
+        Makes the SegInv read-only (e.g., once a model is trained), so that it can be shared by threads without copies or locks.
+            - Lookups (including those made when building SegStr objects) read a single dict that is never modified
+            - add_custom() raises a ValueError, and adding a segment that is already in the inventory does nothing
+
+        :unknown: (Optional; default 'raise') what to do when adding (or building a SegStr with) a segment that is not in the frozen inventory
+            - 'raise': raise a KeyError
+            - 'overlay': add the segment to an overlay private to the calling thread
+                - The overlay is not part of the inventory (e.g., not in self.segs), so other threads and models are unaffected
+
+        :return: the SegInv object
+        '''
+        if unknown not in {'raise', 'overlay'}:
+            raise ValueError(f':unknown: must be "raise" or "overlay", but got {unknown!r}.')
+        lookup = dict(self._ipa_to_seg)
+        for normal_form, symbol in self._normal_forms.items(): # the NFC forms of the known symbols
+            if symbol in self._ipa_to_seg:
+                lookup.setdefault(normal_form, self._ipa_to_seg[symbol])
+        for symbol, form in self._normalized.items(): # other forms looked up so far
+            if form in self._ipa_to_seg:
+                lookup.setdefault(symbol, self._ipa_to_seg[form])
+        self._frozen_lookup = lookup
+        self._unknown = unknown
+        self._overlay = threading.local()
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        '''
+        :return: True if the SegInv was frozen by self.freeze()
+        '''
+        return self._frozen_lookup is not None
+
+    def _find_frozen(self, symbol: str) -> Union[None, Seg]:
+        '''
+        :symbol: a str IPA symbol
+
+        :return: the Seg object for :symbol: in the frozen inventory or the calling thread's overlay (None if it is in neither)
+        '''
+        seg = self._frozen_lookup.get(symbol) # the fast path
+        if seg is None:
+            symbol = self._normalize(symbol)
+            seg = self._frozen_lookup.get(symbol)
+            if seg is None:
+                overlay = getattr(self._overlay, 'segs', None)
+                if overlay is not None:
+                    seg = overlay.get(symbol)
+        return seg
+
+    def _get_frozen(self, symbol: str) -> Seg:
+        '''
+        The frozen equivalent of self.add_and_get().
+
+        :symbol: a str IPA symbol
+
+        :return: the Seg object for :symbol:, added to the calling thread's overlay if it is unknown and self._unknown == 'overlay'
+        '''
+        seg = self._find_frozen(symbol)
+        if seg is not None:
+            return seg
+        if self._unknown == 'raise':
+            raise KeyError(f'Segment {symbol} is not in the frozen SegInv (see SegInv.freeze()).')
+        symbol = self._normalize(symbol)
+        seg = self._make_seg(symbol)
+        if not hasattr(self._overlay, 'segs'):
+            self._overlay.segs = dict()
+        self._overlay.segs[symbol] = seg
+        return seg
+
+    def add(self, ipa_seg: str) -> None:
+        '''
+        :ipa_seg: an IPA segment in str form
+
+        :return: None
+        '''
+        if self._frozen_lookup is not None:
+            self._get_frozen(ipa_seg)
+            return
+        ipa_seg = self._normalize(ipa_seg)
+        if ipa_seg in self.segs:
+            return
+        seg = self._make_seg(ipa_seg)
         self.segs.add(seg)
         self._ipa_to_seg[ipa_seg] = seg
 
@@ -147,8 +317,11 @@ class SegInv:
 
         :return: the Seg object corresponding to the IPA seg
         '''
-        self.add(f'{seg}')
-        return self[seg]
+        if self._frozen_lookup is not None:
+            return self._get_frozen(f'{seg}')
+        ipa_seg = self._normalize(f'{seg}')
+        self.add(ipa_seg)
+        return self._ipa_to_seg[ipa_seg]
     
     def add_custom(self, symbol: str, features: dict) -> None:
         '''
@@ -161,6 +334,8 @@ class SegInv:
 
         :return: None
         '''
+        if self._frozen_lookup is not None:
+            raise ValueError(f'Cannot add the symbol "{symbol}" to a frozen SegInv.')
         if symbol in self._seg_to_feat_vec:
             raise ValueError(f'The symbol "{symbol}" is already a symbol in the IPA data from {self._ipa_source}.')
         if set(features.keys()) != set(self.feature_space):
@@ -168,6 +343,7 @@ class SegInv:
         seg = Seg(ipa=symbol, features=features)
         self.segs.add(seg)
         self._ipa_to_seg[symbol] = seg
+        self._add_normal_form(symbol)
     
     def extension(self, nat_class) -> set:
         '''
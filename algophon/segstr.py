@@ -1,4 +1,7 @@
+from bisect import bisect_right
+
 from algophon.seg import Seg
+from algophon.symbols import SYLB
 
 class SegStr:
     '''
@@ -25,6 +28,23 @@ class SegStr:
         self._str = ''
         for seg in self._segs:
             self._str += f'{seg}'
+
+    @classmethod
+    def _from_segs(cls, segs: list, seginv) -> object:
+        '''
+        Builds a SegStr from Seg objects without looking each of them up in the SegInv again.
+        For internal use, when the Seg objects are known to come from :seginv: (e.g., from another SegStr).
+
+        :segs: a list of Seg objects from :seginv:
+        :seginv: a SegInv object
+
+        :return: a SegStr (or subclass) object
+        '''
+        segstr = cls.__new__(cls)
+        segstr._seginv = seginv
+        segstr._segs = segs
+        segstr._str = ''.join(f'{seg}' for seg in segs)
+        return segstr
         
     def __len__(self) -> int:
         return len(self._segs)
@@ -159,4 +179,90 @@ class SegStr:
 
         :return: the number of instances of :item: in :self:
         '''
-        return self._segs.count(item)
\ No newline at end of file
+        return self._segs.count(item)
+
+class SyllabifiedSegStr(SegStr):
+    '''
+    A SegStr whose syllables are separated by syllable boundary (SYLB) Seg objects, as returned by en_syllabify when it is passed a SegStr.
+    The span of each syllable is computed once and cached as integer offsets, so syllable-position queries do not re-scan the Seg objects.
+    '''
+    def __init__(self, segs, seginv):
+        '''
+        :segs: Can be any of the following (with SYLB symbols separating the syllables):
+            - a str of IPA symbols, where each symbol is separated by a space ' '
+            - a list of IPA symbols
+            - a list of Seg objects
+        :seginv: a SegInv object (with boundary symbols)
+        '''
+        super().__init__(segs, seginv)
+        self._set_spans()
+
+    @classmethod
+    def _from_segs(cls, segs: list, seginv, spans: tuple=None) -> object:
+        '''
+        :segs: a list of Seg objects from :seginv:
+        :seginv: a SegInv object
+        :spans: (Optional; default None) the syllable spans, if they are already known
+            - If None, they are computed from the positions of the SYLB Seg objects
+
+        :return: a SyllabifiedSegStr object
+        '''
+        segstr = super()._from_segs(segs, seginv)
+        segstr._set_spans(spans)
+        return segstr
+
+    def _set_spans(self, spans: tuple=None) -> None:
+        if spans is None:
+            spans, start = list(), 0
+            for idx, seg in enumerate(self._segs):
+                if seg == SYLB:
+                    spans.append((start, idx))
+                    start = idx + 1
+            if len(self._segs) > 0:
+                spans.append((start, len(self._segs)))
+            spans = tuple(spans)
+        self._spans = spans
+        self._starts = list(start for start, _ in spans) # for bisecting in syllable_idx
+
+    @property
+    def spans(self) -> tuple:
+        '''
+        :return: a tuple of (start, end) offsets of each syllable, such that self[start:end] is the syllable (without boundaries)
+        '''
+        return self._spans
+
+    def num_syllables(self) -> int:
+        '''
+        :return: the number of syllables
+        '''
+        return len(self._spans)
+
+    def syllable(self, k: int) -> SegStr:
+        '''
+        :k: the index of a syllable
+
+        :return: a SegStr of the :k:th syllable
+        '''
+        start, end = self._spans[k]
+        return SegStr._from_segs(self._segs[start:end], seginv=self._seginv)
+
+    def syllables(self) -> list:
+        '''
+        :return: a list of SegStr objects, one for each syllable
+        '''
+        return list(self.syllable(k) for k in range(len(self._spans)))
+
+    def syllable_idx(self, idx: int) -> int:
+        '''
+        :idx: the index of a Seg in self (may be negative)
+
+        :return: the index of the syllable that the Seg at :idx: belongs to
+        '''
+        if idx < 0:
+            idx += len(self._segs)
+        if idx < 0 or idx >= len(self._segs):
+            raise IndexError(f'Index {idx} is out of range for a SyllabifiedSegStr of length {len(self._segs)}.')
+        k = bisect_right(self._starts, idx) - 1
+        if idx >= self._spans[k][-1]:
+            raise ValueError(f'The Seg at index {idx} is a syllable boundary.')
+        return k
\ No newline at end of file
@@ -0,0 +1,85 @@
+from typing import Iterable, Generator
+import unicodedata
+
+from algophon.segstr import SegStr
+from algophon.data_structures import Trie
+
+class Tokenizer:
+    '''
+    Splits unsegmented IPA strs (e.g., 'ŋ̊at͡sə') into SegStr objects.
+
+    The tokenizer builds a longest-match Trie over every symbol known to a SegInv (the symbols in its IPA data and any custom symbols),
+    so a str is segmented in one left-to-right pass, preferring the longest symbol at each position (e.g., 't͡s' over 't').
+    Input is NFC-normalized first, and symbols are matched in either the SegInv's own composition or their NFC form.
+    '''
+    def __init__(self, seginv) -> object:
+        '''
+        :seginv: a SegInv object whose symbols to tokenize with
+            - Custom symbols added to :seginv: after the Tokenizer is built are picked up automatically
+        '''
+        self.seginv = seginv
+        self._trie = Trie()
+        for symbol in seginv._seg_to_feat_vec:
+            self._trie.insert(symbol, symbol)
+        self._num_known = -1 # the size of seginv._ipa_to_seg when custom symbols were last added to the Trie
+        self._refresh()
+
+    def __str__(self) -> str:
+        return f'Tokenizer over {len(self._trie)} symbols'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _refresh(self) -> None:
+        '''
+        Adds any custom symbols that have been added to self.seginv since the last refresh to the Trie.
+        '''
+        if len(self.seginv._ipa_to_seg) != self._num_known:
+            for symbol in self.seginv._ipa_to_seg:
+                if symbol not in self.seginv._seg_to_feat_vec:
+                    self._trie.insert(symbol, symbol)
+            for normal_form, symbol in self.seginv._normal_forms.items(): # match NFC input to the SegInv's composition
+                self._trie.insert(normal_form, symbol)
+            self._num_known = len(self.seginv._ipa_to_seg)
+
+    def tokenize(self, raw: str) -> list:
+        '''
+        :raw: a str of IPA symbols, with or without spaces between them (spaces are ignored)
+
+        :return: a list of the str IPA symbols in :raw:
+        '''
+        self._refresh()
+        if not unicodedata.is_normalized('NFC', raw):
+            raw = unicodedata.normalize('NFC', raw)
+        symbols = list()
+        idx = 0
+        while idx < len(raw):
+            if raw[idx].isspace():
+                idx += 1
+                continue
+            match = self._trie.longest_match(raw, start=idx)
+            if match is None or match[0] == 0:
+                raise ValueError(f'Could not tokenize "{raw}": no symbol in the SegInv matches "{raw[idx]}" at index {idx}.')
+            length, symbol = match
+            symbols.append(symbol)
+            idx += length
+        return symbols
+
+    def __call__(self, raw: str) -> SegStr:
+        '''
+        :raw: a str of IPA symbols, with or without spaces between them (spaces are ignored)
+
+        :return: a SegStr of the symbols in :raw:
+        '''
+        ipa_to_seg = self.seginv._ipa_to_seg
+        segs = list(ipa_to_seg[symbol] if symbol in ipa_to_seg else self.seginv.add_and_get(symbol) for symbol in self.tokenize(raw))
+        return SegStr._from_segs(segs, seginv=self.seginv)
+
+    def batch(self, raws: Iterable) -> Generator:
+        '''
+        :raws: an iterable of strs of IPA symbols (consumed lazily, so it can be streamed, e.g., from a file)
+
+        :return: a Generator that yields a SegStr for each str in :raws:
+        '''
+        for raw in raws:
+            yield self(raw)
\ No newline at end of file
@@ -1,2 +1,3 @@
-from algophon.utils.utils import tsp
-from algophon.utils.en_syllabify import en_syllabify
\ No newline at end of file
+from algophon.utils.utils import tsp, tsp_thresholds
+from algophon.utils.en_syllabify import en_syllabify, en_syllabify_batch
+from algophon.utils.profiling import Profiler
\ No newline at end of file
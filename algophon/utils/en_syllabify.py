@@ -24,7 +24,13 @@
 #
 # syllabify.py: prosodic parsing of ARPABET entries
 
-from itertools import chain
+from collections import deque
+from itertools import islice
+
+from algophon.data_structures import Trie
+from algophon.segstr import SegStr, SyllabifiedSegStr
+from algophon.symbols import SYLB
+from algophon.utils.workers import resolve_n_jobs, process_pool, run_in_worker
 
 ## constants
 ARP_SLAX   = {'IH1', 'IH2', 'EH1', 'EH2', 'AE1', 'AE2', 'AH1', 'AH2',
@@ -67,6 +73,9 @@ def en_syllabify(pron, transcription='ipa', alaska_rule=True):
     """
     Syllabifies a CMU dictionary (ARPABET) word string
 
+    If :pron: is a SegStr, returns a SyllabifiedSegStr instead of a str, which contains the same Seg objects
+    with SYLB boundary Segs between the syllables (the SegStr's SegInv must have boundary symbols).
+
     # Alaska rule:
     >>> pprint(syllabify('AH0 L AE1 S K AH0'.split())) # Alaska
     '-AH0-.L-AE1-S.K-AH0-'
@@ -151,53 +160,132 @@ def en_syllabify(pron, transcription='ipa', alaska_rule=True):
     >>> pprint(syllabify('IH0 K S K L UW1 D'.split())) # exclude
     '-IH0-K.S K L-UW1-D'
     """
-    if transcription == 'ipa':
-        SLAX, VOWELS, O2, O3 = IPA_SLAX, IPA_VOWLES, IPA_O2, IPA_O3
-        R, Y, S = {'r', 'ɹ'}, 'j', 's'
-    elif transcription == 'arpabet':
-        SLAX, VOWELS, O2, O3 = ARP_SLAX, ARP_VOWELS, ARP_O2, ARP_O3
-        R, Y, S = {'R'}, 'Y', 'S'
-    else:
-        raise ValueError(f'transcription {transcription} must be one of ipa|arpabet')
-    
-    ## main pass
-    if isinstance(pron, str) and ' ' in pron: # split into list if space-separated string
-        mypron = pron.split()
-    else:
-        mypron = list(pron)
-    nuclei = []
-    onsets = []
-    i = -1
-    for (j, seg) in enumerate(mypron):
-        if seg in VOWELS:
-            nuclei.append([seg])
-            onsets.append(mypron[i + 1:j]) # actually interludes, r.n.
-            i = j
-    codas = [mypron[i + 1:]]
-    ## resolve disputes and compute coda
-    for i in range(1, len(onsets)):
-        coda = []
-        # boundary cases
-        if len(onsets[i]) > 1 and onsets[i][0] in R:
-            nuclei[i - 1].append(onsets[i].pop(0))
-        if len(onsets[i]) > 2 and onsets[i][-1] == Y:
-            nuclei[i].insert(0, onsets[i].pop())
-        if len(onsets[i]) > 1 and alaska_rule and nuclei[i-1][-1] in SLAX \
-                                              and onsets[i][0] == S:
-            coda.append(onsets[i].pop(0))
-        # onset maximization
-        depth = 1
-        if len(onsets[i]) > 1:
-            if tuple(onsets[i][-2:]) in O2:
-                depth = 3 if tuple(onsets[i][-3:]) in O3 else 2
-        for j in range(len(onsets[i]) - depth):
-            coda.append(onsets[i].pop(0))
-        # store coda
-        codas.insert(i - 1, coda)
-
-    ## verify that all segments are included in the ouput
-    output = list(zip(onsets, nuclei, codas))  # in Python3 zip is a generator
-    flat_output = list(chain.from_iterable(chain.from_iterable(output)))
-    if flat_output != mypron:
-        raise ValueError(f"could not syllabify {mypron}, got {flat_output}")
-    return '.'.join(' '.join(' '.join(p) for p in syl).strip() for syl in output)
\ No newline at end of file
+    return _get_syllabifier(transcription)(pron, alaska_rule=alaska_rule)
+
+def en_syllabify_batch(prons, transcription='ipa', alaska_rule=True, n_jobs=1, chunk_size=1000):
+    """
+    Syllabifies an iterable of words, yielding the same output as calling en_syllabify on each word (in order).
+    The symbol sets are compiled once for the whole batch, and :prons: is consumed lazily,
+    so the batch can be streamed (e.g., from a file of ~130k CMU dictionary entries).
+
+    :prons: an iterable of words (each in any form accepted by en_syllabify)
+    :transcription: (Optional; default 'ipa') one of ipa|arpabet
+    :alaska_rule: (Optional; default True) as in en_syllabify
+    :n_jobs: (Optional; default 1) the number of worker processes to syllabify with
+        - None or a negative value uses one process per CPU
+        - 0 raises a ValueError
+    :chunk_size: (Optional; default 1000) the number of words sent to a worker process at a time
+        - Only used if :n_jobs: is not 1
+
+    :return: a Generator that yields the syllabified words
+    """
+    syllabifier = _get_syllabifier(transcription) # compile (and validate :transcription:) before any words are consumed
+    n_jobs = resolve_n_jobs(n_jobs) # validate :n_jobs: before any words are consumed, too
+    if n_jobs == 1:
+        return (syllabifier(pron, alaska_rule=alaska_rule) for pron in prons)
+    return _en_syllabify_parallel(prons, syllabifier=syllabifier, alaska_rule=alaska_rule, n_jobs=n_jobs, chunk_size=chunk_size)
+
+def _en_syllabify_parallel(prons, syllabifier, alaska_rule, n_jobs, chunk_size):
+    prons = iter(prons)
+    chunks = iter(lambda: list(islice(prons, chunk_size)), [])
+    with process_pool(syllabifier, n_jobs) as executor: # each worker holds a copy of :syllabifier:
+        submit = lambda chunk: executor.submit(run_in_worker, 'syllabify_all', chunk, alaska_rule=alaska_rule)
+        # keep two chunks per worker in flight, so that :prons: is still consumed lazily
+        futures = deque(submit(chunk) for chunk in islice(chunks, 2 * n_jobs))
+        while len(futures) > 0:
+            future = futures.popleft()
+            futures.extend(submit(chunk) for chunk in islice(chunks, 1))
+            yield from future.result()
+
+_SYLLABIFIERS = dict() # transcription -> _Syllabifier
+
+def _get_syllabifier(transcription):
+    if transcription not in _SYLLABIFIERS:
+        if transcription == 'ipa':
+            _SYLLABIFIERS[transcription] = _Syllabifier(IPA_SLAX, IPA_VOWLES, IPA_O2, IPA_O3, R={'r', 'ɹ'}, Y='j', S='s')
+        elif transcription == 'arpabet':
+            _SYLLABIFIERS[transcription] = _Syllabifier(ARP_SLAX, ARP_VOWELS, ARP_O2, ARP_O3, R={'R'}, Y='Y', S='S')
+        else:
+            raise ValueError(f'transcription {transcription} must be one of ipa|arpabet')
+    return _SYLLABIFIERS[transcription]
+
+class _Syllabifier:
+    """
+    The syllabification procedure of en_syllabify compiled for one transcription.
+
+    The medial onsets are compiled into a Trie over reversed onsets, so that the depth of onset maximization
+    is found by walking back from the end of an interlude (a key of length 3 is only reachable through a key in O2,
+    as onset maximization only checks O3 if the final two segments are in O2).
+    Instead of moving segments between onset, nucleus, and coda lists, each word is processed by computing
+    the index at which each syllable starts.
+    """
+    def __init__(self, SLAX, VOWELS, O2, O3, R, Y, S):
+        self.SLAX, self.VOWELS, self.R, self.Y, self.S = SLAX, VOWELS, R, Y, S
+        self.onsets = Trie()
+        for onset in O2:
+            self.onsets.insert(reversed(onset), 2)
+        for onset in O3:
+            if tuple(onset[-2:]) in O2:
+                self.onsets.insert(reversed(onset), 3)
+
+    def __call__(self, pron, alaska_rule=True):
+        if isinstance(pron, SegStr):
+            return self._syllabify_segstr(pron, alaska_rule=alaska_rule)
+        if isinstance(pron, str) and ' ' in pron: # split into list if space-separated string
+            mypron = pron.split()
+        else:
+            mypron = list(pron)
+        starts = self._syllable_starts(mypron, alaska_rule=alaska_rule)
+        return '.'.join(' '.join(mypron[starts[k]:starts[k + 1]]).strip() for k in range(len(starts) - 1))
+
+    def syllabify_all(self, prons, alaska_rule=True):
+        """
+        Syllabifies a list of words (in a worker process of en_syllabify_batch).
+        """
+        return list(self(pron, alaska_rule=alaska_rule) for pron in prons)
+
+    def _syllabify_segstr(self, pron, alaska_rule=True):
+        seginv = pron._seginv
+        if SYLB not in seginv._ipa_to_seg:
+            raise ValueError('Syllabifying a SegStr requires its SegInv to have boundary symbols (SegInv(add_boundary_symbols=True)).')
+        sylb = seginv._ipa_to_seg[SYLB]
+        starts = self._syllable_starts(list(f'{seg}' for seg in pron), alaska_rule=alaska_rule)
+        segs, spans = list(), list()
+        for k in range(len(starts) - 1):
+            if k > 0:
+                segs.append(sylb)
+            spans.append((len(segs), len(segs) + starts[k + 1] - starts[k]))
+            segs.extend(pron._segs[starts[k]:starts[k + 1]])
+        return SyllabifiedSegStr._from_segs(segs, seginv=seginv, spans=tuple(spans))
+
+    def _syllable_starts(self, mypron, alaska_rule=True):
+        """
+        :return: a list of the index in :mypron: at which each syllable starts, followed by len(:mypron:)
+        """
+        nuclei = list(j for j, seg in enumerate(mypron) if seg in self.VOWELS)
+        if len(nuclei) == 0:
+            if len(mypron) > 0:
+                raise ValueError(f"could not syllabify {mypron}, got {[]}")
+            return [0]
+
+        starts = [0] # the index at which each syllable starts
+        for i in range(1, len(nuclei)):
+            start, end = nuclei[i - 1] + 1, nuclei[i] # the interlude between the nuclei
+            last_nucleus_seg = mypron[nuclei[i - 1]]
+            # boundary cases
+            if end - start > 1 and mypron[start] in self.R: # r joins the preceding nucleus
+                last_nucleus_seg = mypron[start]
+                start += 1
+            if end - start > 2 and mypron[end - 1] == self.Y: # j joins the following nucleus
+                end -= 1
+            if end - start > 1 and alaska_rule and last_nucleus_seg in self.SLAX and mypron[start] == self.S:
+                start += 1
+            # onset maximization
+            depth = 1
+            if end - start > 1:
+                match = self.onsets.longest_match(mypron[idx] for idx in range(end - 1, start - 1, -1))
+                if match is not None:
+                    depth = match[-1]
+            starts.append(max(start, end - depth))
+        starts.append(len(mypron))
+        return starts
\ No newline at end of file
@@ -0,0 +1,109 @@
+from typing import Union, Callable
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# a reusable no-op context manager, for models to use in place of Profiler.phase() when profiling is disabled
+NULL_PHASE = nullcontext()
+
+class Profiler:
+    '''
+    A lightweight, opt-in profiler for the learning models.
+
+    Models that accept a Profiler wrap their phases in profiler.phase(name) and report counters with profiler.count() and per-iteration values with profiler.record().
+    When a model has no Profiler, none of this is done, so profiling costs nothing unless it is enabled.
+    '''
+    def __init__(self, callback: Union[None, Callable]=None) -> object:
+        '''
+        :callback: (Optional; default None) a function called with (kind, name, value) for every event as it happens
+            - kind is 'phase' (value is the phase's wall time in seconds), 'count' (value is the increment), or 'record' (value is the recorded value)
+            - Useful for streaming metrics to a logger or monitoring system
+        '''
+        self.callback = callback
+        self.reset()
+
+    def __str__(self) -> str:
+        return f'Profiler with {len(self._times)} phases'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def reset(self) -> None:
+        '''
+        Clears everything recorded so far.
+
+        :return: None
+        '''
+        self._times = defaultdict(float) # phase -> total wall time
+        self._calls = defaultdict(int) # phase -> number of calls
+        self._outer_calls = defaultdict(int) # phase -> number of calls that were not nested within the same phase
+        self._max_depth = defaultdict(int) # phase -> maximum number of times it was nested within itself (i.e., recursion depth)
+        self._active = defaultdict(int) # phase -> number of currently-open calls
+        self._counts = defaultdict(int) # counter -> value
+        self._records = defaultdict(list) # name -> recorded values
+
+    @contextmanager
+    def phase(self, name: str):
+        '''
+        A context manager that times a phase. Phases can be nested (and recursive); a recursive phase's time is only counted once (for its outermost call).
+
+        :name: the name of the phase
+        '''
+        self._active[name] += 1
+        self._max_depth[name] = max(self._max_depth[name], self._active[name])
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self._active[name] -= 1
+            if self._active[name] == 0: # only count the outermost call's time, so that recursion is not double-counted
+                self._times[name] += elapsed
+                self._outer_calls[name] += 1
+            self._calls[name] += 1
+            if self.callback is not None:
+                self.callback('phase', name, elapsed)
+
+    def count(self, name: str, n: int=1) -> None:
+        '''
+        :name: the name of a counter
+        :n: (Optional; default 1) the amount to increment the counter by
+
+        :return: None
+        '''
+        self._counts[name] += n
+        if self.callback is not None:
+            self.callback('count', name, n)
+
+    def record(self, name: str, value: object) -> None:
+        '''
+        :name: the name of a recorded quantity (e.g., the size of the tier at each iteration)
+        :value: the value to record
+
+        :return: None
+        '''
+        self._records[name].append(value)
+        if self.callback is not None:
+            self.callback('record', name, value)
+
+    def report(self) -> dict:
+        '''
+        :return: a dict with everything recorded so far
+            - 'phases': phase -> {'calls', 'total' (seconds), 'mean' (seconds per outermost call), 'max_depth'}
+            - 'counts': counter -> value
+            - 'records': name -> list of recorded values, in order
+        '''
+        phases = dict()
+        for name, calls in self._calls.items():
+            phases[name] = {
+                'calls': calls,
+                'total': self._times[name],
+                'mean': self._times[name] / max(1, self._outer_calls[name]),
+                'max_depth': self._max_depth[name],
+            }
+        return {
+            'phases': phases,
+            'counts': dict(self._counts),
+            'records': dict((name, list(values)) for name, values in self._records.items()),
+        }
\ No newline at end of file
@@ -1,6 +1,13 @@
-import numpy as np
+from typing import Union, TYPE_CHECKING
+from functools import lru_cache
+from numbers import Number
 
-def tsp(n: int, e: int=None, m: int=None) -> bool:
+import math
+
+if TYPE_CHECKING: # NumPy is only imported when it is needed (for arrays), so that the scalar TSP does not load it
+    import numpy as np
+
+def tsp(n: Union[int, 'np.ndarray'], e: Union[None, int, 'np.ndarray']=None, m: Union[None, int, 'np.ndarray']=None, thresholds: Union[None, 'np.ndarray']=None) -> Union[bool, 'np.ndarray']:
     '''
     Computes whether the Tolerance/Sufficiency Principle (TSP) threshold is satisfied.
 
@@ -9,18 +16,64 @@ def tsp(n: int, e: int=None, m: int=None) -> bool:
         - Must be provided if :m: is not
     :m: (optional) the number of items following the rule (n - e)
         - Must be provided if :e: is not
+    :thresholds: (optional) a table of n / ln(n) thresholds from tsp_thresholds() to look the threshold up in instead of computing it
+        - Must be longer than the largest :n:
 
     If both :e: and :m: are passed, it must be that :m: = :n: - :e:
 
-    :return: True if the threshold is satisfied, False if not
+    :n:, :e:, and :m: can also be NumPy arrays (or lists) of equal shape, to evaluate many rules at once.
+
+    :return: True if the threshold is satisfied, False if not (or, for arrays, a boolean array with the result for each rule)
         - Because the TSP is not well-defined for very small n, the functions returns False if m < 2 or m < n / 2
     '''
     if e is None and m is None:
         raise ValueError('Either :e: or :m: must be provided.')
+    if not all(x is None or isinstance(x, Number) for x in (n, e, m)): # vectorized version
+        return _tsp_array(n=n, e=e, m=m, thresholds=thresholds)
     if e is not None and m is not None and m != n - e:
         raise ValueError(f'Passed both :e: (= {e}) and :m: (= {m}), but they are incompatible: {m} != {n} - {e}')
     if e is None: # compute e from n and m
         e = n - m
     if m is None: # compute m from n and e
         m = n - e
-    return m > 1 and m >= n / 2 and e <= n / np.log(n)
\ No newline at end of file
+    return m > 1 and m >= n / 2 and e <= (n / math.log(n) if thresholds is None else thresholds[n])
+
+def _tsp_array(n: 'np.ndarray', e: Union[None, 'np.ndarray']=None, m: Union[None, 'np.ndarray']=None, thresholds: Union[None, 'np.ndarray']=None) -> 'np.ndarray':
+    '''
+    The vectorized version of tsp(), which is called when any of :n:, :e:, or :m: is an array.
+
+    :return: a boolean array with the result for each (n, e, m)
+    '''
+    import numpy as np
+    n = np.asarray(n)
+    e = None if e is None else np.asarray(e)
+    m = None if m is None else np.asarray(m)
+    if e is not None and m is not None and np.any(m != n - e):
+        raise ValueError('Passed both :e: and :m:, but they are incompatible: :m: != :n: - :e: for at least one rule')
+    if e is None: # compute e from n and m
+        e = n - m
+    if m is None: # compute m from n and e
+        m = n - e
+    if thresholds is None:
+        with np.errstate(divide='ignore', invalid='ignore'): # n < 2 does not have a well-defined threshold, but fails m > 1
+            threshold = n / np.log(n)
+    else:
+        threshold = thresholds[n]
+    return (m > 1) & (m >= n / 2) & (e <= threshold)
+
+@lru_cache(maxsize=8)
+def tsp_thresholds(max_n: int) -> 'np.ndarray':
+    '''
+    Precomputes the TSP threshold n / ln(n) for every n up to :max_n:, so that many rules can be scored with table lookups.
+
+    :max_n: the largest n to compute the threshold for
+
+    :return: a read-only array of length :max_n: + 1, where index n holds n / ln(n)
+        - Indices 0 and 1 hold 0, since the TSP is never satisfied for n < 2
+    '''
+    import numpy as np
+    n = np.arange(max_n + 1, dtype=float)
+    table = np.zeros(max_n + 1, dtype=float)
+    table[2:] = n[2:] / np.log(n[2:])
+    table.flags.writeable = False # the table is cached and shared, so prevent it from being changed
+    return table
\ No newline at end of file
@@ -0,0 +1,61 @@
+'''
+Helpers for running a trained model in worker processes (used by D2L.produce_batch, Miaseg.segment_batch, en_syllabify_batch, and BatchServer).
+'''
+from typing import Union
+
+import os
+
+# the trained model used by the current worker process (set once per worker by init_worker)
+_WORKER_MODEL = None
+
+def resolve_n_jobs(n_jobs: Union[None, int], name: str='n_jobs') -> int:
+    '''
+    :n_jobs: a number of processes
+        - If None or < 0, one process per CPU
+        - 0 raises a ValueError
+    :name: (Optional; default 'n_jobs') the name of the parameter that :n_jobs: was passed as, for the error message
+
+    :return: the number of processes to use
+    '''
+    if n_jobs == 0:
+        raise ValueError(f':{name}: must be positive, None, or < 0 (for one process per CPU), but got {n_jobs}.')
+    if n_jobs is None or n_jobs < 0:
+        return os.cpu_count() or 1
+    return n_jobs
+
+def process_pool(model: object, n_workers: int) -> object:
+    '''
+    :model: a trained model
+    :n_workers: the number of worker processes
+
+    :return: a concurrent.futures.ProcessPoolExecutor, each of whose workers holds a copy of :model: (installed once per worker)
+        - If :model: has a _worker_copy() method, the copy it returns (e.g., without the training data) is installed instead
+    '''
+    from concurrent.futures import ProcessPoolExecutor # imported here, since it is slow to import and only needed for parallel batches
+    if hasattr(model, '_worker_copy'):
+        model = model._worker_copy()
+    return ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker, initargs=(model,))
+
+def init_worker(model: object) -> None:
+    '''
+    Installs a trained model in a worker process.
+    '''
+    global _WORKER_MODEL
+    _WORKER_MODEL = model
+
+def worker_model() -> object:
+    '''
+    :return: the trained model installed in the current worker process (None outside of worker processes)
+    '''
+    return _WORKER_MODEL
+
+def run_in_worker(method: str, *args, **kwargs) -> object:
+    '''
+    Calls a method of the trained model installed in the current worker process.
+
+    :method: the name of the method
+    :args: and :kwargs: are passed to the method
+
+    :return: the method's output
+    '''
+    return getattr(_WORKER_MODEL, method)(*args, **kwargs)
\ No newline at end of file
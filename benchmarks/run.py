@@ -0,0 +1,303 @@
+'''
+Runs the benchmark suite and emits the timings as JSON.
+
+Usage (from the repository root):
+    python benchmarks/run.py                                # all benchmarks at the small and medium scales, JSON to stdout
+    python benchmarks/run.py --scales small,medium,large --out results.json
+    python benchmarks/run.py --only graph,segstr --repeat 5
+    python benchmarks/run.py --only import --enforce-budgets      # exits with status 1 if a benchmark is over budget
+
+Each benchmark is timed :repeat: times at each scale, and the min and mean times (in seconds) are reported.
+'''
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from algophon import SegInv, SegStr, NatClass
+from algophon.distance import edit_distance
+from algophon.data_structures import Graph
+from algophon.models.D2L import D2L, generate
+from algophon.models.Miaseg import Miaseg
+from algophon.models.Miaseg.generate import ParadigmGenerator, segmentation_accuracy
+
+import synthetic
+
+SCALES = { # scale name -> size multiplier
+    'small': 1,
+    'medium': 10,
+    'large': 100,
+}
+
+BENCHMARKS = list() # (name, setup function, budgets) tuples, in the order they are registered
+
+def benchmark(name: str, budgets: dict=None):
+    '''
+    Registers a benchmark.
+    The decorated function takes (multiplier, seed) and returns (n, run), where n is the input size and run is a function to time.
+    It can also return (n, run, metrics), where metrics is a function returning a dict of extra (untimed) results, such as accuracy.
+    :budgets: optionally maps result fields (e.g., 'min') to the largest acceptable value, which --enforce-budgets checks.
+    '''
+    def register(setup):
+        BENCHMARKS.append((name, setup, budgets or dict()))
+        return setup
+    return register
+
+def _import_benchmark(statement: str):
+    '''
+    :statement: an import statement
+
+    :return: the (n, run, metrics) of a benchmark timing :statement: in a fresh interpreter (the cost paid by each CLI call or worker process)
+    '''
+    code = ('import sys, time, json; start = time.perf_counter(); ' + statement + '; '
+            'print(json.dumps({"import_time": time.perf_counter() - start, "loads_numpy": "numpy" in sys.modules}))')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'), os.environ.get('PYTHONPATH', '')]))
+    results = list()
+    def run():
+        output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output))
+    def metrics(): # the fastest import (the interpreter's own startup is not included)
+        return min(results, key=lambda result: result['import_time'])
+    return 1, run, metrics
+
+@benchmark('import.algophon', budgets={'import_time': 0.05})
+def import_algophon(mult: int, seed: int):
+    return _import_benchmark('import algophon')
+
+@benchmark('import.segstr', budgets={'import_time': 0.05, 'loads_numpy': False})
+def import_segstr(mult: int, seed: int):
+    return _import_benchmark('from algophon import SegStr')
+
+@benchmark('import.d2l', budgets={'import_time': 0.05, 'loads_numpy': False})
+def import_d2l(mult: int, seed: int):
+    return _import_benchmark('from algophon.models.D2L import D2L')
+
+@benchmark('import.miaseg', budgets={'import_time': 0.05, 'loads_numpy': False})
+def import_miaseg(mult: int, seed: int):
+    return _import_benchmark('from algophon.models.Miaseg import Miaseg')
+
+@benchmark('import.cli')
+def import_cli(mult: int, seed: int):
+    return _import_benchmark('import algophon.cli')
+
+@benchmark('seginv.init')
+def seginv_init(mult: int, seed: int):
+    return mult, lambda: [SegInv() for _ in range(mult)]
+
+@benchmark('segstr.create')
+def segstr_create(mult: int, seed: int):
+    seginv, words = SegInv(), synthetic.random_words(1000 * mult, seed=seed)
+    return len(words), lambda: [SegStr(word, seginv) for word in words]
+
+@benchmark('segstr.hash')
+def segstr_hash(mult: int, seed: int):
+    seginv = SegInv()
+    segstrs = list(SegStr(word, seginv) for word in synthetic.random_words(1000 * mult, seed=seed))
+    return len(segstrs), lambda: set(segstrs)
+
+@benchmark('segstr.slice')
+def segstr_slice(mult: int, seed: int):
+    seginv = SegInv()
+    segstrs = list(SegStr(word, seginv) for word in synthetic.random_words(1000 * mult, seed=seed))
+    return len(segstrs), lambda: [(segstr[1:], segstr[:-1]) for segstr in segstrs]
+
+@benchmark('natclass.extension')
+def natclass_extension(mult: int, seed: int):
+    seginv = SegInv()
+    seginv.add_segs(synthetic.CONSONANTS + synthetic.VOWELS)
+    rng = random.Random(seed)
+    feats = list(seginv.feature_space)
+    natclasses = list(NatClass({f'{rng.choice("+-")}{feat}' for feat in rng.sample(feats, 2)}, seginv) for _ in range(100 * mult))
+    return len(natclasses), lambda: [natclass.extension() for natclass in natclasses]
+
+@benchmark('edit_distance.distance')
+def edit_distance_distance(mult: int, seed: int):
+    seginv = SegInv()
+    words = list(SegStr(word, seginv) for word in synthetic.random_words(200 * mult, seed=seed))
+    pairs = list(zip(words[::2], words[1::2]))
+    return len(pairs), lambda: [edit_distance.distance(s1, s2) for s1, s2 in pairs]
+
+@benchmark('edit_distance.alignments')
+def edit_distance_alignments(mult: int, seed: int):
+    seginv = SegInv()
+    words = list(SegStr(word, seginv) for word in synthetic.random_words(200 * mult, seed=seed, max_syls=3))
+    pairs = list(zip(words[::2], words[1::2]))
+    return len(pairs), lambda: [edit_distance.alignments(s1, s2) for s1, s2 in pairs]
+
+def _dag(mult: int, seed: int) -> Graph:
+    graph = Graph(directed=True)
+    graph.add_edges(synthetic.random_dag(1000 * mult, seed=seed))
+    return graph
+
+@benchmark('graph.bfs')
+def graph_bfs(mult: int, seed: int):
+    graph = _dag(mult, seed)
+    return graph.num_nodes(), lambda: list(graph.bfs())
+
+@benchmark('graph.dfs')
+def graph_dfs(mult: int, seed: int):
+    graph = _dag(mult, seed)
+    return graph.num_nodes(), lambda: list(graph.dfs())
+
+@benchmark('graph.topological_sort')
+def graph_topological_sort(mult: int, seed: int):
+    graph = _dag(mult, seed)
+    return graph.num_nodes(), lambda: graph.topological_sort()
+
+@benchmark('graph.frozen_bfs')
+def graph_frozen_bfs(mult: int, seed: int):
+    graph = _dag(mult, seed).freeze()
+    return graph.num_nodes(), lambda: list(graph.bfs())
+
+@benchmark('d2l.generate')
+def d2l_generate(mult: int, seed: int):
+    generator = generate.nasal_harmony(seed=seed)
+    return 100 * mult, lambda: generator.sample(100 * mult)
+
+@benchmark('d2l.train')
+def d2l_train(mult: int, seed: int):
+    pairs = generate.nasal_harmony(seed=seed).sample(100 * mult)
+    return len(pairs), lambda: D2L().train(pairs)
+
+@benchmark('d2l.produce')
+def d2l_produce(mult: int, seed: int):
+    pairs = generate.nasal_harmony(seed=seed).sample(100 * mult)
+    model = D2L().train(pairs)
+    urs = list(SegStr(ur, model.seginv) for ur, _ in pairs)
+    return len(urs), lambda: [model.produce(ur) for ur in urs]
+
+@benchmark('d2l.produce_cached')
+def d2l_produce_cached(mult: int, seed: int):
+    pairs = generate.nasal_harmony(seed=seed).sample(100 * mult)
+    model = D2L(produce_cache_size=None).train(pairs)
+    urs = list(ur for ur, _ in pairs) * 10 # repeated str URs, as when serving
+    def metrics():
+        info = model.produce_cache_info()
+        return {'hit_rate': info.hits / max(1, info.hits + info.misses)}
+    return len(urs), lambda: [model.produce(ur) for ur in urs], metrics
+
+def _paradigms(mult: int, seed: int) -> tuple:
+    return ParadigmGenerator(n_feats=6, max_allomorphs=3, prefix_ratio=0.3, seed=seed), 10 * mult
+
+@benchmark('miaseg.one_diff_pairs')
+def miaseg_one_diff_pairs(mult: int, seed: int):
+    generator, n_paradigms = _paradigms(mult, seed)
+    model = Miaseg()
+    model._setup_paradigms(generator.triples(n_paradigms))
+    paradigms = list(model._paradigms.values())
+    return sum(len(par) for par in paradigms), lambda: [par.get_one_diff_pairs() for par in paradigms]
+
+@benchmark('miaseg.find_allomorphs')
+def miaseg_find_allomorphs(mult: int, seed: int):
+    generator, n_paradigms = _paradigms(mult, seed)
+    triples = generator.triples(n_paradigms)
+    model = Miaseg()
+    model._setup_paradigms(triples)
+    return len(triples), lambda: model._find_allomorphs(triples)
+
+@benchmark('miaseg.train')
+def miaseg_train(mult: int, seed: int):
+    generator, n_paradigms = _paradigms(mult, seed)
+    triples = generator.triples(n_paradigms)
+    return len(triples), lambda: Miaseg().train(triples)
+
+@benchmark('miaseg.segment')
+def miaseg_segment(mult: int, seed: int):
+    generator, n_paradigms = _paradigms(mult, seed)
+    triples, gold = generator.triples(n_paradigms), generator.gold(n_paradigms)
+    model = Miaseg().train(triples)
+    run = lambda: [model.segment(word, features, with_analysis=False) for _, word, features in triples]
+    return len(triples), run, lambda: {'accuracy': segmentation_accuracy(run(), gold)}
+
+def time_benchmark(setup, mult: int, seed: int, repeat: int) -> dict:
+    '''
+    :setup: a registered benchmark setup function
+    :mult: the size multiplier
+    :seed: the random seed
+    :repeat: the number of times to time the benchmark
+
+    :return: a dict with the input size, the min and mean times, and any extra metrics
+    '''
+    n, run, *metrics = setup(mult, seed)
+    times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    result = {'n': n, 'min': min(times), 'mean': sum(times) / len(times), 'repeat': repeat}
+    if len(metrics) > 0:
+        result.update(metrics[0]())
+    return result
+
+def run_benchmarks(scales: list, only: list=None, repeat: int=3, seed: int=0, log=sys.stderr) -> dict:
+    '''
+    :scales: a list of scale names (keys of SCALES)
+    :only: (Optional; default None) if a list of strs is passed, only benchmarks whose name contains one of them are run
+    :repeat: (Optional; default 3) the number of times to time each benchmark
+    :seed: (Optional; default 0) the random seed for the synthetic data
+    :log: (Optional; default sys.stderr) a file to log progress to (None for no logging)
+
+    :return: a JSON-serializable dict of the environment and the results
+    '''
+    results = list()
+    for name, setup, budgets in BENCHMARKS:
+        if only is not None and not any(substr in name for substr in only):
+            continue
+        for scale in scales:
+            result = {'benchmark': name, 'scale': scale}
+            result.update(time_benchmark(setup, mult=SCALES[scale], seed=seed, repeat=repeat))
+            if len(budgets) > 0:
+                result['budgets'] = budgets
+                result['over_budget'] = sorted(field for field, budget in budgets.items() if result[field] > budget)
+            results.append(result)
+            if log is not None:
+                print(f'{name:<28} {scale:<8} n = {result["n"]:<8} min = {result["min"]:.4f}s', file=log)
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def main(argv: list=None) -> None:
+    parser = argparse.ArgumentParser(description='Run the algophon benchmark suite.')
+    parser.add_argument('--scales', default='small,medium', help=f'comma-separated scales from {list(SCALES)}')
+    parser.add_argument('--only', default=None, help='comma-separated substrings; only matching benchmarks are run')
+    parser.add_argument('--repeat', type=int, default=3, help='number of times to time each benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the synthetic data')
+    parser.add_argument('--out', default=None, help='path to write the JSON results to (default: stdout)')
+    parser.add_argument('--enforce-budgets', action='store_true', help='exit with status 1 if any benchmark is over one of its budgets')
+    args = parser.parse_args(argv)
+
+    scales = args.scales.split(',')
+    for scale in scales:
+        if scale not in SCALES:
+            parser.error(f'unknown scale "{scale}" (choose from {list(SCALES)})')
+    only = None if args.only is None else args.only.split(',')
+    report = run_benchmarks(scales=scales, only=only, repeat=args.repeat, seed=args.seed)
+    if args.out is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    over = list(result for result in report['results'] if len(result.get('over_budget', list())) > 0)
+    for result in over:
+        fields = ', '.join(f'{field} = {result[field]} (budget {result["budgets"][field]})' for field in result['over_budget'])
+        print(f'OVER BUDGET: {result["benchmark"]} ({result["scale"]}): {fields}', file=sys.stderr)
+    if args.enforce_budgets and len(over) > 0:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
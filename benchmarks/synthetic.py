@@ -0,0 +1,46 @@
+'''
+Seeded synthetic data generators for the benchmarks (so that they run offline and are reproducible).
+'''
+import random
+
+CONSONANTS = ['p', 'b', 't', 'd', 'k', 'g', 's', 'z', 'f', 'v', 'l', 'r', 'm', 'n']
+VOWELS = ['a', 'e', 'i', 'o', 'u']
+
+def random_word(rng: random.Random, min_syls: int=1, max_syls: int=4) -> list:
+    '''
+    :rng: a random.Random object
+    :min_syls: (Optional; default 1) the minimum number of CV syllables
+    :max_syls: (Optional; default 4) the maximum number of CV syllables
+
+    :return: a list of IPA symbols
+    '''
+    word = list()
+    for _ in range(rng.randint(min_syls, max_syls)):
+        word.append(rng.choice(CONSONANTS))
+        word.append(rng.choice(VOWELS))
+    return word
+
+def random_words(n: int, seed: int=0, min_syls: int=1, max_syls: int=4) -> list:
+    '''
+    :n: the number of words
+    :seed: (Optional; default 0) the random seed
+
+    :return: a list of :n: space-separated str words
+    '''
+    rng = random.Random(seed)
+    return list(' '.join(random_word(rng, min_syls=min_syls, max_syls=max_syls)) for _ in range(n))
+
+def random_dag(n: int, avg_degree: int=3, seed: int=0) -> list:
+    '''
+    :n: the number of nodes
+    :avg_degree: (Optional; default 3) the average out-degree
+    :seed: (Optional; default 0) the random seed
+
+    :return: a list of (x, y) edges, with x < y (so the graph is a DAG)
+    '''
+    rng = random.Random(seed)
+    edges = list((rng.randrange(i), i) for i in range(1, n)) # a spanning tree, so the graph is connected
+    for _ in range(n * (avg_degree - 1)):
+        x, y = sorted(rng.sample(range(n), 2))
+        edges.append((x, y))
+    return edges
\ No newline at end of file
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import io
+from contextlib import redirect_stdout, redirect_stderr
+sys.path.append('../')
+from algophon.cli import main, load_model
+from algophon.models.D2L import D2L, generate
+from algophon.models.Miaseg import Miaseg, ParadigmGenerator
+
+class TestCLI(unittest.TestCase):
+    def run_cli(self, argv: list) -> tuple:
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            main(argv)
+        return out.getvalue(), err.getvalue()
+
+    def test_d2l(self):
+        train, model, srs = 'data/cli_d2l_train.tsv', 'data/cli_d2l.pkl', 'data/cli_d2l_out.tsv'
+        try:
+            generate.nasal_harmony(seed=0).write(train, 300)
+            _, err = self.run_cli(['train', 'd2l', train, '--model', model, '--cache-size', '100'])
+            assert(err.startswith('trained on '))
+            d2l = load_model(model)
+            urs = list(ur for ur, _ in D2L().load_train(train))
+            assert(isinstance(d2l, D2L) and d2l.produce_batch(urs) == D2L().train_on_file(train).produce_batch(urs)) # (str(rule) orders its sets by hash, so it can differ between processes)
+            assert(d2l.produce_cache_size == 100)
+            # the output has (UR, SR) rows, and several inputs are streamed in order
+            _, err = self.run_cli(['produce', model, train, train, '--out', srs, '--batch-size', '64', '--jobs', '2'])
+            assert(err.startswith('produced 600 lines'))
+            with open(train) as f:
+                expected = list(line.strip() for line in f) * 2
+            with open(srs) as f:
+                assert(list(line.strip() for line in f) == expected)
+            out, err = self.run_cli(['produce', model, train, '--quiet'])
+            assert(out.split('\n')[:300] == expected[:300] and err == '')
+            try: # a D2L model cannot segment
+                self.run_cli(['segment', model, train])
+                assert(False)
+            except SystemExit:
+                assert(True)
+        finally:
+            for path in [train, model, srs]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_miaseg(self):
+        train, gold, model = 'data/cli_miaseg_train.tsv', 'data/cli_miaseg_gold.tsv', 'data/cli_miaseg.pkl'
+        try:
+            generator = ParadigmGenerator(seed=0, use_ipa=True)
+            generator.write(train, n_paradigms=10, gold_path=gold)
+            self.run_cli(['train', 'miaseg', train, '--model', model, '--use-ipa', '--quiet'])
+            assert(isinstance(load_model(model), Miaseg))
+            # the output (with analysis) matches the ground truth format of ParadigmGenerator.write
+            out, _ = self.run_cli(['segment', model, train, '--jobs', '2', '--quiet'])
+            with open(gold) as f:
+                assert(out == f.read())
+            # (word, features) input, without analysis
+            with open(train) as f:
+                pairs = list('\t'.join(line.rstrip('\n').split('\t')[1:]) for line in f)
+            with open(train, 'w') as f:
+                f.write('\n'.join(pairs) + '\n')
+            out, _ = self.run_cli(['segment', model, train, '--no-analysis', '--morph-sep', '|', '--quiet'])
+            assert(out.split('\n')[:len(pairs)] == list(f'{pair}\t{"|".join(seg)}' for pair, seg in zip(pairs, generator.gold(10))))
+            # a line without a features column is reported with its file and line number
+            with open(train, 'w') as f:
+                f.write('\n'.join(pairs[:2] + ['elnöknek']) + '\n')
+            try:
+                self.run_cli(['segment', model, train, '--quiet'])
+                assert(False)
+            except SystemExit as e:
+                assert(str(e).startswith(f'algophon segment: {train}:3: expected (word, features)'))
+            try:
+                self.run_cli(['segment', model, train, '--jobs', '0'])
+                assert(False)
+            except SystemExit as e:
+                assert(str(e) == 'algophon segment: --jobs must be positive (or -1 for one per CPU)')
+        finally:
+            for path in [train, gold, model]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()
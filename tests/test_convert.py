@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.append('../')
+from algophon import SegInv, SegStr
+from algophon.ipa.convert import to_tipa, to_tipa_batch, TipaConverter
+
+class TestConvert(unittest.TestCase):
+    def test_to_tipa(self):
+        assert(to_tipa('ʃ ɪ p') == '\\textipa{S I p}')
+        assert(to_tipa(['t͡s', 'ə']) == '\\textipa{\\t{ts} @}')
+        assert(to_tipa('æ k') == '\\textipa{\\ae k}')
+
+    def test_tipa_converter(self):
+        assert(TipaConverter()('ʃɪp') == ('\\textipa{SIp}', []))
+        assert(TipaConverter()('æk') == ('\\textipa{\\ae{}k}', [])) # macros followed by a letter are closed with {}
+        assert(TipaConverter(textipa=False)('æə') == ('\\ae@', []))
+        converter = TipaConverter(textipa=False)
+        assert(converter.convert('ʃ ɪ p') == ('SIp', []))
+        assert(converter('ʃɪp') == ('SIp', [])) # unsegmented
+        assert(converter('t͡sə') == ('\\t{ts}@', [])) # longest match
+        assert(converter(['ʃ', 'ɪ', 'p']) == ('SIp', []))
+        assert(converter(SegStr('ʃ ɪ p', seginv=SegInv())) == ('SIp', []))
+        assert(converter('aːx') == ('a?x', [(1, 'ː')]))
+        assert(converter(['aː', 'x']) == ('?x', [(0, 'aː')]))
+        assert(TipaConverter(unknown='\\textbf{?}', textipa=False)('aːx') == ('a\\textbf{?}x', [(1, 'ː')]))
+        assert(list(converter.convert_all(['ʃɪp', 'ŋ'])) == [('SIp', []), ('N', [])])
+
+    def test_to_tipa_batch(self):
+        forms = ['ʃɪp', 'aːx', 'p a ||', ['æ', 'k']]
+        tipa_forms, unknowns = to_tipa_batch(forms, textipa=False)
+        assert(tipa_forms == ['SIp', 'a?x', 'pa||', '\\ae{}k'])
+        assert(to_tipa_batch(forms)[0] == ['\\textipa{SIp}', '\\textipa{a?x}', '\\textipa{pa||}', '\\textipa{\\ae{}k}'])
+        assert(unknowns == [(1, 1, 'ː')])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'forms.tex')
+            tipa_forms, unknowns = to_tipa_batch(iter(forms), path=path)
+            assert(tipa_forms == [])
+            assert(unknowns == [(1, 1, 'ː')])
+            with open(path, 'r') as f:
+                assert(f.read().splitlines() == ['\\textipa{SIp}', '\\textipa{a?x}', '\\textipa{pa||}', '\\textipa{\\ae{}k}'])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,10 +1,12 @@
 import unittest
 import sys
+import pickle
 
 sys.path.append('../')
 from algophon import SegInv, SegStr, NatClass
-from algophon.models.D2L import Tier, Rule, D2L
+from algophon.models.D2L import Tier, Rule, D2L, CorpusGenerator, generate
 from algophon.symbols import LWB, RWB, MORPHB, SYLB, UNDERSPECIFIED
+from algophon.utils import Profiler
 
 class TestD2L(unittest.TestCase):
     def test_tier_init(self):
@@ -563,6 +565,78 @@ class TestD2L(unittest.TestCase):
         assert(d2l.rule.tier is None)
         assert(d2l.rule.defaults is None)
 
+    def test_D2L_update(self):
+        pairs = [
+            ('m o k u D', 'm o k u n'), 
+            ('a p a D', 'a p a d'),
+            ('t u n i D', 't u n i n'),
+            ('s o k i D', 's o k i d'),
+            ('n i g o D', 'n i g o n'),
+            ('u t e D', 'u t e d'),
+            ('u m i D', 'u m i n'),
+            ('e t e D', 'e t e d'),
+            ('u n i b e D', 'u n i b e n'),
+            ('k a d u D', 'k a d u d'),
+            ('m i t u D', 'm i t u n'),
+            ('u n i t a D', 'u n i t a n')
+        ]
+        # updating an untrained model is the same as training it
+        d2l = D2L().update(pairs[:8])
+        assert(str(d2l.rule) == str(D2L().train(pairs[:8]).rule))
+        # the new pairs make the rule unproductive, so the search is rerun
+        rule = d2l.rule
+        d2l.update(pairs[8:])
+        assert(d2l.rule is not rule)
+        assert(str(d2l.rule) == str(D2L().train(pairs).rule))
+        assert(len(d2l._pairs) == len(pairs))
+        # the rule is still productive on the new pairs, so it is kept (and its stats are only updated)
+        rule = d2l.rule
+        assert(d2l._tsp_stats == rule.tsp_stats(pairs)) # recorded when the rule was chosen
+        d2l.profiler = Profiler()
+        new_pairs = [('m i k u g a D', 'm i k u g a n'), ('t u D', 't u d'), ('n a b a D', 'n a b a n')]
+        d2l.update(new_pairs)
+        assert(d2l.rule is rule)
+        assert(d2l.profile_report()['counts']['pairs_evaluated'] == len(new_pairs)) # the old pairs are not rescanned
+        d2l.profiler = None
+        assert(d2l._tsp_stats == d2l.rule.tsp_stats(pairs + new_pairs))
+        assert(d2l.accuracy(pairs + new_pairs) == 1.0)
+        # already-seen pairs are ignored
+        d2l.update(pairs[:3])
+        assert(d2l.rule is rule)
+        assert(len(d2l._pairs) == len(pairs + new_pairs))
+        # new SRs for the abstract /D/ change its features, so the model is retrained
+        exceptions = [(f'{ur[:-1]}D', f'{ur[:-1]}t') for ur, _ in pairs]
+        d2l.update(exceptions)
+        assert(d2l.rule is None)
+        assert(D2L().train(pairs + new_pairs + exceptions).rule is None)
+
+    def test_D2L_update_assigned_rule(self):
+        d2l = D2L()
+        pairs = sorted(d2l.load_train('data/finley/exp-1-train.txt'))
+        d2l.train(pairs[:12])
+        learned = d2l.rule
+        # a manually assigned rule has no recorded stats, so update() evaluates it on all the pairs (and replaces it if it is unproductive)
+        bad = Rule(seginv=d2l.seginv, target=learned.target, features=learned.features, left_ctxts=set(), tier=learned.tier)
+        d2l.rule = bad
+        assert(d2l._tsp_stats is None)
+        d2l.update(pairs[12:14])
+        assert(d2l.rule is not bad)
+        assert(d2l._tsp_stats == d2l.rule.tsp_stats(d2l._pairs))
+        # so does a rule modified in place
+        d2l = D2L().train(pairs[:12])
+        rule = d2l.rule
+        rule.set_ctxts(set())
+        d2l.update(pairs[12:14])
+        assert(d2l.rule is not rule)
+        assert(d2l._tsp_stats == d2l.rule.tsp_stats(d2l._pairs))
+        # a productive assigned rule is kept, with its stats over all the pairs
+        d2l = D2L().train(pairs[:12])
+        good = Rule(seginv=d2l.seginv, target=learned.target, features=learned.features, left_ctxts=learned.left_ctxts, tier=learned.tier)
+        d2l.rule = good
+        d2l.update(pairs[12:14])
+        assert(d2l.rule is good)
+        assert(d2l._tsp_stats == good.tsp_stats(d2l._pairs))
+
     def test_D2L_turkish_toy(self):
         pairs = [
             ('d ɑ l l A r', 'd ɑ l l ɑ r'),
@@ -688,5 +762,113 @@ class TestD2L(unittest.TestCase):
         assert(d2l.rule._apply_default(d2l.seginv['L']) == 'l')
         assert(d2l.rule.right_ctxts == {'l'})
 
+    def test_generate(self):
+        # the same seed generates the same pairs
+        generator = generate.nasal_harmony(seed=1)
+        pairs = generator.sample(300)
+        assert(pairs == generate.nasal_harmony(seed=1).sample(300))
+        assert(pairs != generate.nasal_harmony(seed=2).sample(300))
+        generator.reset()
+        assert(list(generator.generate(10)) == pairs[:10])
+        # the SRs are the rule's outputs
+        assert(all(len(ur.split()) == len(sr.split()) for ur, sr in pairs))
+        assert(all('D' in ur.split() and sr.split()[ur.split().index('D')] in {'d', 'n'} for ur, sr in pairs))
+        assert(generator.rule.accuracy(pairs) == 1.0)
+        # D2L learns the generating rule
+        d2l = D2L().train(pairs)
+        assert(d2l.rule.left_ctxts == {'n', 'm'})
+        assert(f'{d2l.rule.tier}' == '¬[-nas]')
+        assert(d2l.accuracy(pairs) == 1.0)
+
+        # disharmony
+        pairs = generate.nasal_dissimilation().sample(100)
+        assert(all(sr.split()[ur.split().index('N')] == ('d' if any(seg in {'m', 'n'} for seg in ur.split()[:ur.split().index('N')]) else 'n') for ur, sr in pairs))
+
+        # transparent segments are skipped over
+        generator = generate.vowel_harmony(transparent={'i', 'e'})
+        assert(generator.rule.produce('p u t i U') == 'p u t i u')
+        assert(generate.vowel_harmony().rule.produce('p u t i U') == 'p u t i y')
+
+    def test_corpus_generator(self):
+        seginv = SegInv(add_boundary_symbols=True)
+        generate.add_abstract_seg(seginv, symbol='D', alternants=['d', 't'])
+        assert(seginv['D']['voi'] == UNDERSPECIFIED and seginv['D']['cor'] == '+')
+        rule = Rule(seginv=seginv, target={'D'}, features={'voi'}, left_ctxts=NatClass({'-syl'}, seginv=seginv))
+        generator = CorpusGenerator(rule=rule, consonants=['p', 'b'], vowels=['a'], prefixes=['D a'], min_syls=2, max_syls=2)
+        for ur, sr in generator.sample(20):
+            assert(len(ur.split()) == 6 and ur.startswith('D a'))
+            assert(sr.split()[0] == 'D') # word-initial, so no default applies
+        try:
+            CorpusGenerator(rule=rule, consonants=['p'], vowels=['a'], suffixes=['a'])
+            assert(False)
+        except ValueError:
+            assert(True)
+        try:
+            CorpusGenerator(rule=rule, consonants=['p'], vowels=['a'])
+            assert(False)
+        except ValueError:
+            assert(True)
+
+    def test_D2L_profiler(self):
+        pairs = generate.nasal_harmony(seed=0).sample(300)
+        assert(D2L().train(pairs).profile_report() is None)
+        d2l = D2L(profiler=Profiler()).train(pairs)
+        assert(str(d2l.rule) == str(D2L().train(pairs).rule)) # profiling does not change what is learned
+        report = d2l.profile_report()
+        assert(all(phase in report['phases'] for phase in ['train', 'train_setup', 'search_rule', 'build_rule', 'get_tier_adj_contexts', 'evaluate_rules']))
+        assert(report['phases']['train']['calls'] == 1)
+        # build_rule recurses once per new tier, for both harmony and disharmony
+        assert(report['phases']['build_rule']['calls'] == len(report['records']['tier_size']))
+        assert(report['phases']['build_rule']['max_depth'] > 1)
+        assert(report['records']['tier_size'][0] == len(d2l.seginv)) # no tier at first
+        assert(report['counts']['pairs_evaluated'] == report['counts']['rule_evaluations'] * len(set(pairs)))
+        # updates are added to the report
+        d2l.update(generate.nasal_harmony(seed=1).sample(10))
+        assert(d2l.profile_report()['phases']['update']['calls'] == 1)
+
+    def test_D2L_produce_cache(self):
+        pairs = generate.nasal_harmony(seed=0).sample(300)
+        assert(D2L().train(pairs).produce_cache_info() is None) # no cache by default
+        d2l = D2L(produce_cache_size=2).train(pairs)
+        uncached = D2L().train(pairs)
+        urs = ['b a m a D', 'b a m a D', 't a D', SegStr('b a m a D', seginv=d2l.seginv), 'b a m a D a', 't a D']
+        assert(list(d2l.produce(ur) for ur in urs) == list(uncached.produce(ur) for ur in urs))
+        info = d2l.produce_cache_info()
+        assert((info.hits, info.misses, info.maxsize, info.currsize) == (1, 5, 2, 2)) # the SegStr UR has its own entry, so 't a D' was evicted
+        # modifying the rule in place invalidates the cache
+        d2l.rule.set_defaults({feat: '+' if val == '-' else '-' for feat, val in d2l.rule.defaults.items()})
+        assert(d2l.produce('t a D') == 't a n')
+        assert(d2l.produce_cache_info().misses == 1)
+        # so does replacing the rule
+        d2l.rule = None
+        assert(d2l.produce_cache_info().currsize == 0)
+        assert(d2l.produce('b a m a D') == 'b a m a D')
+        # the cache (and profiler) are dropped when pickling
+        d2l = D2L(produce_cache_size=None, profiler=Profiler(callback=lambda kind, name, value: None)).train(pairs)
+        d2l.produce('b a m a D')
+        copy = pickle.loads(pickle.dumps(d2l))
+        assert(copy.profiler is None and copy.produce_cache_info().currsize == 0)
+        assert(copy.produce('b a m a D') == 'b a m a n')
+
+    def test_D2L_produce_batch(self):
+        pairs = generate.nasal_harmony(seed=0).sample(300)
+        d2l = D2L().train(pairs)
+        urs = list(ur for ur, _ in pairs) + [SegStr('b a m a D', seginv=d2l.seginv), 'b a m a D']
+        expected = list(d2l.produce(ur) for ur in urs)
+        assert(d2l.produce_batch(urs) == expected)
+        srs = d2l.produce_batch(urs, n_jobs=2, chunk_size=50)
+        assert(srs == expected and all(sr._seginv is d2l.seginv for sr in srs))
+        assert(d2l.produce_batch([]) == [])
+        # worker processes get a copy without the training pairs
+        copy = d2l._worker_copy()
+        assert(not hasattr(copy, '_pairs') and copy.rule == d2l.rule)
+        assert(list(copy.produce(ur) for ur in urs) == expected)
+        # test n_jobs=0
+        try:
+            d2l.produce_batch(urs, n_jobs=0)
+            assert(False)
+        except ValueError as e:
+            assert(e.__str__() == ':n_jobs: must be positive, None, or < 0 (for one process per CPU), but got 0.')
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
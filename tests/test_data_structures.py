@@ -2,7 +2,7 @@ import unittest
 import sys
 
 sys.path.append('../')
-from algophon.data_structures import Node, Graph
+from algophon.data_structures import Node, Graph, FrozenGraph, Trie
 
 class TestDataStructures(unittest.TestCase):
     def test_node_init(self):
@@ -134,6 +134,16 @@ class TestDataStructures(unittest.TestCase):
         ])
         assert(list(graph.dfs()) == [2, 3, 4, 5, 6, 'z'])
 
+        # each node is visited once, even if it is reachable along several paths
+        graph = Graph()
+        graph.add_edges([(1, 2), (1, 3), (2, 3), (3, 4), (2, 4)])
+        assert(list(graph.bfs()) == [1, 2, 3, 4])
+        assert(list(graph.dfs()) == [1, 2, 3, 4])
+        assert(graph.neighbors(4) == [2, 3])
+        graph.add_edge(4, 0) # the cached neighbors are updated
+        assert(graph.neighbors(4) == [0, 2, 3])
+        assert(list(graph.bfs()) == [0, 4, 2, 3, 1])
+
     def test_graph_is_dag(self):
         graph = Graph()
         assert(not graph.is_dag()) # undirected graphs are not DAGs
@@ -258,6 +268,7 @@ class TestDataStructures(unittest.TestCase):
             assert(top_sort.index('a') < top_sort.index(node))
         for node in [2, 3, 4, 5, 6]: # node b descendents
             assert(top_sort.index('b') < top_sort.index(node))
+        assert(top_sort == [1, 'a', 'b', 2, 3, 5, 4, 6]) # ties are broken deterministically
 
         # DAG 2
         graph = Graph(directed=True)
@@ -284,6 +295,78 @@ class TestDataStructures(unittest.TestCase):
         for node in [7, 11, 12]: # node 2 descendents
             assert(top_sort.index(2) < top_sort.index(node))
         assert(top_sort.index(7) < top_sort.index(11)) # node 7 descendent
+        assert(top_sort == [2, 12, 7, 11, 9, 5, 10, 6, 1, 4, 8, 3])
+
+        # deep DAG (deeper than the recursion limit)
+        graph = Graph(directed=True)
+        graph.add_edges((i, i + 1) for i in range(sys.getrecursionlimit() * 2))
+        assert(graph.is_dag())
+        assert(graph.topological_sort() == list(range(sys.getrecursionlimit() * 2 + 1)))
+        graph.add_edge(sys.getrecursionlimit() * 2, 0) # cycle
+        assert(not graph.is_dag())
+
+    def test_graph_freeze(self):
+        graph = Graph()
+        graph.add_edges([(0, 1), (0, 2), (1, 3), (1, 4), (3, 5), (5, 6), (6, 7), (3, 'a'), (3, 'z'), ('a', 'b'), ('b', 'c')])
+        graph.add_edges([(10, 11), (11, 12)]) # second component
+        frozen = graph.freeze()
+        assert(isinstance(frozen, FrozenGraph))
+        assert(frozen.num_nodes() == graph.num_nodes())
+        assert(frozen.num_edges() == graph.num_edges())
+        assert(frozen.neighbors(3) == [1, 5, 'a', 'z'])
+        assert(3 in frozen and 'x' not in frozen)
+        for start_node in [None, 0, 3, 'z', 11]:
+            assert(list(frozen.bfs(start_node=start_node)) == list(graph.bfs(start_node=start_node)))
+            assert(list(frozen.dfs(start_node=start_node)) == list(graph.dfs(start_node=start_node)))
+        assert(list(frozen.bfs(start_node=0))[:12] == [0, 1, 2, 3, 4, 5, 'a', 'z', 6, 'b', 7, 'c'])
+        assert(not frozen.is_dag()) # undirected graphs are not DAGs
+        graph.add_edge(7, 8) # changes to the graph are not reflected in the frozen graph
+        assert(8 not in frozen)
+
+        # DAG
+        graph = Graph(directed=True)
+        graph.add_edges([
+            (9, 5), (9, 4), (9, 1), (9, 6),
+            (5, 10), (4, 3), (1, 4), (1, 8), (6, 1), (8, 3),
+            (2, 7), (2, 12), (7, 11),
+        ])
+        frozen = graph.freeze()
+        assert(frozen.is_dag())
+        assert(frozen.topological_sort() == graph.topological_sort())
+        assert(list(frozen.dfs()) == list(graph.dfs()))
+        graph.add_edge(3, 9) # cycle
+        frozen = graph.freeze()
+        assert(not frozen.is_dag())
+        try:
+            frozen.topological_sort()
+            assert(False)
+        except ValueError as e:
+            assert(e.__str__() == 'The graph is not a DAG, and thus cannot be topologically sorted.')
+
+    def test_trie(self):
+        trie = Trie()
+        assert(len(trie) == 0)
+        assert(trie.longest_match('abc') is None)
+        trie.insert('ab', value='AB')
+        trie.insert('abcd', value='ABCD')
+        trie.insert(['x', 'y'], value='XY')
+        assert(len(trie) == 3)
+        trie.insert('ab', value='ab') # overwrites the value
+        assert(len(trie) == 3)
+        assert('ab' in trie and 'abcd' in trie and 'xy' in trie)
+        assert('a' not in trie and 'abc' not in trie)
+        assert(trie.get('ab') == 'ab')
+        assert(trie.get('abc', default=0) == 0)
+
+        assert(trie.longest_match('abcde') == (4, 'ABCD'))
+        assert(trie.longest_match('abce') == (2, 'ab'))
+        assert(trie.longest_match('a') is None)
+        assert(trie.longest_match('zabc', start=1) == (2, 'ab'))
+        assert(trie.longest_match(reversed('yx')) == (2, 'XY'))
+
+        # the empty key matches everything
+        trie.insert('', value='EMPTY')
+        assert(trie.longest_match('q') == (0, 'EMPTY'))
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -2,7 +2,8 @@ import unittest
 import sys
 
 sys.path.append('../')
-from algophon.utils import en_syllabify
+from algophon.utils import en_syllabify, en_syllabify_batch
+from algophon import SegInv, SegStr, SyllabifiedSegStr
 
 class TestEnSyllabify(unittest.TestCase):
     def test_en_syllabify(self):
@@ -168,5 +169,57 @@ class TestEnSyllabify(unittest.TestCase):
         assert(en_syllabify('IH0 K S K L UW1 D', transcription='arpabet') == 'IH0 K.S K L UW1 D')
         assert(en_syllabify('ɪ k s k l uː d') == 'ɪ k.s k l uː d')
 
+        ''' edge cases '''
+        assert(en_syllabify('') == '')
+        try:
+            en_syllabify('s t r')
+            assert(False)
+        except ValueError as e:
+            assert(str(e) == "could not syllabify ['s', 't', 'r'], got []")
+        try:
+            en_syllabify('ə l æ s k ə', transcription='xsampa')
+            assert(False)
+        except ValueError as e:
+            assert(str(e) == 'transcription xsampa must be one of ipa|arpabet')
+
+    def test_en_syllabify_segstr(self):
+        seginv = SegInv(add_boundary_symbols=True)
+        for pron in ['ə l æ s k ə', 'm ɪ n s t r ə l', 'm ɛ n j uː', 'ɪ k s k l uː d']:
+            syllabified = en_syllabify(SegStr(pron, seginv=seginv))
+            assert(isinstance(syllabified, SyllabifiedSegStr))
+            assert(syllabified == en_syllabify(pron).replace('.', ' . '))
+            assert(' . '.join(' '.join(f'{seg}' for seg in syl) for syl in syllabified.syllables()) == en_syllabify(pron).replace('.', ' . '))
+        syllabified = en_syllabify(SegStr('m ɪ n s t r ə l', seginv=seginv))
+        assert(syllabified.spans == ((0, 3), (4, 9)))
+        assert(syllabified[3] == seginv['.'])
+        assert(syllabified.syllable_idx(2) == 0 and syllabified.syllable_idx(4) == 1)
+        assert(en_syllabify(SegStr('', seginv=seginv)).spans == ())
+        try: # the SegInv needs boundary symbols
+            en_syllabify(SegStr('ə l æ s k ə', seginv=SegInv()))
+            assert(False)
+        except ValueError:
+            assert(True)
+
+    def test_en_syllabify_batch(self):
+        prons = ['ə l æ s k ə', 'm ɪ n s t r ə l', 'ɑ k t r w ɑ r', 'm ɛ n j uː', 'ɪ k s k l uː d']
+        expected = ['ə.l æ s.k ə', 'm ɪ n.s t r ə l', 'ɑ k.t r w ɑ r', 'm ɛ n.j uː', 'ɪ k.s k l uː d']
+        assert(list(en_syllabify_batch(prons)) == expected)
+        assert(list(en_syllabify_batch(iter(prons))) == expected) # streamed
+        assert(list(en_syllabify_batch(prons, n_jobs=2, chunk_size=2)) == expected)
+        assert(list(en_syllabify_batch(['AH0 L AE1 S K AH0'], transcription='arpabet', alaska_rule=False)) == ['AH0.L AE1.S K AH0'])
+        try:
+            en_syllabify_batch(prons, transcription='xsampa')
+            assert(False)
+        except ValueError:
+            assert(True)
+        try: # rejected when called, before any words are consumed
+            en_syllabify_batch(prons, n_jobs=0)
+            assert(False)
+        except ValueError as e:
+            assert(e.__str__() == ':n_jobs: must be positive, None, or < 0 (for one process per CPU), but got 0.')
+        # the parallel batch is also streamed
+        prons = prons * 20
+        assert(list(en_syllabify_batch(iter(prons), n_jobs=2, chunk_size=3)) == expected * 20)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
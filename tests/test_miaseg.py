@@ -1,9 +1,13 @@
 import unittest
 import sys
+import os
+import pickle
 
 sys.path.append('../')
 from algophon import SegInv, SegStr
-from algophon.models.Miaseg import Paradigm, Miaseg
+from algophon.models.Miaseg import Paradigm, Miaseg, ParadigmGenerator
+from algophon.models.Miaseg.generate import segmentation_accuracy
+from algophon.utils import Profiler
 
 PAPER_EXAMPLE = [
     ('TEACHER', 'tanár', ()),
@@ -105,6 +109,22 @@ class TestMiaseg(unittest.TestCase):
         assert(len(model._paradigms['r1'].get_one_diff_pairs()) == 5)
         assert(len(model._paradigms['r2'].get_one_diff_pairs()) == 5)
         assert(len(model._paradigms['r3'].get_one_diff_pairs()) == 5)
+
+        # words sharing a feature set (e.g., free variation) each pair with their one-diff partners
+        par = Paradigm('CAT')
+        par.add_word(word='cat', features=())
+        par.add_word(word='cats', features=('PL',))
+        par.add_word(word='catz', features=('PL',))
+        par.add_word(word='catzes', features=('PL', 'DIM'))
+        par.add_word(word='catses', features=('DIM', 'PL'))
+        assert(list((d['src'], d['tgt'], d['feat']) for d in par.get_one_diff_pairs()) == [
+            ('cat', 'cats', 'PL'), 
+            ('cat', 'catz', 'PL'), 
+            ('cats', 'catses', 'DIM'), 
+            ('cats', 'catzes', 'DIM'), 
+            ('catz', 'catses', 'DIM'), 
+            ('catz', 'catzes', 'DIM'),
+        ])
         
         model = Miaseg(use_ipa=True)
         seginv = SegInv()
@@ -250,10 +270,81 @@ class TestMiaseg(unittest.TestCase):
         # compare to train_on_file
         assert(model.train_on_file('data/miaseg/toy_example.txt'))
 
+    def test_miaseg__compile_affix_tries(self):
+        model = Miaseg()
+        model.train(train=TOY_EXAMPLE)
+        assert(set(model._affix_tries.keys()) == {'a', 'b', 'c'})
+        assert(model._affix_tries['c'].longest_match('c-new_root') == (2, 'c-'))
+        assert(model._affix_tries['a'].longest_match(reversed('new_root-A')) == (2, '-A'))
+        assert(model._affix_tries['a'].longest_match(reversed('new_root-e')) is None)
+        assert(model._fallback_lens == {'a': 2, 'b': 2, 'c': 2})
+
+        # ipa version
+        model = Miaseg(use_ipa=True)
+        model.train(train=IPA_PAPER_EXAMPLE)
+        word = SegStr('l aː ɲ o k n ɒ k', seginv=model.seginv)
+        assert(model._affix_tries['DAT'].longest_match(reversed(word._segs)) == (3, 'n ɒ k'))
+        assert(model._match_affix(temp=word, feature='DAT') == 'n ɒ k')
+        assert(model._match_affix(temp=word[:-3], feature='PL') == 'o k')
+
+    def test_miaseg_partial_fit(self):
+        # partial_fit on an untrained model is the same as train
+        model = Miaseg()
+        assert(model.partial_fit(train=PAPER_EXAMPLE[:2]))
+        assert(model.allomorphs['PL'] == {'ok': 1})
+        assert(model.order == [])
+
+        model.partial_fit(train=PAPER_EXAMPLE[2:])
+        assert(set(model.allomorphs.keys()) == set(model.types.keys()) == {'PL', 'DAT'})
+        assert(model.allomorphs['PL'] == {'ok': 1})
+        assert(model.allomorphs['DAT'] == {'nak': 1, 'nek': 1})
+        assert(model.types['DAT'] == 'SUFFIX')
+        assert(model.order == ['PL', 'DAT'])
+        assert(model.segment(word='lányoknak', features={'PL', 'DAT'}) == (['lány', 'ok', 'nak'], ['ROOT', 'PL', 'DAT']))
+
+        # adding already-seen triples changes nothing
+        model.partial_fit(train=PAPER_EXAMPLE)
+        assert(model.allomorphs['DAT'] == {'nak': 1, 'nek': 1})
+
+        # toy example, one triple at a time, matches training on everything at once
+        full = Miaseg().train(train=TOY_EXAMPLE)
+        model = Miaseg()
+        for triple in TOY_EXAMPLE:
+            model.partial_fit(train=[triple])
+        assert(model.allomorphs == full.allomorphs)
+        assert(model.types == full.types)
+        assert(model.order == full.order == ['c', 'a', 'b'])
+        assert(model.segment(word='c-new_root-a-b', features={'a', 'b', 'c'}) == full.segment(word='c-new_root-a-b', features={'a', 'b', 'c'}))
+
+        # ipa version
+        model = Miaseg(use_ipa=True).train(train=IPA_PAPER_EXAMPLE[:3])
+        model.partial_fit(train=IPA_PAPER_EXAMPLE[3:])
+        assert(model.allomorphs['DAT'] == {'n ɒ k': 1, 'n ɛ k': 1})
+        assert(model.segment('ɛ l n ø k n ɛ k', features={'DAT'}) == (['ɛ l n ø k', 'n ɛ k'], ['ROOT', 'DAT']))
+
     def test_miaseg__get_affixes(self):
         model = Miaseg()
         model.train(train=TOY_EXAMPLE)
         assert(model._get_affixes({'a', 'b', 'c'}) == (['c'], ['a', 'b']))
+        assert(model._order_rank == {'c': 0, 'a': 1, 'b': 2})
+
+    def test_miaseg_affix_cache(self):
+        model = Miaseg(affix_cache_size=2)
+        model.train(train=TOY_EXAMPLE)
+        assert(model.affix_cache_info().currsize == 0)
+        assert(model._get_affixes(('b', 'a', 'c')) == (['c'], ['a', 'b']))
+        assert(model._get_affixes({'a', 'b', 'c'}) == (['c'], ['a', 'b'])) # same feature set
+        prfxs, _ = model._get_affixes({'a', 'b', 'c'})
+        prfxs.append('x') # editing the returned lists does not change the cache
+        assert(model._get_affixes({'a', 'b', 'c'}) == (['c'], ['a', 'b']))
+        info = model.affix_cache_info()
+        assert(info.hits == 3 and info.misses == 1 and info.maxsize == 2 and info.currsize == 1)
+        model._get_affixes({'a'})
+        model._get_affixes({'b'})
+        assert(model.affix_cache_info().currsize == 2) # bounded
+        model.train(train=PAPER_EXAMPLE) # retraining clears the cache
+        assert(model.affix_cache_info().currsize == 0)
+        assert(model._get_affixes({'DAT', 'PL'}) == ([], ['PL', 'DAT']))
 
     def test_miaseg_segment(self):
         model = Miaseg()
@@ -346,6 +437,58 @@ class TestMiaseg(unittest.TestCase):
             assert(True)
             assert(e.__str__() == 'Mɪᴀꜱᴇɢ must be trained in order to segment.')
 
+    def test_miaseg_segment_batch(self):
+        model = Miaseg()
+        model.train(train=TOY_EXAMPLE)
+        pairs = [
+            ('new_root-a-b', {'a', 'b'}),
+            ('c-new_root-a-b', ('a', 'b', 'c')),
+            ('new_root-a', {'a'}),
+            ('d-new_root-a-b', {'a', 'b', 'd'}), # unattested feature
+            ('other_root-b-a', ('b', 'a')),
+            ('new_root', ()),
+        ]
+        expected = list(model.segment(word=word, features=feats) for word, feats in pairs)
+        assert(model.segment_batch(pairs) == expected)
+        assert(model.segment_batch(pairs, with_analysis=False) == list(seg for seg, _ in expected))
+        assert(model.segment_batch(pairs, n_jobs=2) == expected)
+        assert(model.segment_batch(pairs, n_jobs=2, chunk_size=1, with_analysis=False) == list(seg for seg, _ in expected))
+        assert(model.segment_batch([]) == [])
+
+        # ipa version
+        model = Miaseg(use_ipa=True)
+        model.train(train=IPA_PAPER_EXAMPLE)
+        pairs = [
+            ('l aː ɲ o k n ɒ k', {'PL', 'DAT'}),
+            (SegStr('ɛ l n ø k n ɛ k', model.seginv), {'DAT'}),
+            ('a t o k n ɒ k', ('DAT', 'PL')),
+            ('a t o k', ('PL',)),
+        ]
+        expected = list(model.segment(word=word, features=feats) for word, feats in pairs)
+        assert(model.segment_batch(pairs) == expected)
+        results = model.segment_batch(pairs, n_jobs=2)
+        assert(results == expected)
+        assert(all(isinstance(morph, SegStr) and morph._seginv is model.seginv for seg, _ in results for morph in seg))
+
+        # worker processes get a copy without the training data
+        copy = model._worker_copy()
+        assert(not hasattr(copy, '_paradigms'))
+        assert(list(copy.segment(word=word, features=feats) for word, feats in pairs) == expected)
+
+        # test n_jobs=0
+        try:
+            model.segment_batch(pairs, n_jobs=0)
+            assert(False)
+        except ValueError as e:
+            assert(e.__str__() == ':n_jobs: must be positive, None, or < 0 (for one process per CPU), but got 0.')
+
+        # test untrained model
+        try:
+            Miaseg().segment_batch(pairs)
+            assert(False)
+        except ValueError as e:
+            assert(e.__str__() == 'Mɪᴀꜱᴇɢ must be trained in order to segment.')
+
     def test_miaseg_train_and_segment(self):
         model = Miaseg()
         results = model.train_and_segment(train=TOY_EXAMPLE)
@@ -375,5 +518,76 @@ class TestMiaseg(unittest.TestCase):
         # check train_and_segment_file
         assert(results == model.train_and_segment_file('data/miaseg/ipa_paper_example.txt'))
 
+    def test_paradigm_generator(self):
+        generator = ParadigmGenerator(n_feats=5, max_allomorphs=3, prefix_ratio=0.4, seed=3)
+        data = list(generator.generate(20))
+        assert(len(data) == 20 * 2 ** 5) # every cell of every paradigm
+        # the same seed generates the same data, and paradigms can be generated independently
+        assert(data == list(ParadigmGenerator(n_feats=5, max_allomorphs=3, prefix_ratio=0.4, seed=3).generate(20)))
+        assert(generator.paradigm(7) == data[7 * 2 ** 5:8 * 2 ** 5])
+        assert(generator.triples(20) == list(triple for triple, _, _ in data))
+        # the ground truth is consistent with the words
+        for (root, word, feats), segmentation, analysis in data:
+            assert(''.join(segmentation) == word)
+            assert(sorted(analysis) == sorted(feats + ('ROOT',)))
+            assert(all(generator.types[feat] == ('PREFIX' if analysis.index(feat) < analysis.index('ROOT') else 'SUFFIX') for feat in feats))
+        # Miaseg recovers the ground truth
+        model = Miaseg().train(generator.triples(20))
+        predicted = model.segment_batch(list((word, feats) for _, word, feats in generator.triples(20)), with_analysis=False)
+        assert(segmentation_accuracy(predicted, generator.gold(20)) == 1.0)
+        assert(segmentation_accuracy([['a', 'b']], [['ab']]) == 0.0)
+
+        # sampled cells and IPA words
+        generator = ParadigmGenerator(n_feats=8, cells_per_paradigm=10, max_feats_per_word=3, use_ipa=True)
+        for par_idx in range(5):
+            paradigm = generator.paradigm(par_idx)
+            assert(len(paradigm) == 10)
+            assert(paradigm[0][0][-1] == ())
+            assert(all(len(feats) <= 3 for (_, _, feats), _, _ in paradigm))
+            assert(all(' '.join(segmentation) == word for (_, word, _), segmentation, _ in paradigm))
+        model = Miaseg(use_ipa=True).train(generator.triples(50))
+        assert(model.segment(*generator.paradigm(0)[-1][0][1:], with_analysis=False) == generator.paradigm(0)[-1][1])
+
+        # streaming to disk
+        path, gold_path = 'data/miaseg/_generated.txt', 'data/miaseg/_generated_gold.txt'
+        try:
+            assert(generator.write(path=path, n_paradigms=5, gold_path=gold_path) == 50)
+            assert(Miaseg().load_train(path) == generator.triples(5))
+            with open(gold_path) as f:
+                lines = f.readlines()
+            assert(lines[-1].strip('\n').split('\t')[3].split('+') == generator.paradigm(4)[-1][1])
+        finally:
+            for _path in [path, gold_path]:
+                if os.path.exists(_path):
+                    os.remove(_path)
+
+    def test_miaseg_profiler(self):
+        assert(Miaseg().train(PAPER_EXAMPLE).profile_report() is None)
+        model = Miaseg(profiler=Profiler()).train(PAPER_EXAMPLE)
+        report = model.profile_report()
+        assert(all(phase in report['phases'] for phase in ['train', 'setup_paradigms', 'find_allomorphs', 'topological_sort', 'compile_affix_tries']))
+        assert(report['counts']['one_diff_pairs'] == sum(len(par.get_one_diff_pairs()) for par in model._paradigms.values()))
+        assert(sorted(report['records']['one_diff_pairs_per_paradigm']) == [('PERSON', 1), ('TEACHER', 2)])
+        assert(report['allomorphs'] == {'PL': 1, 'DAT': 2})
+        # segmentation counts
+        model.segment('lányoknak', {'PL', 'DAT'})
+        model.segment('lányoknak', {'PL', 'ACC'})
+        model.segment_batch([('elnöknek', {'DAT'}), ('elnökkel', {'INS'}), ('elnökhöz', {'DAT'})])
+        counts = model.profile_report()['counts']
+        assert(counts['words_segmented'] == 5)
+        assert(counts['failed'] == 2)
+        assert(counts['fallbacks'] == 1) # no allomorph of DAT matches elnökhöz
+        assert(model.profile_report()['phases']['segment_batch']['calls'] == 1)
+        # the profiler is not pickled (e.g., for the worker processes of segment_batch)
+        events = list()
+        model.profiler = Profiler(callback=lambda kind, name, value: events.append((kind, name, value)))
+        assert(pickle.loads(pickle.dumps(model)).profiler is None)
+        # so the workers return their counts, which are added to the profiler (and reach its callback)
+        pairs = [('elnöknek', {'DAT'}), ('elnökkel', {'INS'}), ('elnökhöz', {'DAT'})]
+        assert(model.segment_batch(pairs, n_jobs=2, chunk_size=1) == model.segment_batch(pairs))
+        counts = model.profile_report()['counts']
+        assert(counts == {'words_segmented': 6, 'failed': 2, 'fallbacks': 2})
+        assert(sum(value for kind, name, value in events if kind == 'count' and name == 'fallbacks') == 2)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,7 +1,11 @@
 import unittest
 import sys
+import pickle
+import threading
+import unicodedata
 sys.path.append('../')
 from algophon.seginv import SegInv
+from algophon.segstr import SegStr
 from algophon.symbols import UNDERSPECIFIED, LWB
 
 class TestSegInv(unittest.TestCase):
@@ -112,6 +116,30 @@ class TestSegInv(unittest.TestCase):
         assert(seginv.feature_intersection(vs) == {'+cont', '-sg', '-delrel', '+tense', '-long', '-cons', '-velaric',
                                                    '-nas', '+syl', '-cg', '+voi', '-lat', '+son', '-cor'})
         
+    def test_unicode_normalization(self):
+        seginv = SegInv()
+        nfc, nfd = unicodedata.normalize('NFC', 'ã'), unicodedata.normalize('NFD', 'ã')
+        assert(nfc != nfd)
+        seginv.add(nfc)
+        assert(nfc in seginv and nfd in seginv)
+        assert(seginv[nfc] is seginv[nfd]) # both compositions find the same Seg
+        assert(seginv.add_and_get(nfd) is seginv[nfc])
+        assert(len(seginv) == 1)
+        # the homoglyphs g (U+0067) and ɡ (U+0261) are still separate symbols with the same features
+        g, script_g = seginv.add_and_get('g'), seginv.add_and_get('ɡ')
+        assert(f'{g}' == 'g' and f'{script_g}' == 'ɡ')
+        assert(g.features == script_g.features)
+        # unknown symbols still raise KeyError
+        try:
+            seginv.add('1')
+            assert(False)
+        except KeyError:
+            assert(True)
+        # looking up unknown symbols does not grow the normalization memo
+        size = len(seginv._normalized)
+        assert(not any(f'x{i}' in seginv for i in range(1000)))
+        assert(len(seginv._normalized) == size)
+
     def test_feature_diff(self):
         seginv = SegInv()
         seginv.add_segs({'t', 'd'})
@@ -120,5 +148,46 @@ class TestSegInv(unittest.TestCase):
         seginv.add_segs({'i', 'e'})
         assert(seginv.feature_diff('i', 'e') == {'hi'})
 
+    def test_freeze(self):
+        seginv = SegInv()
+        seginv.add_segs({'t', 'a', 'ã'})
+        assert(not seginv.frozen)
+        assert(seginv.freeze() is seginv and seginv.frozen)
+        # lookups work as before, including modulo Unicode normalization
+        nfd = unicodedata.normalize('NFD', 'ã')
+        assert(seginv['t'] is seginv.add_and_get('t') and seginv[nfd] is seginv['ã'])
+        assert(SegStr(f't a {nfd}', seginv)[2] is seginv['ã'] and len(seginv) == 3)
+        # unknown segments raise, and custom symbols cannot be added
+        for add in [lambda: seginv.add('p'), lambda: SegStr('p a', seginv), lambda: seginv['p']]:
+            try:
+                add()
+                assert(False)
+            except KeyError:
+                assert(True)
+        try:
+            seginv.add_custom(symbol='D', features=dict(seginv['t'].features))
+            assert(False)
+        except ValueError:
+            assert(True)
+        # with an overlay, unknown segments are private to the thread that added them
+        seginv = SegInv()
+        seginv.add_segs({'t', 'a'})
+        seginv.freeze(unknown='overlay')
+        p = seginv.add_and_get('p')
+        assert(p == 'p' and 'p' in seginv and seginv['p'] is p and len(seginv) == 2)
+        found = list()
+        thread = threading.Thread(target=lambda: found.append(('p' in seginv, SegStr('p a t', seginv)[0] is p)))
+        thread.start()
+        thread.join()
+        assert(found == [(False, False)])
+        # a frozen SegInv can be pickled (e.g., for worker processes), but the overlay is dropped
+        copy = pickle.loads(pickle.dumps(seginv))
+        assert(copy.frozen and 't' in copy and 'p' not in copy)
+        try:
+            SegInv().freeze(unknown='ignore')
+            assert(False)
+        except ValueError:
+            assert(True)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import unittest
 import sys
 sys.path.append('../')
-from algophon.segstr import SegStr
+from algophon.segstr import SegStr, SyllabifiedSegStr
 from algophon.seginv import SegInv
 from algophon.seg import Seg
 
@@ -70,5 +70,35 @@ class TestSegStr(unittest.TestCase):
         y = SegStr('b', seginv=SegInv())
         assert(x < y)
 
+    def test_from_segs(self):
+        seginv = SegInv()
+        x = SegStr('eː n t j ə', seginv=seginv)
+        y = SegStr._from_segs(x._segs[1:3], seginv=seginv)
+        assert(isinstance(y, SegStr))
+        assert(y == 'n t')
+        assert(f'{y}' == 'nt')
+
+    def test_syllabified_segstr(self):
+        seginv = SegInv(add_boundary_symbols=True)
+        x = SyllabifiedSegStr('ə . l æ s . k ə', seginv=seginv)
+        assert(x == 'ə . l æ s . k ə')
+        assert(x.spans == ((0, 1), (2, 5), (6, 8)))
+        assert(x.num_syllables() == 3)
+        assert(x.syllables() == [SegStr('ə', seginv), SegStr('l æ s', seginv), SegStr('k ə', seginv)])
+        assert(x.syllable(-1) == 'k ə')
+        assert(list(x.syllable_idx(idx) for idx in [0, 2, 3, 4, 6, 7, -1]) == [0, 1, 1, 1, 2, 2, 2])
+        for idx in [1, 5]: # syllable boundaries
+            try:
+                x.syllable_idx(idx)
+                assert(False)
+            except ValueError:
+                assert(True)
+        try:
+            x.syllable_idx(8)
+            assert(False)
+        except IndexError:
+            assert(True)
+        assert(SyllabifiedSegStr('', seginv=seginv).spans == ())
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import asyncio
+import time
+sys.path.append('../')
+from algophon import SegStr
+from algophon.models.D2L import D2L, generate
+from algophon.models.Miaseg import Miaseg
+from algophon.models.serving import BatchServer, serve_d2l, serve_miaseg, _percentile
+
+IPA_PAPER_EXAMPLE = [
+    ('TEACHER', 't ɒ n aː r', ()),
+    ('TEACHER', 't ɒ n aː r o k', ('PL',)),
+    ('TEACHER', 't ɒ n aː r o k n ɒ k', ('PL', 'DAT')),
+    ('PERSON', 's ɛ m eː j', ()),
+    ('PERSON', 's ɛ m eː j n ɛ k', ('DAT',)),
+]
+
+class TestServing(unittest.TestCase):
+    def test_init(self):
+        model = D2L()
+        for kwargs in [{'executor': 'fork'}, {'max_batch_size': 0}, {'n_workers': 0}]:
+            try:
+                serve_d2l(model, **kwargs)
+                assert(False)
+            except ValueError:
+                assert(True)
+        try:
+            BatchServer(model, method='segment_batch')
+            assert(False)
+        except ValueError:
+            assert(True)
+        server = serve_d2l(model, n_workers=2)
+        assert(not server.running)
+        assert(server.stats()['queue_depth'] == 0 and server.stats()['latency']['p50'] is None)
+
+    def test_percentile(self):
+        assert(_percentile([], 50) is None)
+        values = list(range(1, 101))
+        assert(_percentile(values, 50) == 50 and _percentile(values, 99) == 99 and _percentile(values, 100) == 100)
+        assert(_percentile([0.5], 90) == 0.5)
+
+    def test_serve_d2l(self):
+        pairs = generate.nasal_harmony(seed=0).sample(300)
+        model = D2L().train(pairs)
+        urs = list(ur for ur, _ in pairs[:50]) * 2
+        expected = list(model.produce(ur) for ur in urs)
+
+        async def serve(executor):
+            async with serve_d2l(model, executor=executor, max_batch_size=16, max_wait=0.01) as server:
+                srs = await server.submit_many(urs)
+                sr = await server.submit(SegStr('b a m a D', seginv=model.seginv))
+            return srs, sr, server.stats() # closing the server waits for the batches in flight
+
+        for executor in ['thread', 'process']:
+            srs, sr, stats = asyncio.run(serve(executor))
+            assert(srs == expected and sr == 'b a m a n')
+            assert(all(isinstance(sr, SegStr) and sr._seginv is model.seginv for sr in srs))
+            assert(stats['requests'] == len(urs) + 1 and stats['queue_depth'] == 0 and stats['in_flight'] == 0)
+            assert(stats['batches'] >= len(urs) // 16 and stats['mean_batch_size'] <= 16)
+            assert(0 <= stats['latency']['p50'] <= stats['latency']['p99'] <= stats['latency']['max'])
+
+    def test_serve_miaseg(self):
+        model = Miaseg(use_ipa=True).train(IPA_PAPER_EXAMPLE)
+        requests = [('l aː ɲ o k n ɒ k', {'PL', 'DAT'}), ('ɛ l n ø k n ɛ k', {'DAT'}), ('ɛ l n ø k', {'INS'})]
+
+        async def serve(executor, with_analysis):
+            async with serve_miaseg(model, with_analysis=with_analysis, executor=executor) as server:
+                return await server.submit_many(requests)
+
+        for executor in ['thread', 'process']:
+            assert(asyncio.run(serve(executor, True)) == model.segment_batch(requests))
+            assert(asyncio.run(serve(executor, False)) == model.segment_batch(requests, with_analysis=False))
+
+    def test_errors(self):
+        model = Miaseg() # untrained, so segment_batch raises
+
+        async def serve():
+            async with serve_miaseg(model) as server:
+                return await server.submit(('tanár', ()))
+
+        try:
+            asyncio.run(serve())
+            assert(False)
+        except ValueError:
+            assert(True)
+
+    def test_close(self):
+        class SlowModel:
+            def batch(self, requests: list) -> list:
+                time.sleep(0.2)
+                return requests
+
+        async def serve():
+            server = BatchServer(SlowModel(), method='batch')
+            future = server.submit('a')
+            await asyncio.sleep(0.05) # the batch is in flight
+            closing = asyncio.get_running_loop().create_task(server.close())
+            await asyncio.sleep(0.01) # close() is waiting for the batch
+            closing.cancel()
+            try:
+                await closing
+                assert(False)
+            except asyncio.CancelledError:
+                assert(True)
+            # a cancelled close() still shuts down the pool
+            assert(server._pool is None and not server.running)
+            assert(await future == 'a')
+            # and the server can be restarted
+            assert(await server.submit('b') == 'b')
+            await server.close()
+
+        asyncio.run(serve())
+
+if __name__ == "__main__":
+    unittest.main()
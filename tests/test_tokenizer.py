@@ -0,0 +1,54 @@
+import unittest
+import sys
+import unicodedata
+
+sys.path.append('../')
+from algophon import SegInv, SegStr, Tokenizer
+
+class TestTokenizer(unittest.TestCase):
+    def test_tokenize(self):
+        seginv = SegInv()
+        tokenizer = Tokenizer(seginv)
+        assert(tokenizer.tokenize('ŋ̊at͡sə') == ['ŋ̊', 'a', 't͡s', 'ə']) # multi-codepoint symbols
+        assert(tokenizer.tokenize('ŋ̊ a t͡s ə') == ['ŋ̊', 'a', 't͡s', 'ə']) # spaces are ignored
+        assert(tokenizer.tokenize('') == [])
+        try:
+            tokenizer.tokenize('a1')
+            assert(False)
+        except ValueError as e:
+            assert(str(e) == 'Could not tokenize "a1": no symbol in the SegInv matches "1" at index 1.')
+
+    def test_unicode_normalization(self):
+        seginv = SegInv()
+        tokenizer = Tokenizer(seginv)
+        for form in ['NFC', 'NFD']:
+            raw = unicodedata.normalize(form, 'mãpə̃')
+            assert(tokenizer(raw) == tokenizer(unicodedata.normalize('NFC', raw)))
+            assert(len(tokenizer(raw)) == 4)
+
+    def test_call(self):
+        seginv = SegInv()
+        tokenizer = Tokenizer(seginv)
+        segstr = tokenizer('ŋ̊at͡sə')
+        assert(isinstance(segstr, SegStr))
+        assert(segstr == SegStr('ŋ̊ a t͡s ə', seginv=seginv))
+        assert(len(segstr) == 4)
+        assert(segstr[2] == 't͡s')
+        assert('t͡s' in seginv) # the Seg objects are added to the SegInv
+
+    def test_custom_symbols(self):
+        seginv = SegInv(add_boundary_symbols=True)
+        tokenizer = Tokenizer(seginv)
+        assert(tokenizer.tokenize('ka.ta') == ['k', 'a', '.', 't', 'a'])
+        seginv.add_custom(symbol='D', features=seginv.add_and_get('d').features)
+        assert(tokenizer.tokenize('kaD') == ['k', 'a', 'D']) # picked up after the Tokenizer was built
+
+    def test_batch(self):
+        seginv = SegInv()
+        tokenizer = Tokenizer(seginv)
+        raws = ['ʃɪp', 'ŋ̊at͡sə', 'k a t']
+        segstrs = list(tokenizer.batch(iter(raws)))
+        assert(segstrs == [SegStr('ʃ ɪ p', seginv), SegStr('ŋ̊ a t͡s ə', seginv), SegStr('k a t', seginv)])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
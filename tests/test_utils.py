@@ -1,8 +1,12 @@
 import unittest
 import sys
+import os
+import subprocess
 
 sys.path.append('../')
-from algophon.utils import tsp
+import numpy as np
+from algophon.utils import tsp, tsp_thresholds, Profiler
+from algophon.utils.workers import resolve_n_jobs, process_pool, run_in_worker, worker_model
 
 class TestUtils(unittest.TestCase):
     def test_tsp(self):
@@ -22,5 +26,95 @@ class TestUtils(unittest.TestCase):
         assert(tsp(n=2, e=0))
         assert(not tsp(n=2, e=1))
 
+    def test_tsp_vectorized(self):
+        n = np.array([10, 10, 10, 10, 7, 0, 1, 1, 3, 3, 2, 2, 1000])
+        e = np.array([0, 2, 4, 5, 3, 0, 0, 0, 2, 0, 0, 1, 144])
+        expected = list(tsp(n=int(n_), e=int(e_)) for n_, e_ in zip(n, e))
+        assert(list(tsp(n=n, e=e)) == expected)
+        assert(list(tsp(n=n, m=n - e)) == expected)
+        assert(list(tsp(n=n, e=e, m=n - e)) == expected)
+        assert(list(tsp(n=list(n), e=list(e))) == expected)
+        assert(tsp(n=n, e=e).dtype == bool)
+        try:
+            tsp(n=n, e=e, m=n)
+            assert(False)
+        except ValueError:
+            assert(True)
+
+        # threshold table
+        thresholds = tsp_thresholds(1000)
+        assert(len(thresholds) == 1001)
+        assert(thresholds[0] == thresholds[1] == 0)
+        assert(abs(thresholds[10] - 10 / np.log(10)) < 1e-9)
+        assert(tsp_thresholds(1000) is thresholds) # cached
+        assert(list(tsp(n=n, e=e, thresholds=thresholds)) == expected)
+        assert(tsp(n=10, e=4, thresholds=thresholds))
+        assert(not tsp(n=10, e=5, thresholds=thresholds))
+
+    def test_profiler(self):
+        events = list()
+        profiler = Profiler(callback=lambda kind, name, value: events.append((kind, name)))
+        def recurse(depth):
+            with profiler.phase('recurse'):
+                profiler.count('calls')
+                if depth > 0:
+                    recurse(depth - 1)
+        with profiler.phase('outer'):
+            recurse(3)
+        recurse(1)
+        profiler.count('items', 5)
+        profiler.record('size', 10)
+        profiler.record('size', 7)
+        report = profiler.report()
+        assert(report['phases']['recurse']['calls'] == 6)
+        assert(report['phases']['recurse']['max_depth'] == 4)
+        assert(report['phases']['outer']['calls'] == 1)
+        assert(report['phases']['outer']['total'] >= report['phases']['recurse']['total'] - report['phases']['recurse']['mean']) # recursion is not double-counted
+        assert(report['counts'] == {'calls': 6, 'items': 5})
+        assert(report['records'] == {'size': [10, 7]})
+        assert(events.count(('phase', 'recurse')) == 6 and events.count(('count', 'calls')) == 6 and ('record', 'size') in events)
+        profiler.reset()
+        assert(profiler.report() == {'phases': {}, 'counts': {}, 'records': {}})
+
+    def test_workers(self):
+        assert(resolve_n_jobs(2) == 2)
+        assert(resolve_n_jobs(None) == resolve_n_jobs(-1) == (os.cpu_count() or 1))
+        try:
+            resolve_n_jobs(0, name='n_workers')
+            assert(False)
+        except ValueError as e:
+            assert(e.__str__() == ':n_workers: must be positive, None, or < 0 (for one process per CPU), but got 0.')
+        # each worker calls methods of its own copy of the model
+        with process_pool([3, 1, 2], 1) as executor:
+            assert(executor.submit(run_in_worker, 'index', 2).result() == 2)
+        assert(worker_model() is None) # the model is only installed in the workers
+
+    def test_lazy_imports(self):
+        def loaded_after(statement: str, modules: list=['numpy', 'algophon.distance.edit_distance', 'algophon.seginv']) -> list:
+            code = f'import sys; {statement}; print(sorted(m for m in {modules} if m in sys.modules))'
+            env = dict(os.environ, PYTHONPATH=os.path.abspath('..'))
+            return eval(subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True).stdout)
+        # importing the package (or just SegStr) loads neither NumPy nor the distance module
+        assert(loaded_after('import algophon') == [])
+        assert(loaded_after('from algophon import SegStr') == [])
+        assert(loaded_after('from algophon import SegInv, NatClass') == ['algophon.seginv'])
+        # nor does the scalar TSP or training a D2L model
+        assert(loaded_after('from algophon.utils import tsp; assert tsp(n=10, m=9)') == [])
+        assert(loaded_after("from algophon.models.D2L import D2L; D2L().train([('a D', 'a d'), ('n a D', 'n a n')])") == ['algophon.seginv'])
+        # the process pools of the batch methods are only imported when they are used
+        assert(loaded_after('from algophon.models.D2L import D2L; from algophon.models.Miaseg import Miaseg', modules=['concurrent.futures.process', 'multiprocessing']) == [])
+        # modules that need NumPy load it when they are accessed
+        assert(loaded_after('from algophon import edit_distance') == ['algophon.distance.edit_distance', 'algophon.seginv', 'numpy'])
+        assert(loaded_after('import algophon; algophon.edit_distance') == ['algophon.distance.edit_distance', 'algophon.seginv', 'numpy'])
+        # the lazy attributes are listed and star-importable
+        import algophon
+        assert(all(name in dir(algophon) for name in ['SegStr', 'SegInv', 'convert', 'edit_distance', 'LWB']))
+        assert(algophon.NatClass is __import__('algophon.natclass', fromlist=['NatClass']).NatClass)
+        try:
+            algophon.Missing
+            assert(False)
+        except AttributeError:
+            assert(True)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
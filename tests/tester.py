@@ -9,6 +9,10 @@ from test_en_syllabify import TestEnSyllabify
 from test_data_structures import TestDataStructures
 from test_d2l import TestD2L
 from test_miaseg import TestMiaseg
+from test_convert import TestConvert
+from test_tokenizer import TestTokenizer
+from test_serving import TestServing
+from test_cli import TestCLI
 
 '''
 A script to run all the test cases.
@@ -24,6 +28,10 @@ test_en_syllabify_suite = unittest.TestLoader().loadTestsFromTestCase(TestEnSyll
 test_datastructures_suite = unittest.TestLoader().loadTestsFromTestCase(TestDataStructures)
 test_d2l_suite = unittest.TestLoader().loadTestsFromTestCase(TestD2L)
 test_miaseg_suite = unittest.TestLoader().loadTestsFromTestCase(TestMiaseg)
+test_convert_suite = unittest.TestLoader().loadTestsFromTestCase(TestConvert)
+test_tokenizer_suite = unittest.TestLoader().loadTestsFromTestCase(TestTokenizer)
+test_serving_suite = unittest.TestLoader().loadTestsFromTestCase(TestServing)
+test_cli_suite = unittest.TestLoader().loadTestsFromTestCase(TestCLI)
 # combine the test suites
 suites = unittest.TestSuite([
     test_seg_suite,
@@ -35,7 +43,11 @@ suites = unittest.TestSuite([
     test_en_syllabify_suite,
     test_datastructures_suite,
     test_d2l_suite,
-    test_miaseg_suite
+    test_miaseg_suite,
+    test_convert_suite,
+    test_tokenizer_suite,
+    test_serving_suite,
+    test_cli_suite
 ])
 # run the test suites
 unittest.TextTestRunner(verbosity=2).run(suites)